@@ -0,0 +1,57 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from blog.services.keyset import keyset_page
+
+
+class KeysetPagination(BasePagination):
+    # Cursor pagination on a unique sort key: every page is one indexed range read and no COUNT(*).
+    ordering = ("-publish", "-id")
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = keyset_page(queryset, self.ordering, request.query_params.get(self.cursor_query_param), self.page_size)
+        if self.page is None:
+            raise NotFound("Invalid cursor.")
+        return self.page.object_list
+
+    def get_next_link(self):
+        if not self.page.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.page.next_cursor)
+
+    def get_first_link(self):
+        if not self.page.has_previous:
+            return None
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "first": self.get_first_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class PostKeysetPagination(KeysetPagination):
+    ordering = ("-publish", "-id")
+
+
+class ArticleKeysetPagination(KeysetPagination):
+    ordering = ("-fetched_at", "-id")
+
+
+class BookmarkKeysetPagination(KeysetPagination):
+    ordering = ("-bookmarked_at", "-id")
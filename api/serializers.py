@@ -205,6 +205,7 @@ class AnalyticsTopPostSerializer(serializers.Serializer):
     title = serializers.CharField(source="post.title")
     clicks = serializers.IntegerField()
     source_clicks = serializers.IntegerField()
+    unique_readers = serializers.IntegerField(source="readers")
     publish = serializers.DateTimeField(source="post.publish")
 
 
@@ -213,6 +214,7 @@ class AnalyticsTopSourceSerializer(serializers.Serializer):
     name = serializers.CharField(source="source.name")
     provider = serializers.CharField(source="source.provider")
     clicks = serializers.IntegerField()
+    unique_readers = serializers.IntegerField(source="readers")
 
 
 class MonitoringTaskSnapshotSerializer(serializers.Serializer):
@@ -10,7 +10,10 @@ from django.test import override_settings
 from unittest.mock import patch
 from django.utils import timezone
 
-from blog.models import Article, Category, NewsSource, NewsletterSubscriber, Post
+from blog.models import Article, Category, NewsSource, NewsletterSubscriber, PlacementDaily, Post
+from blog.services.cache_store import write_many
+from blog.services.click_tracking import click_key, reset_click_analytics, top_clicked_key
+from blog.tasks import rollback_auto_published_posts
 
 
 class ApiHealthTests(APITestCase):
@@ -71,9 +74,10 @@ class ApiPhaseOneReadTests(APITestCase):
         response = self.client.get(reverse("api:posts-list"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn("count", response.data)
+        self.assertIn("next", response.data)
         self.assertIn("results", response.data)
-        self.assertEqual(response.data["count"], 2)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 2)
         titles = [item["title"] for item in response.data["results"]]
         self.assertIn("AI chip makers rally", titles)
         self.assertIn("Global policy update", titles)
@@ -83,9 +87,37 @@ class ApiPhaseOneReadTests(APITestCase):
         response = self.client.get(reverse("api:posts-list"), {"q": "chip"})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["title"], "AI chip makers rally")
 
+    @patch("api.pagination.PostKeysetPagination.page_size", 2)
+    def test_posts_list_walks_keyset_cursor_across_publish_ties(self):
+        shared_publish = timezone.now()
+        Post.objects.filter(status=Post.Status.PUBLISHED).update(publish=shared_publish)
+        for index in range(3):
+            Post.objects.create(
+                title=f"Tied post {index}",
+                slug=f"tied-post-{index}",
+                author=self.user,
+                body="Same second as the rest.",
+                publish=shared_publish,
+                status=Post.Status.PUBLISHED,
+            )
+
+        seen = []
+        url = reverse("api:posts-list")
+        while url:
+            with self.assertNumQueries(2):
+                # One range read of page_size + 1 rows plus the tags prefetch; never a COUNT(*).
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(Post.published.order_by("-publish", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(self.client.get(reverse("api:posts-list"), {"cursor": "not-a-cursor"}).status_code, 404)
+
     def test_post_detail_returns_published_post(self):
         response = self.client.get(reverse("api:posts-detail", kwargs={"pk": self.published_world.pk}))
 
@@ -195,7 +227,7 @@ class ApiPhaseTwoInteractionTests(APITestCase):
 
         list_response = self.client.get(reverse("api:bookmarks-list"))
         self.assertEqual(list_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(list_response.data["count"], 1)
+        self.assertEqual(len(list_response.data["results"]), 1)
         self.assertEqual(list_response.data["results"][0]["id"], self.post.id)
 
         unbookmarked = self.client.post(reverse("api:posts-bookmark", kwargs={"pk": self.post.pk}), {}, format="json")
@@ -393,10 +425,11 @@ class ApiPhaseFourPipelineTests(APITestCase):
         self.assertEqual(response.data["result"], {"status": "ok", "rolled_back": 1})
         rollback_mock.assert_called_once_with(limit=1)
 
-    @patch("api.views.rollback_auto_published_posts")
-    @patch("api.views.auto_publish_trusted_articles")
-    @patch("api.views.summarize_pending_articles")
-    @patch("api.views.fetch_all_active_sources")
+    @override_settings(PIPELINE_JOB_MODE="inline")
+    @patch("blog.tasks.rollback_auto_published_posts")
+    @patch("blog.tasks.auto_publish_trusted_articles")
+    @patch("blog.tasks.summarize_pending_articles")
+    @patch("blog.tasks.fetch_all_active_sources")
     def test_pipeline_run_executes_steps_in_order(
         self,
         fetch_all_mock,
@@ -423,17 +456,41 @@ class ApiPhaseFourPipelineTests(APITestCase):
             format="json",
         )
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual([row["action"] for row in response.data["results"]], ["fetch", "summarize", "publish", "rollback"])
-        self.assertEqual(response.data["results"][0]["result"], {"status": "ok", "sources": 3})
-        self.assertEqual(response.data["results"][1]["result"], {"status": "ok", "summarized": 2})
-        self.assertEqual(response.data["results"][2]["result"], {"status": "ok", "published": 1})
-        self.assertEqual(response.data["results"][3]["result"], {"status": "ok", "rolled_back": 1})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_response = self.client.get(response.data["status_url"])
+        self.assertEqual(job_response.status_code, status.HTTP_200_OK)
+        job = job_response.data
+        self.assertEqual(job["status"], "ok")
+        self.assertEqual(job["progress"]["completed_steps"], 4)
+        self.assertEqual([row["action"] for row in job["steps"]], ["fetch", "summarize", "publish", "rollback"])
+        self.assertEqual(job["steps"][0]["result"], {"status": "ok", "sources": 3})
+        self.assertEqual(job["steps"][1]["result"], {"status": "ok", "summarized": 2})
+        self.assertEqual(job["steps"][2]["result"], {"status": "ok", "published": 1})
+        self.assertEqual(job["steps"][3]["result"], {"status": "ok", "rolled_back": 1})
         fetch_all_mock.assert_called_once_with(max_items=5)
         summarize_mock.assert_called_once_with(limit=2)
         publish_mock.assert_called_once_with(limit=1)
         rollback_mock.assert_called_once_with(limit=1)
 
+    @patch("blog.tasks.run_pipeline_job.apply_async")
+    @patch("blog.tasks.fetch_all_active_sources")
+    def test_pipeline_run_enqueues_job_without_running_steps(self, fetch_all_mock, apply_async_mock):
+        self.client.force_authenticate(user=self.staff_user)
+
+        response = self.client.post(
+            reverse("api:pipeline-run"),
+            {"steps": [{"action": "fetch", "max_items": 5}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "queued")
+        apply_async_mock.assert_called_once_with(kwargs={"job_id": response.data["job_id"]})
+        fetch_all_mock.assert_not_called()
+        job = self.client.get(reverse("api:pipeline-job", kwargs={"job_id": response.data["job_id"]})).data
+        self.assertEqual(job["steps"][0]["status"], "pending")
+        self.assertEqual(job["progress"], {"completed_steps": 0, "total_steps": 1, "current_action": None})
+
 
 class ApiPhaseFiveManagementTests(APITestCase):
     def setUp(self):
@@ -540,13 +597,13 @@ class ApiPhaseFiveManagementTests(APITestCase):
 
         list_response = self.client.get(reverse("api:articles-list"))
         self.assertEqual(list_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(list_response.data["count"], 1)
+        self.assertEqual(len(list_response.data["results"]), 1)
         self.assertEqual(list_response.data["results"][0]["summary_provider"], "gemini")
         self.assertEqual(list_response.data["results"][0]["summary_category"], "Tech")
 
         queue_response = self.client.get(reverse("api:articles-queue"))
         self.assertEqual(queue_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(queue_response.data["count"], 1)
+        self.assertEqual(len(queue_response.data["results"]), 1)
 
         detail_response = self.client.get(reverse("api:articles-detail", kwargs={"pk": article.pk}))
         self.assertEqual(detail_response.status_code, status.HTTP_200_OK)
@@ -655,9 +712,18 @@ class ApiPhaseSixAnalyticsTests(APITestCase):
         )
 
     def test_analytics_dashboard_returns_summary_payload(self):
-        cache.set(f"analytics:clicks:post:{self.post.id}:total", 13, timeout=60)
-        cache.set(f"analytics:clicks:source:{self.source.id}:total", 42, timeout=60)
-        cache.set(f"analytics:clicks:source:{self.source.id}:last_seen", timezone.now(), timeout=60)
+        cache.clear()
+        reset_click_analytics()
+        self.addCleanup(reset_click_analytics)
+        write_many(
+            increments={
+                click_key("post", self.post.id, "total"): 13,
+                click_key("source", self.source.id, "total"): 42,
+            },
+            values={click_key("source", self.source.id, "last_seen"): timezone.now()},
+            ranked={top_clicked_key("post"): {self.post.id: 13}, top_clicked_key("source"): {self.source.id: 42}},
+            timeout=60,
+        )
 
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.get(reverse("api:analytics-dashboard"))
@@ -670,8 +736,26 @@ class ApiPhaseSixAnalyticsTests(APITestCase):
         self.assertEqual(response.data["top_sources"][0]["name"], "Phase 6 Source")
         self.assertEqual(response.data["top_sources"][0]["clicks"], 42)
         self.assertIn("retention_summary", response.data)
+        self.assertEqual(response.data["retention_summary"]["tracked_last_seen_events"], 1)
         self.assertIn("monitoring_overview", response.data)
 
+    def test_placements_endpoint_reads_placement_rollups(self):
+        today = timezone.localdate()
+        PlacementDaily.objects.create(placement="card-title", date=today, clicks=4, posts=2)
+        PlacementDaily.objects.create(placement="trending-card-image", date=today, clicks=12, posts=3)
+
+        response = self.client.get(reverse("api:analytics-placements"))
+        self.assertIn(response.status_code, {status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN})
+
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(reverse("api:analytics-placements"), {"days": 7})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["days"], 7)
+        self.assertEqual(response.data["total_clicks"], 16)
+        self.assertEqual(response.data["placements"][0]["placement"], "trending-card-image")
+        self.assertEqual(response.data["placements"][0]["share"], 0.75)
+
     def test_monitoring_health_returns_task_overview(self):
         cache.set("monitoring:task:summarize_pending_articles:last_status", "ok", timeout=60)
         cache.set("monitoring:task:summarize_pending_articles:total_runs", 3, timeout=60)
@@ -684,6 +768,19 @@ class ApiPhaseSixAnalyticsTests(APITestCase):
         self.assertEqual(response.data["status"], "healthy")
         self.assertTrue(any(item["task"] == "summarize_pending_articles" for item in response.data["tasks"]))
 
+    def test_monitoring_health_exposes_duration_histogram_and_recent_runs(self):
+        cache.clear()
+        result = rollback_auto_published_posts(limit=1)
+
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(reverse("api:analytics-health"))
+
+        task = next(item for item in response.data["tasks"] if item["task"] == "rollback_auto_published_posts")
+        self.assertEqual(task["duration"]["count"], 1)
+        self.assertEqual(len(task["duration"]["buckets"]), 11)
+        self.assertEqual(task["recent_runs"][0]["outcome"], "ok")
+        self.assertEqual(task["recent_runs"][0]["items"], result["rolled_back"])
+
     def test_launch_readiness_returns_report(self):
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.get(reverse("api:analytics-launch-readiness"))
@@ -695,29 +792,29 @@ class ApiPhaseSixAnalyticsTests(APITestCase):
         self.assertIn("fail_count", response.data)
 
     def test_export_csv_contains_post_and_source_rows(self):
-        cache.set(f"analytics:clicks:post:{self.post.id}:total", 7, timeout=60)
-        cache.set(f"analytics:clicks:source:{self.source.id}:total", 19, timeout=60)
+        cache.set(click_key("post", self.post.id, "total"), 7, timeout=60)
+        cache.set(click_key("source", self.source.id, "total"), 19, timeout=60)
 
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.get(reverse("api:analytics-export-csv"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response["Content-Type"], "text/csv")
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("type,id,title_or_name,clicks,source_clicks,publish_or_updated,meta", content)
         self.assertIn("Analytics post", content)
         self.assertIn("Phase 6 Source", content)
 
     def test_trending_snapshot_export_contains_ranked_rows(self):
-        cache.set(f"analytics:clicks:post:{self.post.id}:total", 14, timeout=60)
-        cache.set(f"analytics:clicks:post:{self.post.id}:last_seen", timezone.now(), timeout=60)
+        cache.set(click_key("post", self.post.id, "total"), 14, timeout=60)
+        cache.set(click_key("post", self.post.id, "last_seen"), timezone.now(), timeout=60)
 
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.get(reverse("api:analytics-trending-snapshot"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response["Content-Type"], "text/csv")
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("rank,post_id,title,score,likes,comments,post_clicks,source_clicks,freshness_bonus,source_name,publish_date", content)
         self.assertIn("Analytics post", content)
 
@@ -730,20 +827,20 @@ class ApiPhaseSixAnalyticsTests(APITestCase):
         self.assertEqual(response.data["reason"], "confirmation_required")
 
     def test_analytics_reset_clears_cache(self):
-        cache.set(f"analytics:clicks:post:{self.post.id}:total", 8, timeout=60)
-        cache.set(f"analytics:clicks:post:{self.post.id}:last_seen", timezone.now(), timeout=60)
-        cache.set(f"analytics:clicks:source:{self.source.id}:total", 21, timeout=60)
-        cache.set(f"analytics:clicks:source:{self.source.id}:last_seen", timezone.now(), timeout=60)
+        cache.set(click_key("post", self.post.id, "total"), 8, timeout=60)
+        cache.set(click_key("post", self.post.id, "last_seen"), timezone.now(), timeout=60)
+        cache.set(click_key("source", self.source.id, "total"), 21, timeout=60)
+        cache.set(click_key("source", self.source.id, "last_seen"), timezone.now(), timeout=60)
 
         self.client.force_authenticate(user=self.staff_user)
         response = self.client.post(reverse("api:analytics-reset"), {"confirm": "yes"}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data["reset"])
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{self.post.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{self.post.id}:last_seen"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{self.source.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{self.source.id}:last_seen"))
+        self.assertIsNone(cache.get(click_key("post", self.post.id, "total")))
+        self.assertIsNone(cache.get(click_key("post", self.post.id, "last_seen")))
+        self.assertIsNone(cache.get(click_key("source", self.source.id, "total")))
+        self.assertIsNone(cache.get(click_key("source", self.source.id, "last_seen")))
 
 
 class ApiPhaseSevenSportsTests(APITestCase):
@@ -8,6 +8,7 @@ from api.views import (
     AuthSessionAPIView,
     AnalyticsDashboardAPIView,
     AnalyticsExportCsvAPIView,
+    AnalyticsPlacementsAPIView,
     AnalyticsResetAPIView,
     AnalyticsTrendingSnapshotAPIView,
     BookmarkListAPIView,
@@ -27,6 +28,7 @@ from api.views import (
     NewsletterSubscriberListAPIView,
     NewsletterUnsubscribeAPIView,
     PipelineFetchAPIView,
+    PipelineJobStatusAPIView,
     PipelinePublishAPIView,
     PipelineRollbackAPIView,
     PipelineRunAPIView,
@@ -54,6 +56,7 @@ urlpatterns = [
     path("users/me", CurrentUserAPIView.as_view(), name="users-me"),
     path("analytics/dashboard", AnalyticsDashboardAPIView.as_view(), name="analytics-dashboard"),
     path("analytics/health", MonitoringHealthAPIView.as_view(), name="analytics-health"),
+    path("analytics/placements", AnalyticsPlacementsAPIView.as_view(), name="analytics-placements"),
     path("analytics/launch-readiness", LaunchReadinessAPIView.as_view(), name="analytics-launch-readiness"),
     path("analytics/export.csv", AnalyticsExportCsvAPIView.as_view(), name="analytics-export-csv"),
     path("analytics/trending-snapshot.csv", AnalyticsTrendingSnapshotAPIView.as_view(), name="analytics-trending-snapshot"),
@@ -78,6 +81,7 @@ urlpatterns = [
     path("pipeline/publish", PipelinePublishAPIView.as_view(), name="pipeline-publish"),
     path("pipeline/rollback", PipelineRollbackAPIView.as_view(), name="pipeline-rollback"),
     path("pipeline/run", PipelineRunAPIView.as_view(), name="pipeline-run"),
+    path("pipeline/jobs/<str:job_id>", PipelineJobStatusAPIView.as_view(), name="pipeline-job"),
     path("posts", PublishedPostListAPIView.as_view(), name="posts-list"),
     path("posts/<int:pk>", PublishedPostDetailAPIView.as_view(), name="posts-detail"),
     path("posts/<int:pk>/comments", PostCommentListCreateAPIView.as_view(), name="posts-comments"),
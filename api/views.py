@@ -4,9 +4,9 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.mail import send_mass_mail
-from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.db.models import Count, F, Q
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status
@@ -16,8 +16,8 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 from taggit.models import Tag, TaggedItem
-import csv
 
+from api.pagination import ArticleKeysetPagination, BookmarkKeysetPagination, PostKeysetPagination
 from api.serializers import (
     ArticleDetailSerializer,
     ArticleListSerializer,
@@ -41,20 +41,28 @@ from api.serializers import (
     SportsTableRowSerializer,
 )
 from blog.models import Article, Bookmark, Category, Comment, Like, NewsSource, NewsletterSubscriber, Post
+from blog.services.analytics_export import ANALYTICS_EXPORT_HEADER, analytics_rows, streaming_export
+from blog.services.click_rollups import placement_summary
 from blog.services.launch_readiness import compute_launch_readiness_checks
+from blog.services.pipeline_jobs import get_job as get_pipeline_job, job_progress
+from blog.services.trending import LIKE_WEIGHT, bump_trending
 from blog.views import (
     OPENLIGA_MAIN_LEAGUES,
-    _cached_click_count,
+    TRENDING_SNAPSHOT_HEADER,
+    _analytics_tracked_ids,
     _clear_all_analytics_metrics,
     _fetch_openligadb_endpoint,
-    _home_feed_score,
     _monitoring_overview,
     _rank_homepage_posts,
     _retention_summary,
+    _top_clicked_posts,
+    _top_clicked_sources,
+    _trending_snapshot_rows,
     digest_posts_queryset,
 )
 from blog.tasks import (
     auto_publish_trusted_articles,
+    enqueue_pipeline_job,
     fetch_all_active_sources,
     fetch_source_articles,
     rollback_auto_published_posts,
@@ -81,12 +89,12 @@ class ApiHealthView(APIView):
 
 class PublishedPostListAPIView(ListAPIView):
     serializer_class = PostListSerializer
+    pagination_class = PostKeysetPagination
 
     def get_queryset(self):
         queryset = (
             Post.published.select_related("category", "author", "source_article__source")
             .prefetch_related("tags")
-            .order_by("-publish")
         )
         query = (self.request.query_params.get("q") or "").strip()
         if query:
@@ -169,13 +177,18 @@ class PostCommentListCreateAPIView(APIView):
         return Response(output.data, status=status.HTTP_201_CREATED)
 
 
+def _engagement_count(post, field):
+    # Counters are bumped with F() by the like/bookmark signals, so the loaded instance may be behind.
+    return Post.objects.values_list(field, flat=True).get(pk=post.pk)
+
+
 class PostLikeAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
         post = get_object_or_404(Post.published, pk=pk)
         liked = Like.objects.filter(post=post, user=request.user).exists()
-        return Response({"liked": liked, "count": post.likes.count()})
+        return Response({"liked": liked, "count": _engagement_count(post, "like_count")})
 
     def post(self, request, pk):
         post = get_object_or_404(Post.published, pk=pk)
@@ -183,10 +196,12 @@ class PostLikeAPIView(APIView):
         if like_qs.exists():
             like_qs.delete()
             liked = False
+            bump_trending(post.id, -LIKE_WEIGHT)
         else:
             Like.objects.create(post=post, user=request.user)
             liked = True
-        return Response({"liked": liked, "count": post.likes.count()})
+            bump_trending(post.id, LIKE_WEIGHT)
+        return Response({"liked": liked, "count": _engagement_count(post, "like_count")})
 
 
 class PostBookmarkAPIView(APIView):
@@ -195,7 +210,7 @@ class PostBookmarkAPIView(APIView):
     def get(self, request, pk):
         post = get_object_or_404(Post.published, pk=pk)
         bookmarked = Bookmark.objects.filter(post=post, user=request.user).exists()
-        return Response({"bookmarked": bookmarked, "count": post.bookmarks.count()})
+        return Response({"bookmarked": bookmarked, "count": _engagement_count(post, "bookmark_count")})
 
     def post(self, request, pk):
         post = get_object_or_404(Post.published, pk=pk)
@@ -206,20 +221,21 @@ class PostBookmarkAPIView(APIView):
         else:
             Bookmark.objects.create(post=post, user=request.user)
             bookmarked = True
-        return Response({"bookmarked": bookmarked, "count": post.bookmarks.count()})
+        return Response({"bookmarked": bookmarked, "count": _engagement_count(post, "bookmark_count")})
 
 
 class BookmarkListAPIView(ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = PostListSerializer
+    pagination_class = BookmarkKeysetPagination
 
     def get_queryset(self):
+        # (post, user) is unique, so the bookmark join yields one row per post and needs no DISTINCT.
         return (
             Post.published.filter(bookmarks__user=self.request.user)
+            .annotate(bookmarked_at=F("bookmarks__created"))
             .select_related("category", "author", "source_article__source")
             .prefetch_related("tags")
-            .order_by("-bookmarks__created")
-            .distinct()
         )
 
 
@@ -451,9 +467,10 @@ class NewsSourceDetailAPIView(StaffOnlyAPIView, RetrieveUpdateDestroyAPIView):
 
 class ArticleListAPIView(StaffOnlyAPIView, ListAPIView):
     serializer_class = ArticleListSerializer
+    pagination_class = ArticleKeysetPagination
 
     def get_queryset(self):
-        queryset = Article.objects.select_related("source").order_by("-fetched_at")
+        queryset = Article.objects.select_related("source")
         status_filter = (self.request.query_params.get("status") or "").strip()
         source_id = (self.request.query_params.get("source_id") or "").strip()
         query = (self.request.query_params.get("q") or "").strip()
@@ -582,55 +599,45 @@ class ArticleModerationAPIView(StaffOnlyAPIView):
 
 class AnalyticsDashboardAPIView(StaffOnlyAPIView, APIView):
     def get(self, request):
-        posts = list(Post.published.select_related("source_article__source").order_by("-publish"))
-        sources = list(NewsSource.objects.filter(is_active=True).order_by("name"))
+        post_ids, source_ids = _analytics_tracked_ids()
         retention_days = max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30)))
-        retention_summary = _retention_summary(posts, sources)
+        retention_summary = _retention_summary(post_ids, source_ids)
         monitoring_overview = _monitoring_overview()
 
-        top_posts = sorted(
-            (
-                {
-                    "post_id": post.id,
-                    "title": post.title,
-                    "clicks": _cached_click_count("analytics:clicks:post", post.id),
-                    "source_clicks": _cached_click_count(
-                        "analytics:clicks:source",
-                        post.source_article.source_id if post.source_article_id and post.source_article and post.source_article.source_id else 0,
-                    ),
-                    "publish": post.publish,
-                }
-                for post in posts
-            ),
-            key=lambda item: (item["clicks"], item["source_clicks"], item["publish"]),
-            reverse=True,
-        )[:10]
-
-        top_sources = sorted(
-            (
-                {
-                    "source_id": source.id,
-                    "name": source.name,
-                    "provider": source.provider,
-                    "clicks": _cached_click_count("analytics:clicks:source", source.id),
-                    "trust_score": source.trust_score,
-                    "updated": source.updated,
-                }
-                for source in sources
-            ),
-            key=lambda item: (item["clicks"], item["trust_score"], item["updated"]),
-            reverse=True,
-        )[:10]
+        top_posts = [
+            {
+                "post_id": item["post"].id,
+                "title": item["post"].title,
+                "clicks": item["clicks"],
+                "source_clicks": item["source_clicks"],
+                "unique_readers": item["readers"],
+                "publish": item["post"].publish,
+            }
+            for item in _top_clicked_posts()
+        ]
+        top_sources = [
+            {
+                "source_id": item["source"].id,
+                "name": item["source"].name,
+                "provider": item["source"].provider,
+                "clicks": item["clicks"],
+                "unique_readers": item["readers"],
+                "trust_score": item["source"].trust_score,
+                "updated": item["source"].updated,
+            }
+            for item in _top_clicked_sources()
+        ]
 
         return Response(
             {
                 "canonical_url": request.build_absolute_uri(),
                 "top_posts": top_posts,
                 "top_sources": top_sources,
-                "tracked_posts_count": len(posts),
-                "tracked_sources_count": len(sources),
+                "tracked_posts_count": len(post_ids),
+                "tracked_sources_count": len(source_ids),
                 "total_clicks": sum(item["clicks"] for item in top_posts),
                 "analytics_retention_days": retention_days,
+                "unique_reader_days": max(1, int(getattr(settings, "ANALYTICS_UNIQUE_READER_DAYS", 7))),
                 "retention_summary": retention_summary,
                 "monitoring_overview": monitoring_overview,
             }
@@ -651,6 +658,15 @@ class MonitoringHealthAPIView(StaffOnlyAPIView):
         )
 
 
+class AnalyticsPlacementsAPIView(StaffOnlyAPIView):
+    def get(self, request):
+        try:
+            days = max(1, min(90, int(request.query_params.get("days", "14"))))
+        except (TypeError, ValueError):
+            days = 14
+        return Response({"generated_at": timezone.now().isoformat(), **placement_summary(days=days)})
+
+
 class LaunchReadinessAPIView(StaffOnlyAPIView):
     def get(self, request):
         report = compute_launch_readiness_checks()
@@ -669,97 +685,23 @@ class LaunchReadinessAPIView(StaffOnlyAPIView):
 
 class AnalyticsExportCsvAPIView(StaffOnlyAPIView):
     def get(self, request):
-        posts = list(Post.published.select_related("source_article__source").order_by("-publish"))
-        sources = list(NewsSource.objects.filter(is_active=True).order_by("name"))
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="analytics-dashboard.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "type",
-            "id",
-            "title_or_name",
-            "clicks",
-            "source_clicks",
-            "publish_or_updated",
-            "meta",
-        ])
-
-        for post in posts:
-            source_id = post.source_article.source_id if post.source_article_id and post.source_article and post.source_article.source_id else None
-            writer.writerow([
-                "post",
-                post.id,
-                post.title,
-                _cached_click_count("analytics:clicks:post", post.id),
-                _cached_click_count("analytics:clicks:source", source_id) if source_id else 0,
-                post.publish.isoformat(),
-                post.source_article.source.name if post.source_article_id and post.source_article and post.source_article.source else "",
-            ])
-
-        for source in sources:
-            writer.writerow([
-                "source",
-                source.id,
-                source.name,
-                _cached_click_count("analytics:clicks:source", source.id),
-                "",
-                source.updated.isoformat(),
-                source.get_provider_display(),
-            ])
-
-        return response
+        return streaming_export(
+            "analytics-dashboard",
+            ANALYTICS_EXPORT_HEADER,
+            analytics_rows(),
+            request.query_params.get("output"),
+        )
 
 
 class AnalyticsTrendingSnapshotAPIView(StaffOnlyAPIView):
     def get(self, request):
-        posts = list(
-            Post.published.select_related("source_article__source")
-            .prefetch_related("tags")
-            .annotate(
-                like_count=Count("likes", distinct=True),
-                comment_count=Count("comments", filter=Q(comments__approved=True), distinct=True),
-            )
-            .order_by("-publish")[:20]
+        return streaming_export(
+            "trending-snapshot",
+            TRENDING_SNAPSHOT_HEADER,
+            _trending_snapshot_rows(),
+            request.query_params.get("output"),
         )
 
-        ranked = _rank_homepage_posts(posts)[:10]
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="trending-snapshot.csv"'
-        writer = csv.writer(response)
-        writer.writerow([
-            "rank",
-            "post_id",
-            "title",
-            "score",
-            "likes",
-            "comments",
-            "post_clicks",
-            "source_clicks",
-            "freshness_bonus",
-            "source_name",
-            "publish_date",
-        ])
-
-        for index, post in enumerate(ranked, start=1):
-            metrics = _home_feed_score(post)
-            writer.writerow([
-                index,
-                post.id,
-                post.title,
-                round(metrics["total"], 2),
-                metrics["like_count"],
-                metrics["comment_count"],
-                round(metrics["post_clicks"], 2),
-                round(metrics["source_clicks"], 2),
-                metrics["freshness"],
-                post.source_article.source.name if post.source_article_id and post.source_article and post.source_article.source else "",
-                post.publish.date().isoformat(),
-            ])
-
-        return response
-
 
 class AnalyticsResetAPIView(StaffOnlyAPIView):
     def post(self, request):
@@ -768,7 +710,7 @@ class AnalyticsResetAPIView(StaffOnlyAPIView):
             return Response({"reset": False, "reason": "confirmation_required"}, status=status.HTTP_400_BAD_REQUEST)
 
         _clear_all_analytics_metrics()
-        return Response({"reset": True, "message": "All analytics cache entries were cleared."})
+        return Response({"reset": True, "message": "All click analytics, daily rollups and click scores were cleared."})
 
 
 class SportsFeedAPIView(APIView):
@@ -785,10 +727,6 @@ class SportsFeedAPIView(APIView):
         queryset = (
             Post.published.select_related("author", "category", "source_article__source")
             .prefetch_related("tags")
-            .annotate(
-                like_count=Count("likes", distinct=True),
-                comment_count=Count("comments", filter=Q(comments__approved=True), distinct=True),
-            )
             .filter(Q(source_article__source__provider=NewsSource.Provider.OPENLIGADB))
             .order_by("-publish")[:40]
         )
@@ -909,22 +847,6 @@ class SportsOpenLigaAPIView(APIView):
 class StaffPipelineAPIView(APIView):
     permission_classes = [IsAdminUser]
 
-    def _run_action(self, action, payload):
-        if action == "fetch":
-            source_id = payload.get("source_id")
-            max_items = payload.get("max_items", 20)
-            if source_id is not None:
-                return fetch_source_articles(source_id=source_id, max_items=max_items)
-            return fetch_all_active_sources(max_items=max_items)
-        if action == "summarize":
-            return summarize_pending_articles(limit=payload.get("limit", 20))
-        if action == "publish":
-            return auto_publish_trusted_articles(limit=payload.get("limit", 20))
-        if action == "rollback":
-            return rollback_auto_published_posts(limit=payload.get("limit", 20))
-        raise ValueError(f"Unsupported pipeline action: {action}")
-
-
 class PipelineFetchAPIView(StaffPipelineAPIView):
     def post(self, request):
         serializer = PipelineFetchSerializer(data=request.data)
@@ -976,9 +898,21 @@ class PipelineRunAPIView(StaffPipelineAPIView):
         serializer = PipelineRunSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        results = []
-        for step in serializer.validated_data["steps"]:
-            result = self._run_action(step["action"], step)
-            results.append({"action": step["action"], "result": result})
+        steps = [dict(step) for step in serializer.validated_data["steps"]]
+        job = enqueue_pipeline_job(steps, requested_by=request.user.get_username(), origin="api")
+        return Response(
+            {
+                "status": job["status"],
+                "job_id": job["id"],
+                "status_url": reverse("api:pipeline-job", kwargs={"job_id": job["id"]}),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
 
-        return Response({"status": "ok", "results": results})
+class PipelineJobStatusAPIView(StaffPipelineAPIView):
+    def get(self, request, job_id):
+        job = get_pipeline_job(job_id)
+        if job is None:
+            return Response({"detail": "Pipeline job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({**job, "progress": job_progress(job)})
@@ -7,6 +7,8 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from .models import Article, Bookmark, Category, Comment, Like, NewsSource, NewsletterSubscriber, Post
+from .services.click_rollups import clear_click_rollups
+from .services.click_tracking import clear_click_metrics, click_key
 
 
 def _build_unique_slug(title, publish_dt):
@@ -21,13 +23,13 @@ def _build_unique_slug(title, publish_dt):
 
 
 def _clear_post_click_metrics(post_id):
-    cache.delete(f'analytics:clicks:post:{post_id}:total')
-    cache.delete(f'analytics:clicks:post:{post_id}:last_seen')
+    clear_click_metrics('post', [post_id])
+    clear_click_rollups('post', [post_id])
 
 
 def _clear_source_click_metrics(source_id):
-    cache.delete(f'analytics:clicks:source:{source_id}:total')
-    cache.delete(f'analytics:clicks:source:{source_id}:last_seen')
+    clear_click_metrics('source', [source_id])
+    clear_click_rollups('source', [source_id])
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
@@ -42,7 +44,7 @@ class PostAdmin(admin.ModelAdmin):
     show_facets = admin.ShowFacets.ALWAYS
 
     def tracked_clicks(self, obj):
-        return cache.get(f'analytics:clicks:post:{obj.pk}:total', 0)
+        return cache.get(click_key('post', obj.pk, 'total'), 0)
 
     tracked_clicks.short_description = 'Clicks'
 
@@ -74,12 +76,12 @@ class PostAdmin(admin.ModelAdmin):
 
     @admin.action(description='Reset click metrics for selected posts')
     def reset_click_metrics(self, request, queryset):
-        for post in queryset.select_related('source_article'):
-            _clear_post_click_metrics(post.pk)
-            if post.source_article_id and post.source_article and post.source_article.source_id:
-                _clear_source_click_metrics(post.source_article.source_id)
+        rows = list(queryset.values_list('pk', 'source_article__source_id'))
+        clear_click_metrics('post', [post_id for post_id, _ in rows])
+        clear_click_metrics('source', {source_id for _, source_id in rows if source_id})
+        clear_click_rollups('post', [post_id for post_id, _ in rows])
 
-        self.message_user(request, f"{queryset.count()} post click metric(s) reset.")
+        self.message_user(request, f"{len(rows)} post click metric(s) reset.")
 
 # Register Category admin
 @admin.register(Category)
@@ -148,16 +150,17 @@ class NewsSourceAdmin(admin.ModelAdmin):
     actions = ['reset_click_metrics']
 
     def tracked_clicks(self, obj):
-        return cache.get(f'analytics:clicks:source:{obj.pk}:total', 0)
+        return cache.get(click_key('source', obj.pk, 'total'), 0)
 
     tracked_clicks.short_description = 'Clicks'
 
     @admin.action(description='Reset click metrics for selected sources')
     def reset_click_metrics(self, request, queryset):
-        for source in queryset:
-            _clear_source_click_metrics(source.pk)
+        source_ids = list(queryset.values_list('pk', flat=True))
+        clear_click_metrics('source', source_ids)
+        clear_click_rollups('source', source_ids)
 
-        self.message_user(request, f"{queryset.count()} source click metric(s) reset.")
+        self.message_user(request, f"{len(source_ids)} source click metric(s) reset.")
 
 
 @admin.register(Article)
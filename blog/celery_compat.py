@@ -1,7 +1,16 @@
+from django.conf import settings
+
 try:
+    from celery import chain as celery_chain
+    from celery import chord, current_app, current_task, group
     from celery import shared_task as celery_shared_task
 except ImportError:  # pragma: no cover
     celery_shared_task = None
+    celery_chain = None
+    chord = None
+    current_app = None
+    current_task = None
+    group = None
 
 
 def shared_task(*decorator_args, **decorator_kwargs):
@@ -14,3 +23,27 @@ def shared_task(*decorator_args, **decorator_kwargs):
     if decorator_args and callable(decorator_args[0]) and not decorator_kwargs:
         return decorator(decorator_args[0])
     return decorator
+
+
+def running_as_task(task) -> bool:
+    # Direct calls (views, management commands, the inline fallback) must keep returning a finished payload.
+    request = getattr(task, 'request', None)
+    return request is not None and not getattr(request, 'called_directly', True)
+
+
+def tasks_run_eagerly() -> bool:
+    # CELERY_TASK_ALWAYS_EAGER (the no-worker deployment): apply_async runs the task right here, in the caller.
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        return True
+    return current_app is not None and bool(current_app.conf.task_always_eager)
+
+
+def inside_worker() -> bool:
+    # Whichever task is executing right now: a retry queued for a different task still belongs on the broker.
+    return current_task is not None and running_as_task(current_task)
+
+
+def fanout_available(task) -> bool:
+    if chord is None or not getattr(settings, 'CELERY_FANOUT_ENABLED', True):
+        return False
+    return running_as_task(task)
@@ -0,0 +1,181 @@
+import json
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from blog.services.llm_standin import LLMStandInServer, StandInProfile
+from blog.services.summarization import ArticleSummarizationService
+
+
+SAMPLE_SENTENCES = (
+    'Officials confirmed the new policy will take effect at the start of next quarter.',
+    'Analysts expect the change to affect pricing across several regional markets.',
+    'The company reported revenue growth driven by its cloud software division.',
+    'Local teams are preparing for the championship match scheduled this weekend.',
+    'Researchers published findings suggesting the approach reduces energy use significantly.',
+    'Government ministers met with industry leaders to discuss the proposed regulation.',
+    'Critics argued that the timeline leaves little room for public consultation.',
+    'Supporters said the investment would create thousands of jobs over five years.',
+)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _parse_int_list(raw: str) -> list[int]:
+    try:
+        values = [int(item) for item in (raw or '').split(',') if item.strip()]
+    except ValueError as exc:
+        raise CommandError(f'Expected a comma-separated list of integers, got {raw!r}.') from exc
+    if not values or any(value < 1 for value in values):
+        raise CommandError(f'Expected positive integers, got {raw!r}.')
+    return values
+
+
+class Command(BaseCommand):
+    help = 'Measure summarization throughput and latency against the local LLM stand-in.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100)
+        parser.add_argument('--concurrency', default='1,4,8', help='Comma-separated worker counts to compare.')
+        parser.add_argument('--batch-size', default='20', help='Comma-separated batch sizes to compare.')
+        parser.add_argument('--provider', choices=['gemini', 'groq', 'local'], default='gemini')
+        parser.add_argument('--gemini-keys', type=int, default=2, help='Number of Gemini key slots to rotate.')
+        parser.add_argument('--standin-url', default='', help='Use an already running stand-in instead of spawning one.')
+        parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+        parser.add_argument('--latency-ms', type=float, default=400.0)
+        parser.add_argument('--jitter-ms', type=float, default=150.0)
+        parser.add_argument('--error-rate', type=float, default=0.0)
+        parser.add_argument('--burst-every', type=int, default=0)
+        parser.add_argument('--burst-length', type=int, default=0)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def _sample_articles(self, count: int, seed: int) -> list[str]:
+        rng = random.Random(seed)
+        articles = []
+        for _ in range(count):
+            sentences = rng.sample(SAMPLE_SENTENCES, k=rng.randint(4, len(SAMPLE_SENTENCES)))
+            articles.append(' '.join(sentences))
+        return articles
+
+    def _stats_reader(self, server, standin_url):
+        if server is not None:
+            return server.state.stats.snapshot
+
+        def read_remote():
+            with urlopen(f"{standin_url.rstrip('/')}/stats", timeout=5) as response:
+                return json.loads(response.read().decode('utf-8'))
+
+        return read_remote
+
+    def _run_scenario(self, texts, concurrency, batch_size, providers, read_stats) -> dict:
+        service = ArticleSummarizationService()
+        latencies = []
+        provider_counts = {}
+
+        def summarize_one(text):
+            started = time.perf_counter()
+            _, meta = service.summarize_text(text, providers=providers)
+            return time.perf_counter() - started, meta.get('provider', '')
+
+        before = read_stats()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Each batch mirrors one summarize_pending_articles run: it must drain before the next starts.
+            for offset in range(0, len(texts), batch_size):
+                for elapsed, provider in executor.map(summarize_one, texts[offset : offset + batch_size]):
+                    latencies.append(elapsed)
+                    provider_counts[provider] = provider_counts.get(provider, 0) + 1
+        wall_seconds = time.perf_counter() - started
+        after = read_stats()
+
+        requests = after['requests'] - before['requests']
+        llm_successes = after['ok'] - before['ok']
+        return {
+            'concurrency': concurrency,
+            'batch_size': batch_size,
+            'articles': len(texts),
+            'wall_seconds': wall_seconds,
+            'articles_per_second': len(texts) / wall_seconds if wall_seconds else 0.0,
+            'p50_ms': _percentile(latencies, 50) * 1000,
+            'p99_ms': _percentile(latencies, 99) * 1000,
+            'requests': requests,
+            'retry_requests': max(0, requests - llm_successes),
+            'rate_limited': after['rate_limited'] - before['rate_limited'],
+            'fallbacks': provider_counts.get('fallback', 0),
+            'providers': provider_counts,
+        }
+
+    def handle(self, *args, **options):
+        article_count = max(1, options['articles'])
+        concurrency_levels = _parse_int_list(options['concurrency'])
+        batch_sizes = _parse_int_list(options['batch_size'])
+        provider = options['provider']
+        providers = [provider] if provider == 'local' else [provider, 'groq' if provider == 'gemini' else 'gemini']
+
+        server = None
+        standin_url = options['standin_url']
+        if not standin_url:
+            profile = StandInProfile(
+                latency=options['latency'],
+                latency_ms=options['latency_ms'],
+                jitter_ms=options['jitter_ms'],
+                error_rate=options['error_rate'],
+                burst_every=options['burst_every'],
+                burst_length=options['burst_length'],
+                seed=options['seed'],
+            )
+            server = LLMStandInServer('127.0.0.1', 0, profile)
+            server.start_in_background()
+            standin_url = server.base_url
+
+        gemini_keys = ','.join(f'standin-key-{slot}' for slot in range(1, max(1, options['gemini_keys']) + 1))
+        texts = self._sample_articles(article_count, options['seed'])
+        read_stats = self._stats_reader(server, standin_url)
+
+        self.stdout.write(f'Stand-in: {standin_url} | provider order: {",".join(providers)} | articles: {article_count}')
+        self.stdout.write(
+            f"{'conc':>5} {'batch':>6} {'art/s':>8} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'requests':>9} {'retries':>8} {'429s':>6} {'fallback':>9}"
+        )
+        results = []
+        try:
+            with override_settings(
+                GEMINI_API_BASE_URL=standin_url,
+                GROQ_API_BASE_URL=standin_url,
+                GEMINI_API_KEYS=gemini_keys,
+                GEMINI_API_KEY='',
+                GROQ_API_KEY='standin-groq-key',
+            ):
+                for concurrency in concurrency_levels:
+                    for batch_size in batch_sizes:
+                        result = self._run_scenario(texts, concurrency, batch_size, providers, read_stats)
+                        results.append(result)
+                        self.stdout.write(
+                            f"{result['concurrency']:>5} {result['batch_size']:>6} "
+                            f"{result['articles_per_second']:>8.2f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+                            f"{result['requests']:>9} {result['retry_requests']:>8} {result['rate_limited']:>6} "
+                            f"{result['fallbacks']:>9}"
+                        )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        best = max(results, key=lambda item: item['articles_per_second'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Best throughput: {best['articles_per_second']:.2f} articles/s "
+                f"at concurrency={best['concurrency']} batch_size={best['batch_size']}"
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.services.engagement import reconcile_engagement_counters
+
+
+class Command(BaseCommand):
+    help = "Recount likes, approved comments and bookmarks and repair any drifted Post counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--post-id",
+            type=int,
+            action="append",
+            dest="post_ids",
+            help="Only reconcile this post (repeatable). Defaults to every post.",
+        )
+
+    def handle(self, *args, **options):
+        repaired = reconcile_engagement_counters(options["post_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Reconciled engagement counters: {repaired} posts repaired."))
@@ -1,8 +1,9 @@
 from django.conf import settings
-from django.core.cache import cache
 from django.core.management.base import BaseCommand
 
 from blog.models import NewsSource, Post
+from blog.services.cache_store import read_many
+from blog.services.click_tracking import click_key
 
 
 class Command(BaseCommand):
@@ -14,15 +15,12 @@ class Command(BaseCommand):
         post_ids = list(Post.published.values_list('id', flat=True))
         source_ids = list(NewsSource.objects.filter(is_active=True).values_list('id', flat=True))
 
-        post_last_seen_count = 0
-        source_last_seen_count = 0
-        for post_id in post_ids:
-            if cache.get(f'analytics:clicks:post:{post_id}:last_seen'):
-                post_last_seen_count += 1
-
-        for source_id in source_ids:
-            if cache.get(f'analytics:clicks:source:{source_id}:last_seen'):
-                source_last_seen_count += 1
+        post_last_seen_count = sum(
+            1 for value in read_many(click_key('post', post_id, 'last_seen') for post_id in post_ids).values() if value
+        )
+        source_last_seen_count = sum(
+            1 for value in read_many(click_key('source', source_id, 'last_seen') for source_id in source_ids).values() if value
+        )
 
         self.stdout.write(f'ANALYTICS_RETENTION_DAYS={retention_days}')
         self.stdout.write(f'Published posts tracked: {len(post_ids)}')
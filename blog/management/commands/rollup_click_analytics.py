@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.services.click_rollups import refresh_placement_rollups
+from blog.tasks import rollup_click_analytics
+
+
+class Command(BaseCommand):
+    help = "Flush pending click rollups into ClickDaily and refresh the precomputed click scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--placement-days",
+            type=int,
+            default=0,
+            help="Also rebuild placement rollups for this many trailing days (backfill).",
+        )
+
+    def handle(self, *args, **options):
+        result = rollup_click_analytics()
+        if options["placement_days"] > 0:
+            rows = refresh_placement_rollups(days=options["placement_days"])
+            self.stdout.write(f"Rebuilt {rows} placement rollup rows over {options['placement_days']} days.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rollup {result.get('status')}: flushed {result.get('flushed', 0)} clicks, "
+                f"scored {result.get('scored_posts', 0)} posts and {result.get('scored_sources', 0)} sources."
+            )
+        )
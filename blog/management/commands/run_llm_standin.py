@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from blog.services.llm_standin import LLMStandInServer, StandInProfile
+
+
+class Command(BaseCommand):
+    help = 'Run a local HTTP stand-in for the Gemini and Groq APIs with configurable latency and failures.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+        parser.add_argument('--latency-ms', type=float, default=400.0)
+        parser.add_argument('--jitter-ms', type=float, default=150.0)
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 503.')
+        parser.add_argument('--burst-every', type=int, default=0, help='Start a 429 burst every N requests.')
+        parser.add_argument('--burst-length', type=int, default=0, help='Consecutive 429 responses per burst.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        profile = StandInProfile(
+            latency=options['latency'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            error_rate=options['error_rate'],
+            burst_every=options['burst_every'],
+            burst_length=options['burst_length'],
+            seed=options['seed'],
+        )
+        server = LLMStandInServer(options['host'], options['port'], profile)
+        self.stdout.write(self.style.SUCCESS(f'LLM stand-in listening on {server.base_url}'))
+        self.stdout.write(f'Set GEMINI_API_BASE_URL={server.base_url} and GROQ_API_BASE_URL={server.base_url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Stats: {server.state.stats.snapshot()}')
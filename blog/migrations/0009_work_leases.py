@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_alter_newssource_provider"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="lease_owner",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="lease_owner",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["status", "lease_expires_at"], name="blog_articl_status_a1d84d_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_work_leases"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newssource",
+            name="click_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="click_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.CreateModel(
+            name="ClickDaily",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("placement", models.CharField(max_length=32)),
+                ("date", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("post", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="click_rollups", to="blog.post")),
+                ("source", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="click_rollups", to="blog.newssource")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["date"], name="blog_clickd_date_37c530_idx"), models.Index(fields=["source", "date"], name="blog_clickd_source__b30ea0_idx")],
+                "unique_together": {("post", "placement", "date")},
+            },
+        ),
+    ]
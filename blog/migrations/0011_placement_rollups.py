@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_click_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlacementDaily",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("placement", models.CharField(max_length=32)),
+                ("date", models.DateField()),
+                ("clicks", models.PositiveIntegerField(default=0)),
+                ("posts", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["date"], name="blog_placem_date_de125b_idx")],
+                "unique_together": {("placement", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_placement_rollups"),
+        ("taggit", "0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["-fetched_at", "-id"], name="blog_article_fetched_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bookmark",
+            index=models.Index(fields=["user", "-created"], name="blog_bookmark_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["status", "-publish", "-id"], name="blog_post_status_pub_id_idx"),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_engagement_counters(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+
+    def total(model_name, **filters):
+        model = apps.get_model("blog", model_name)
+        rows = model.objects.filter(post=OuterRef("pk"), **filters).order_by().values("post").annotate(n=Count("pk"))
+        return Coalesce(Subquery(rows.values("n"), output_field=IntegerField()), Value(0))
+
+    Post.objects.update(
+        like_count=total("Like"),
+        comment_count=total("Comment", approved=True),
+        bookmark_count=total("Bookmark"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="bookmark_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_engagement_counters, migrations.RunPython.noop),
+    ]
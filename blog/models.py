@@ -46,6 +46,13 @@ class Post(models.Model):
         null=True,
         blank=True,
     )
+    lease_owner = models.CharField(max_length=64, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    click_score = models.FloatField(default=0)
+    # Denormalized engagement, kept current by blog.signals and repaired by reconcile_engagement_counters.
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
 
 
     category = models.ForeignKey(                
@@ -62,7 +69,11 @@ class Post(models.Model):
 
     class Meta:
         ordering = ['-publish']                   
-        indexes = [models.Index(fields=['-publish'])] 
+        indexes = [
+            models.Index(fields=['-publish']),
+            # Keyset pagination key for the published listings and the posts API.
+            models.Index(fields=['status', '-publish', '-id'], name='blog_post_status_pub_id_idx'),
+        ]
 
     def __str__(self):
         return self.title or f"Post {self.pk}"
@@ -111,6 +122,7 @@ class NewsSource(models.Model):
     fetch_interval_minutes = models.PositiveIntegerField(default=60)
     base_url = models.URLField(blank=True)
     notes = models.TextField(blank=True)
+    click_score = models.FloatField(default=0)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
@@ -166,6 +178,8 @@ class Article(models.Model):
     originality_score = models.PositiveSmallIntegerField(default=0)
     is_ad_safe = models.BooleanField(default=True)
     language = models.CharField(max_length=10, default='en')
+    lease_owner = models.CharField(max_length=64, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
@@ -176,7 +190,9 @@ class Article(models.Model):
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['-fetched_at']),
+            models.Index(fields=['-fetched_at', '-id'], name='blog_article_fetched_id_idx'),
             models.Index(fields=['source', 'status']),
+            models.Index(fields=['status', 'lease_expires_at']),
         ]
 
     def __str__(self):
@@ -225,6 +241,7 @@ class Bookmark(models.Model):
     class Meta:
         unique_together = ('post', 'user')
         ordering = ['-created']
+        indexes = [models.Index(fields=['user', '-created'], name='blog_bookmark_user_created_idx')]
 
     def __str__(self):
         return f"{self.user} bookmarked {self.post}"
@@ -244,3 +261,48 @@ class NewsletterSubscriber(models.Model):
 
     def __str__(self):
         return self.email
+
+
+class ClickDaily(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='click_rollups')
+    source = models.ForeignKey(
+        NewsSource,
+        on_delete=models.SET_NULL,
+        related_name='click_rollups',
+        null=True,
+        blank=True,
+    )
+    placement = models.CharField(max_length=32)
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    objects = models.Manager()
+
+    class Meta:
+        unique_together = ('post', 'placement', 'date')
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['source', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id}/{self.placement} on {self.date}: {self.count}"
+
+
+class PlacementDaily(models.Model):
+    # One row per placement per day, derived from ClickDaily so placement reports never scan per-post rows.
+    placement = models.CharField(max_length=32)
+    date = models.DateField()
+    clicks = models.PositiveIntegerField(default=0)
+    posts = models.PositiveIntegerField(default=0)
+
+    objects = models.Manager()
+
+    class Meta:
+        unique_together = ('placement', 'date')
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.placement} on {self.date}: {self.clicks}"
@@ -0,0 +1,108 @@
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from blog.models import NewsSource, Post
+from blog.services.cache_store import read_many
+from blog.services.click_tracking import click_key
+
+
+ANALYTICS_EXPORT_HEADER = ["type", "id", "title_or_name", "clicks", "source_clicks", "publish_or_updated", "meta"]
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def export_chunk_size() -> int:
+    return max(100, int(getattr(settings, "ANALYTICS_EXPORT_CHUNK_SIZE", 2000)))
+
+
+def export_format(value) -> str:
+    value = (value or "csv").strip().lower()
+    return value if value in EXPORT_FORMATS else "csv"
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analytics_rows():
+    # Two cursors over values_list rows; click totals for each chunk come from one get_many.
+    size = export_chunk_size()
+    posts = (
+        Post.published.order_by("-publish", "-id")
+        .values_list("id", "title", "publish", "source_article__source_id", "source_article__source__name")
+        .iterator(chunk_size=size)
+    )
+    for chunk in _chunks(posts, size):
+        totals = read_many(
+            [click_key("post", row[0], "total") for row in chunk]
+            + [click_key("source", row[3], "total") for row in chunk if row[3]]
+        )
+        for post_id, title, publish, source_id, source_name in chunk:
+            yield [
+                "post",
+                post_id,
+                title,
+                int(totals.get(click_key("post", post_id, "total"), 0)),
+                int(totals.get(click_key("source", source_id, "total"), 0)) if source_id else 0,
+                publish.isoformat(),
+                source_name or "",
+            ]
+
+    providers = dict(NewsSource.Provider.choices)
+    sources = (
+        NewsSource.objects.filter(is_active=True)
+        .order_by("name", "id")
+        .values_list("id", "name", "updated", "provider")
+        .iterator(chunk_size=size)
+    )
+    for chunk in _chunks(sources, size):
+        totals = read_many(click_key("source", row[0], "total") for row in chunk)
+        for source_id, name, updated, provider in chunk:
+            yield [
+                "source",
+                source_id,
+                name,
+                int(totals.get(click_key("source", source_id, "total"), 0)),
+                "",
+                updated.isoformat(),
+                providers.get(provider, provider),
+            ]
+
+
+class _Echo:
+    # csv.writer only needs write(); returning the line lets the generator yield it straight out.
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def streaming_export(filename: str, header, rows, output: str = "csv") -> StreamingHttpResponse:
+    output = export_format(output)
+    content_type, extension = EXPORT_FORMATS[output]
+    lines = _ndjson_lines(header, rows) if output == "ndjson" else _csv_lines(header, rows)
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return response
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, QuerySet, Value, When
+from django.utils import timezone
+
+from blog.models import Article
+from blog.services.cache_store import read_many, write_many
+
+
+BUDGET_KEY_PREFIX = "llm_budget"
+COST_MICROS_PER_USD = Decimal("1000000")
+BUDGET_KEY_TTL_SECONDS = 3 * 24 * 60 * 60
+
+
+def annotate_summary_priority(queryset: QuerySet) -> QuerySet:
+    # Mirrors the auto-publish gate: trusted, original, auto-publishing sources come first, fresher wins ties.
+    now = timezone.now()
+    freshness = Case(
+        When(fetched_at__gte=now - timedelta(hours=6), then=Value(30)),
+        When(fetched_at__gte=now - timedelta(hours=24), then=Value(15)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    auto_publish_bonus = Case(
+        When(source__auto_publish=True, then=Value(25)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return queryset.annotate(
+        source_trust_score=F("source__trust_score"),
+        summary_priority=F("source__trust_score") + F("originality_score") + freshness + auto_publish_bonus,
+    ).order_by("-summary_priority", "-fetched_at")
+
+
+def prioritized_pending_articles() -> QuerySet:
+    queryset = Article.objects.select_related("source").filter(status=Article.Status.INGESTED)
+    return annotate_summary_priority(queryset)
+
+
+class SummarizationBudgetGovernor:
+    TRACKED_PROVIDERS = ("gemini", "groq", "local", "fallback")
+    BILLED_PROVIDERS = ("gemini", "groq")
+
+    def __init__(self, day=None):
+        self.day = day or timezone.localdate()
+        self.daily_budget_usd = Decimal(str(getattr(settings, "LLM_DAILY_BUDGET_USD", "0") or "0"))
+        self.daily_token_budget = int(getattr(settings, "LLM_DAILY_TOKEN_BUDGET", 0) or 0)
+        self.reserve_ratio = min(1.0, max(0.0, float(getattr(settings, "LLM_BUDGET_RESERVE_RATIO", 0.2))))
+        self.min_priority = int(getattr(settings, "LLM_BUDGET_RESERVE_MIN_PRIORITY", 150))
+
+    def _key(self, provider: str, metric: str) -> str:
+        return f"{BUDGET_KEY_PREFIX}:{self.day.isoformat()}:{provider}:{metric}"
+
+    def record(self, provider: str, total_tokens: int, cost_usd) -> None:
+        provider = provider or "fallback"
+        cost_micros = int((Decimal(str(cost_usd or "0")) * COST_MICROS_PER_USD).to_integral_value())
+        write_many(
+            increments={
+                self._key(provider, "tokens"): int(total_tokens or 0),
+                self._key(provider, "cost_micros"): cost_micros,
+                self._key(provider, "calls"): 1,
+            },
+            timeout=BUDGET_KEY_TTL_SECONDS,
+        )
+
+    def record_article(self, article: Article) -> None:
+        self.record(article.summary_provider, article.summary_total_tokens, article.summary_estimated_cost_usd)
+
+    def usage(self) -> dict:
+        keys = [
+            self._key(provider, metric)
+            for provider in self.TRACKED_PROVIDERS
+            for metric in ("tokens", "cost_micros", "calls")
+        ]
+        values = read_many(keys)
+        providers = {}
+        total_tokens = 0
+        total_cost_micros = 0
+        for provider in self.TRACKED_PROVIDERS:
+            tokens = int(values.get(self._key(provider, "tokens"), 0))
+            cost_micros = int(values.get(self._key(provider, "cost_micros"), 0))
+            providers[provider] = {
+                "tokens": tokens,
+                "cost_usd": str(Decimal(cost_micros) / COST_MICROS_PER_USD),
+                "calls": int(values.get(self._key(provider, "calls"), 0)),
+            }
+            if provider in self.BILLED_PROVIDERS:
+                total_tokens += tokens
+                total_cost_micros += cost_micros
+        return {
+            "day": self.day.isoformat(),
+            "providers": providers,
+            "total_tokens": total_tokens,
+            "total_cost_usd": str(Decimal(total_cost_micros) / COST_MICROS_PER_USD),
+            "budget_usd": str(self.daily_budget_usd),
+            "budget_tokens": self.daily_token_budget,
+            "utilization": round(self.utilization(total_tokens, total_cost_micros), 4),
+        }
+
+    def utilization(self, total_tokens: int | None = None, total_cost_micros: int | None = None) -> float:
+        if total_tokens is None or total_cost_micros is None:
+            keys = [
+                self._key(provider, metric) for provider in self.BILLED_PROVIDERS for metric in ("tokens", "cost_micros")
+            ]
+            values = read_many(keys)
+            total_tokens = sum(int(values.get(self._key(provider, "tokens"), 0)) for provider in self.BILLED_PROVIDERS)
+            total_cost_micros = sum(
+                int(values.get(self._key(provider, "cost_micros"), 0)) for provider in self.BILLED_PROVIDERS
+            )
+
+        ratios = [0.0]
+        if self.daily_budget_usd > 0:
+            ratios.append(float(Decimal(total_cost_micros) / (self.daily_budget_usd * COST_MICROS_PER_USD)))
+        if self.daily_token_budget > 0:
+            ratios.append(total_tokens / self.daily_token_budget)
+        return max(ratios)
+
+    def providers_for(self, article: Article) -> list[str] | None:
+        if self.daily_budget_usd <= 0 and self.daily_token_budget <= 0:
+            return None
+
+        utilization = self.utilization()
+        if utilization >= 1.0:
+            return ["local"]
+        if utilization >= 1.0 - self.reserve_ratio:
+            priority = getattr(article, "summary_priority", None)
+            if priority is None or priority < self.min_priority:
+                return ["local"]
+        return None
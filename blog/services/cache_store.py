@@ -0,0 +1,285 @@
+import heapq
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.services.hyperloglog import HyperLogLog
+
+
+def redis_client():
+    # Only Django's built-in RedisCache exposes a raw client we can pipeline through.
+    if cache.__class__.__name__ != "RedisCache":
+        return None
+    try:
+        return cache._cache.get_client(write=True)
+    except Exception:
+        return None
+
+
+def increment(key: str, amount: int = 1, timeout: int | None = None) -> int:
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        # The key expired between add() and incr(); start it over.
+        cache.set(key, amount, timeout=timeout)
+        return amount
+
+
+class LocalTopK:
+    # Sorted-set stand-in for caches without ZINCRBY: a Count-Min sketch estimates every member's total
+    # in fixed memory and a min-heap keeps only the `capacity` heaviest members as candidates.
+
+    def __init__(self, capacity: int, width: int = 2048, depth: int = 4):
+        self.capacity = max(1, capacity)
+        self.width = width
+        self.depth = depth
+        self._table = [[0] * width for _ in range(depth)]
+        self._candidates: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def _estimate_after(self, member: str, amount: float) -> float:
+        estimate = None
+        for row, counters in enumerate(self._table):
+            index = hash((row, member)) % self.width
+            counters[index] += amount
+            estimate = counters[index] if estimate is None else min(estimate, counters[index])
+        return estimate
+
+    def _floor(self) -> tuple[float, str]:
+        # Heap entries go stale when a candidate's estimate grows or it is evicted; skip those lazily.
+        while self._heap and self._candidates.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def add(self, member: str, amount: float) -> None:
+        estimate = self._estimate_after(member, amount)
+        if member not in self._candidates and len(self._candidates) >= self.capacity:
+            floor_estimate, floor_member = self._floor()
+            if estimate <= floor_estimate:
+                return
+            heapq.heappop(self._heap)
+            del self._candidates[floor_member]
+        self._candidates[member] = estimate
+        heapq.heappush(self._heap, (estimate, member))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(score, name) for name, score in self._candidates.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, member: str) -> None:
+        self._candidates.pop(member, None)
+
+    def top(self, k: int) -> list[tuple[str, float]]:
+        return sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+_local_rankings: dict[str, LocalTopK] = {}
+_local_rankings_lock = threading.Lock()
+_tally_lock = threading.Lock()
+
+
+def _local_ranking(key: str) -> LocalTopK:
+    ranking = _local_rankings.get(key)
+    if ranking is None:
+        ranking = _local_rankings.setdefault(key, LocalTopK(int(getattr(settings, "ANALYTICS_TOPK_CAPACITY", 200))))
+    return ranking
+
+
+def top_ranked(key: str, k: int) -> list[tuple[str, float]]:
+    # Highest-scored members first: ZREVRANGE on Redis, the in-process sketch elsewhere.
+    client = redis_client()
+    if client is not None:
+        replies = client.zrevrange(cache.make_and_validate_key(key), 0, max(0, k - 1), withscores=True)
+        return [(member.decode() if isinstance(member, bytes) else str(member), score) for member, score in replies]
+    with _local_rankings_lock:
+        return _local_ranking(key).top(k)
+
+
+def discard_ranked(key: str, members) -> None:
+    members = [str(member) for member in members]
+    if not members:
+        return
+    client = redis_client()
+    if client is not None:
+        client.zrem(cache.make_and_validate_key(key), *members)
+        return
+    with _local_rankings_lock:
+        ranking = _local_ranking(key)
+        for member in members:
+            ranking.discard(member)
+
+
+def replace_ranked(key: str, members: dict, timeout: int | None = None) -> None:
+    # Swaps in a freshly computed ranking; readers see either the old or the new set, never a partial one.
+    client = redis_client()
+    if client is not None:
+        raw_key = cache.make_and_validate_key(key)
+        pipeline = client.pipeline(transaction=True)
+        pipeline.delete(raw_key)
+        if members:
+            pipeline.zadd(raw_key, {str(member): float(score) for member, score in members.items()})
+            if timeout:
+                pipeline.expire(raw_key, int(timeout))
+        pipeline.execute()
+        return
+    ranking = LocalTopK(int(getattr(settings, "ANALYTICS_TOPK_CAPACITY", 200)))
+    for member, score in members.items():
+        ranking.add(str(member), float(score))
+    with _local_rankings_lock:
+        _local_rankings[key] = ranking
+
+
+def clear_ranked(keys) -> None:
+    keys = list(keys)
+    client = redis_client()
+    if client is not None:
+        if keys:
+            client.delete(*[cache.make_and_validate_key(key) for key in keys])
+        return
+    with _local_rankings_lock:
+        for key in keys:
+            _local_rankings.pop(key, None)
+
+
+def write_many(
+    increments: dict | None = None,
+    values: dict | None = None,
+    timeout: int | None = None,
+    ranked: dict | None = None,
+    unique: dict | None = None,
+    tallies: dict | None = None,
+) -> dict:
+    # Returns the post-increment value of every counter written. `ranked` maps a sorted-set key to
+    # {member: amount} and is applied with ZINCRBY in the same pipeline. `unique` maps a HyperLogLog key
+    # to the items to add; its entry in the result is True when the sketch changed (PFADD's reply).
+    # `tallies` maps a hash key to {field: amount} (HINCRBY); see drain_tally.
+    increments = {key: int(amount) for key, amount in (increments or {}).items() if int(amount)}
+    values = values or {}
+    ranked = {key: members for key, members in (ranked or {}).items() if members}
+    unique = {key: list(items) for key, items in (unique or {}).items() if items}
+    tallies = {key: fields for key, fields in (tallies or {}).items() if fields}
+    if not increments and not values and not ranked and not unique and not tallies:
+        return {}
+
+    client = redis_client()
+    if client is not None:
+        serializer = cache._cache._serializer
+        pipeline = client.pipeline(transaction=False)
+        for key, amount in increments.items():
+            raw_key = cache.make_and_validate_key(key)
+            pipeline.incrby(raw_key, amount)
+            if timeout:
+                pipeline.expire(raw_key, int(timeout))
+        for key, value in values.items():
+            pipeline.set(cache.make_and_validate_key(key), serializer.dumps(value), ex=int(timeout) if timeout else None)
+        for key, members in ranked.items():
+            raw_key = cache.make_and_validate_key(key)
+            for member, amount in members.items():
+                pipeline.zincrby(raw_key, float(amount), str(member))
+            if timeout:
+                pipeline.expire(raw_key, int(timeout))
+        unique_start = len(pipeline)
+        for key, items in unique.items():
+            raw_key = cache.make_and_validate_key(key)
+            pipeline.pfadd(raw_key, *items)
+            if timeout:
+                pipeline.expire(raw_key, int(timeout))
+        for key, fields in tallies.items():
+            raw_key = cache.make_and_validate_key(key)
+            for field, amount in fields.items():
+                pipeline.hincrby(raw_key, str(field), int(amount))
+            if timeout:
+                pipeline.expire(raw_key, int(timeout))
+        replies = pipeline.execute()
+        step = 2 if timeout else 1
+        result = {key: int(replies[index * step]) for index, key in enumerate(increments)}
+        result.update({key: bool(replies[unique_start + index * step]) for index, key in enumerate(unique)})
+        return result
+
+    counts = {}
+    for key, amount in increments.items():
+        counts[key] = increment(key, amount, timeout)
+        if timeout:
+            # Match the EXPIRE in the pipeline path: the TTL counts from the latest write.
+            cache.touch(key, timeout)
+    if values:
+        cache.set_many(values, timeout=timeout)
+    if ranked:
+        with _local_rankings_lock:
+            for key, members in ranked.items():
+                ranking = _local_ranking(key)
+                for member, amount in members.items():
+                    ranking.add(str(member), float(amount))
+    if unique:
+        # Read-modify-write: concurrent writers can drop each other's additions, which only nudges the estimate.
+        sketches = read_many(unique)
+        updated = {}
+        for key, items in unique.items():
+            sketch = HyperLogLog.from_bytes(sketches.get(key))
+            changed = [sketch.add(str(item)) for item in items]
+            counts[key] = any(changed)
+            if counts[key] or key not in sketches:
+                updated[key] = sketch.to_bytes()
+        if updated:
+            cache.set_many(updated, timeout=timeout)
+    if tallies:
+        with _tally_lock:
+            stored = read_many(tallies)
+            merged = {}
+            for key, fields in tallies.items():
+                tally = dict(stored.get(key) or {})
+                for field, amount in fields.items():
+                    tally[str(field)] = tally.get(str(field), 0) + int(amount)
+                merged[key] = tally
+            cache.set_many(merged, timeout=timeout)
+    return counts
+
+
+def drain_tally(key: str) -> dict[str, int]:
+    # Reads and deletes a tally in one step: increments that land afterwards start the next tally.
+    client = redis_client()
+    if client is not None:
+        raw_key = cache.make_and_validate_key(key)
+        pipeline = client.pipeline(transaction=True)
+        pipeline.hgetall(raw_key)
+        pipeline.delete(raw_key)
+        fields, _ = pipeline.execute()
+        return {
+            (field.decode() if isinstance(field, bytes) else str(field)): int(amount)
+            for field, amount in fields.items()
+        }
+    with _tally_lock:
+        tally = cache.get(key) or {}
+        cache.delete(key)
+    return dict(tally)
+
+
+def count_unique(groups: dict) -> dict:
+    # {name: [hll keys]} -> {name: estimated distinct items across the union of those keys}.
+    groups = {name: list(keys) for name, keys in groups.items()}
+    client = redis_client()
+    if client is not None:
+        pipeline = client.pipeline(transaction=False)
+        names = [name for name, keys in groups.items() if keys]
+        for name in names:
+            pipeline.pfcount(*[cache.make_and_validate_key(key) for key in groups[name]])
+        counts = dict(zip(names, (int(reply) for reply in pipeline.execute()))) if names else {}
+        return {name: counts.get(name, 0) for name in groups}
+
+    sketches = read_many({key for keys in groups.values() for key in keys})
+    counts = {}
+    for name, keys in groups.items():
+        union = HyperLogLog()
+        for key in keys:
+            if sketches.get(key):
+                union.merge(HyperLogLog.from_bytes(sketches[key]))
+        counts[name] = union.count()
+    return counts
+
+
+def read_many(keys) -> dict:
+    keys = list(keys)
+    if not keys:
+        return {}
+    return cache.get_many(keys)
@@ -0,0 +1,227 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from math import exp
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.utils import timezone
+
+from blog.models import ClickDaily, NewsSource, PlacementDaily, Post
+from blog.services.cache_store import count_unique, drain_tally, write_many
+from blog.services.click_tracking import _analytics_retention_seconds, pending_rollup_key, readers_key
+from blog.services.homepage_sections import rebuild_homepage_sections
+from blog.services.trending import refresh_trending_scores
+
+
+# Same decay constant the cache-based click signals used, so scores keep their scale.
+CLICK_DECAY_DAYS = 14.0
+
+
+def upsert_click_rollups(counts) -> int:
+    # Constant query count: insert missing rows at zero, re-read them, then add every delta in one bulk UPDATE.
+    rows = {}
+    for (post_id, source_id, placement, day), amount in counts.items():
+        key = (post_id, placement, day)
+        previous_source, previous_amount = rows.get(key, (source_id, 0))
+        rows[key] = (previous_source or source_id, previous_amount + int(amount))
+    if not rows:
+        return 0
+
+    post_ids = {post_id for post_id, _, _ in rows}
+    live_post_ids = set(Post.objects.filter(id__in=post_ids).order_by().values_list("id", flat=True))
+    rows = {key: value for key, value in rows.items() if key[0] in live_post_ids}
+    if not rows:
+        return 0
+
+    with transaction.atomic():
+        ClickDaily.objects.bulk_create(
+            [
+                ClickDaily(post_id=post_id, source_id=source_id, placement=placement, date=day, count=0)
+                for (post_id, placement, day), (source_id, _) in rows.items()
+            ],
+            ignore_conflicts=True,
+        )
+        existing = ClickDaily.objects.filter(
+            post_id__in={key[0] for key in rows},
+            placement__in={key[1] for key in rows},
+            date__in={key[2] for key in rows},
+        )
+        to_update = []
+        for rollup in existing:
+            key = (rollup.post_id, rollup.placement, rollup.date)
+            if key in rows:
+                rollup.count = F("count") + rows[key][1]
+                to_update.append(rollup)
+        ClickDaily.objects.bulk_update(to_update, ["count"])
+    return sum(amount for _, amount in rows.values())
+
+
+def _parse_rollup_tally(tally: dict) -> dict:
+    counts = {}
+    for field, amount in tally.items():
+        post_id, source_id, placement, day = field.split(":")
+        counts[(int(post_id), int(source_id) if source_id else None, placement, date.fromisoformat(day))] = int(amount)
+    return counts
+
+
+def flush_click_rollups() -> int:
+    # Drains the shared pending tally, so one periodic run picks up the clicks every web worker recorded.
+    # A failed write puts the counts back for the next run.
+    key = pending_rollup_key()
+    tally = drain_tally(key)
+    if not tally:
+        return 0
+    try:
+        return upsert_click_rollups(_parse_rollup_tally(tally))
+    except Exception:
+        write_many(tallies={key: tally}, timeout=_analytics_retention_seconds())
+        raise
+
+
+def _decay_weight(age_days: int) -> float:
+    return exp(-max(0, age_days) / CLICK_DECAY_DAYS)
+
+
+UNIQUE_READ_CHUNK = 1000
+
+
+def _daily_unique_readers(pairs) -> dict:
+    # (post_id, date) -> HyperLogLog estimate; days without a sketch (e.g. before a reset) are simply absent.
+    pairs = sorted(pairs)
+    estimates = {}
+    for start in range(0, len(pairs), UNIQUE_READ_CHUNK):
+        chunk = pairs[start:start + UNIQUE_READ_CHUNK]
+        estimates.update(count_unique({(post_id, day): [readers_key("post", post_id, day)] for post_id, day in chunk}))
+    return {pair: estimate for pair, estimate in estimates.items() if estimate}
+
+
+def _scored_rollups(today) -> QuerySet:
+    retention_days = max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30)))
+    return ClickDaily.objects.filter(date__gte=today - timedelta(days=retention_days))
+
+
+def _click_scores(rollups, today) -> tuple[dict, dict]:
+    rollups = list(rollups.values("post_id", "source_id", "date").annotate(total=Sum("count")))
+    readers = _daily_unique_readers({(row["post_id"], row["date"]) for row in rollups})
+
+    post_scores = defaultdict(float)
+    source_scores = defaultdict(float)
+    for row in rollups:
+        # A reader clicking the same post all day counts once toward ranking.
+        clicks = min(row["total"], readers.get((row["post_id"], row["date"]), row["total"]))
+        weighted = clicks * _decay_weight((today - row["date"]).days)
+        post_scores[row["post_id"]] += weighted
+        if row["source_id"]:
+            source_scores[row["source_id"]] += weighted
+    return post_scores, source_scores
+
+
+def refresh_click_scores(today=None) -> dict:
+    today = today or timezone.localdate()
+    post_scores, source_scores = _click_scores(_scored_rollups(today), today)
+
+    with transaction.atomic():
+        Post.objects.filter(click_score__gt=0).exclude(id__in=list(post_scores)).update(click_score=0)
+        Post.objects.bulk_update(
+            [Post(id=post_id, click_score=round(score, 4)) for post_id, score in post_scores.items()],
+            ["click_score"],
+            batch_size=500,
+        )
+        NewsSource.objects.filter(click_score__gt=0).exclude(id__in=list(source_scores)).update(click_score=0)
+        NewsSource.objects.bulk_update(
+            [NewsSource(id=source_id, click_score=round(score, 4)) for source_id, score in source_scores.items()],
+            ["click_score"],
+            batch_size=500,
+        )
+    trending = refresh_trending_scores()
+    # The homepage sections are derived from the trending set, so they follow its re-anchoring.
+    rebuild_homepage_sections()
+    return {"posts": len(post_scores), "sources": len(source_scores), "trending": trending}
+
+
+def refresh_placement_rollups(today=None, days: int = 2) -> int:
+    # Re-derives the trailing `days` of PlacementDaily from ClickDaily. Older days are final, so a periodic
+    # run only touches today and yesterday; a larger window backfills.
+    today = today or timezone.localdate()
+    since = today - timedelta(days=max(1, days) - 1)
+    rows = list(
+        ClickDaily.objects.filter(date__gte=since)
+        .values("placement", "date")
+        .annotate(total=Sum("count"), post_total=Count("post", distinct=True))
+        .order_by()
+    )
+    with transaction.atomic():
+        PlacementDaily.objects.filter(date__gte=since).delete()
+        PlacementDaily.objects.bulk_create(
+            [
+                PlacementDaily(placement=row["placement"], date=row["date"], clicks=row["total"], posts=row["post_total"])
+                for row in rows
+            ]
+        )
+    return len(rows)
+
+
+def clear_click_rollups(kind: str | None = None, ids=None, today=None) -> dict:
+    # The durable half of a click reset: ClickDaily would otherwise keep ranking by pre-reset clicks.
+    # No kind clears everything and rescores from scratch; "post"/"source" clear the rows attributed to
+    # those ids and rescore only the posts and sources those rows fed. Trending and the homepage sections
+    # pick the new scores up on the next periodic rollup.
+    today = today or timezone.localdate()
+    if kind is None:
+        with transaction.atomic():
+            ClickDaily.objects.all().delete()
+            PlacementDaily.objects.all().delete()
+        return refresh_click_scores(today)
+
+    ids = list(ids or [])
+    rollups = ClickDaily.objects.filter(**{f"{kind}_id__in": ids})
+    affected = list(rollups.order_by().values_list("post_id", "source_id", "date").distinct()) if ids else []
+    if not affected:
+        return {"posts": 0, "sources": 0}
+    post_ids = {post_id for post_id, _, _ in affected}
+    source_ids = {source_id for _, source_id, _ in affected if source_id}
+
+    with transaction.atomic():
+        rollups.delete()
+        # Every remaining row of an affected source is needed for its total; affected posts are covered too.
+        post_scores, source_scores = _click_scores(
+            _scored_rollups(today).filter(Q(post_id__in=post_ids) | Q(source_id__in=source_ids)), today
+        )
+        Post.objects.bulk_update(
+            [Post(id=post_id, click_score=round(post_scores.get(post_id, 0.0), 4)) for post_id in post_ids],
+            ["click_score"],
+            batch_size=500,
+        )
+        NewsSource.objects.bulk_update(
+            [
+                NewsSource(id=source_id, click_score=round(source_scores.get(source_id, 0.0), 4))
+                for source_id in source_ids
+            ],
+            ["click_score"],
+            batch_size=500,
+        )
+    # Only the days the cleared rows covered need their placement totals re-derived.
+    refresh_placement_rollups(today, days=(today - min(day for _, _, day in affected)).days + 1)
+    return {"posts": len(post_ids), "sources": len(source_ids)}
+
+
+def placement_summary(days: int = 14, today=None) -> dict:
+    today = today or timezone.localdate()
+    since = today - timedelta(days=max(1, days) - 1)
+    placements = {}
+    for placement, day, clicks, posts in (
+        PlacementDaily.objects.filter(date__gte=since)
+        .order_by("date", "placement")
+        .values_list("placement", "date", "clicks", "posts")
+    ):
+        entry = placements.setdefault(placement, {"placement": placement, "clicks": 0, "peak_posts": 0, "daily": []})
+        entry["clicks"] += clicks
+        entry["peak_posts"] = max(entry["peak_posts"], posts)
+        entry["daily"].append({"date": day, "clicks": clicks, "posts": posts})
+
+    total = sum(entry["clicks"] for entry in placements.values())
+    ranked = sorted(placements.values(), key=lambda entry: (entry["clicks"], entry["placement"]), reverse=True)
+    for entry in ranked:
+        entry["share"] = round(entry["clicks"] / total, 4) if total else 0.0
+    return {"days": max(1, days), "since": since, "total_clicks": total, "placements": ranked}
@@ -0,0 +1,392 @@
+import atexit
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Post
+from blog.services.cache_store import clear_ranked, count_unique, discard_ranked, top_ranked, write_many
+from blog.services.trending import POST_CLICK_WEIGHT, TRENDING_KEY, trending_increment
+
+
+POST_SOURCE_MAP_KEY = "analytics:published_post_sources"
+ANALYTICS_VERSION_KEY = "analytics:version"
+OTHER_PLACEMENT = "other"
+
+
+def _analytics_retention_seconds() -> int:
+    return max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30))) * 24 * 60 * 60
+
+
+def _map_ttl_seconds() -> int:
+    return max(5, int(getattr(settings, "CLICK_POST_MAP_TTL_SECONDS", 300)))
+
+
+class AnalyticsNamespace:
+    # Every click key embeds the current generation, so a global reset is a single INCR: the old generation is
+    # never read again and ages out through the retention TTL. The number is held in-process for a few seconds,
+    # so other workers may write to the old generation briefly after a reset.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded_at = 0.0
+
+    def _local_ttl_seconds(self) -> float:
+        return max(0.0, float(getattr(settings, "ANALYTICS_VERSION_LOCAL_SECONDS", 5)))
+
+    def current(self) -> int:
+        with self._lock:
+            if self._version is None or time.monotonic() - self._loaded_at >= self._local_ttl_seconds():
+                version = cache.get(ANALYTICS_VERSION_KEY)
+                if version is None:
+                    # Lost or never set: re-seed with what this process last saw rather than reviving generation 1.
+                    cache.add(ANALYTICS_VERSION_KEY, self._version or 1, timeout=None)
+                    version = cache.get(ANALYTICS_VERSION_KEY, self._version or 1)
+                self._version = int(version)
+                self._loaded_at = time.monotonic()
+            return self._version
+
+    def bump(self) -> int:
+        current = self.current()
+        cache.add(ANALYTICS_VERSION_KEY, current, timeout=None)
+        version = cache.incr(ANALYTICS_VERSION_KEY)
+        with self._lock:
+            self._version = int(version)
+            self._loaded_at = time.monotonic()
+        return self._version
+
+
+analytics_namespace = AnalyticsNamespace()
+
+
+def click_key(kind: str, obj_id: int, metric: str, version: int | None = None) -> str:
+    return f"analytics:v{version or analytics_namespace.current()}:clicks:{kind}:{obj_id}:{metric}"
+
+
+def top_clicked_key(kind: str, version: int | None = None) -> str:
+    return f"analytics:v{version or analytics_namespace.current()}:top:{kind}s"
+
+
+def pending_rollup_key(version: int | None = None) -> str:
+    # Clicks not yet written to ClickDaily, as one shared hash every web worker increments and the
+    # periodic rollup drains.
+    return f"analytics:v{version or analytics_namespace.current()}:rollup:pending"
+
+
+def rollup_field(post_id: int, source_id: int | None, placement: str, day) -> str:
+    return f"{post_id}:{source_id or ''}:{placement}:{day.isoformat()}"
+
+
+def tracked_placements() -> list[str]:
+    return list(getattr(settings, "CLICK_PLACEMENTS", [])) + [OTHER_PLACEMENT]
+
+
+def normalize_placement(placement: str) -> str:
+    # Placements come from the client; pinning them to a known set bounds the keys a reset has to cover.
+    placement = (placement or "unknown").strip().lower()[:32]
+    return placement if placement in tracked_placements() else OTHER_PLACEMENT
+
+
+def readers_key(kind: str, obj_id: int, day=None, version: int | None = None) -> str:
+    # One HyperLogLog per object per day: a couple of KB however many readers click.
+    return click_key(kind, obj_id, f"readers:{(day or timezone.localdate()).isoformat()}", version)
+
+
+def reader_window(days: int | None = None) -> list:
+    days = days or max(1, int(getattr(settings, "ANALYTICS_UNIQUE_READER_DAYS", 7)))
+    today = timezone.localdate()
+    return [today - timedelta(days=offset) for offset in range(days)]
+
+
+def click_metric_keys(kind: str, obj_id: int) -> list[str]:
+    version = analytics_namespace.current()
+    metrics = ["total", "last_seen"] + [f"placement:{placement}" for placement in tracked_placements()]
+    keys = [click_key(kind, obj_id, metric, version) for metric in metrics]
+    retention_days = max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30)))
+    keys.extend(readers_key(kind, obj_id, day, version) for day in reader_window(retention_days))
+    return keys
+
+
+def unique_readers(kind: str, ids, days: int | None = None) -> dict[int, int]:
+    window = reader_window(days)
+    version = analytics_namespace.current()
+    return count_unique({obj_id: [readers_key(kind, obj_id, day, version) for day in window] for obj_id in ids})
+
+
+class PostSourceMap:
+    # Published post id -> source id (or None), held in-process and shared through the cache, so a
+    # click normally costs no DB query and no cache read. Unknown ids trigger at most one rebuild per
+    # CLICK_POST_MAP_MIN_REFRESH_SECONDS, so junk ids cannot turn the endpoint into a DB scan.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mapping: dict[int, int | None] = {}
+        self._loaded_at = 0.0
+
+    def _local_ttl_seconds(self) -> float:
+        return max(1.0, float(getattr(settings, "CLICK_POST_MAP_LOCAL_SECONDS", 30)))
+
+    def _min_refresh_seconds(self) -> float:
+        return max(0.0, float(getattr(settings, "CLICK_POST_MAP_MIN_REFRESH_SECONDS", 10)))
+
+    def _build(self) -> dict[int, int | None]:
+        mapping = dict(Post.published.values_list("id", "source_article__source_id"))
+        cache.set(POST_SOURCE_MAP_KEY, mapping, timeout=_map_ttl_seconds())
+        return mapping
+
+    def _load(self, force: bool = False) -> None:
+        mapping = None if force else cache.get(POST_SOURCE_MAP_KEY)
+        if mapping is None:
+            mapping = self._build()
+        self._mapping = mapping
+        self._loaded_at = time.monotonic()
+
+    def lookup(self, post_id: int) -> tuple[bool, int | None]:
+        with self._lock:
+            age = time.monotonic() - self._loaded_at
+            if not self._loaded_at or age > self._local_ttl_seconds():
+                self._load()
+                age = 0.0
+            if post_id not in self._mapping and age >= self._min_refresh_seconds():
+                self._load(force=True)
+            if post_id not in self._mapping:
+                return False, None
+            return True, self._mapping[post_id]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+        cache.delete(POST_SOURCE_MAP_KEY)
+
+
+class ClickBuffer:
+    # Per-process accumulator: counters are summed locally and written in one pipelined batch. Reader sketches
+    # are never buffered; callers write them straight away, since their result decides first-of-day trending.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._increments: Counter = Counter()
+        self._last_seen: dict = {}
+        self._ranked: defaultdict = defaultdict(Counter)
+        self._tallies: defaultdict = defaultdict(Counter)
+        self._events = 0
+        self._started_at = time.monotonic()
+        self._flusher = None
+
+    def add(
+        self,
+        increments: dict,
+        last_seen: dict,
+        ranked: dict,
+        tallies: dict | None = None,
+        events: int = 1,
+    ) -> None:
+        with self._lock:
+            self._increments.update(increments)
+            self._last_seen.update(last_seen)
+            for key, members in ranked.items():
+                self._ranked[key].update(members)
+            for key, fields in (tallies or {}).items():
+                self._tallies[key].update(fields)
+            self._events += events
+            due = (
+                self._events >= int(getattr(settings, "CLICK_BUFFER_MAX_EVENTS", 500))
+                or time.monotonic() - self._started_at >= _flush_interval_seconds()
+            )
+        self._ensure_flusher()
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            increments, last_seen, ranked = self._increments, self._last_seen, self._ranked
+            tallies, events = self._tallies, self._events
+            self._increments, self._last_seen, self._events = Counter(), {}, 0
+            self._ranked, self._tallies = defaultdict(Counter), defaultdict(Counter)
+            self._started_at = time.monotonic()
+        if events:
+            write_many(
+                increments=dict(increments),
+                values=last_seen,
+                ranked={key: dict(members) for key, members in ranked.items()},
+                tallies={key: dict(fields) for key, fields in tallies.items()},
+                timeout=_analytics_retention_seconds(),
+            )
+        return events
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._events
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = start_flusher("click-buffer-flusher", _flush_interval_seconds, self.flush)
+
+
+def _flush_interval_seconds() -> float:
+    return max(0.1, float(getattr(settings, "CLICK_BUFFER_FLUSH_SECONDS", 2)))
+
+
+def start_flusher(name: str, interval, flush) -> threading.Thread:
+    def run():
+        while True:
+            time.sleep(max(0.1, interval()))
+            try:
+                flush()
+            except Exception:
+                # A cache or DB outage must not kill the flusher; the next tick tries again.
+                pass
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+post_sources = PostSourceMap()
+click_buffer = ClickBuffer()
+atexit.register(click_buffer.flush)
+
+
+def click_keys(
+    post_id: int,
+    source_id: int | None,
+    placement: str,
+    reader: str | None = None,
+    at=None,
+) -> tuple[dict, dict, dict, dict, dict]:
+    now = at or timezone.now()
+    day = timezone.localdate(now)
+    version = analytics_namespace.current()
+    unique = {readers_key("post", post_id, day, version): [reader]} if reader else {}
+    tallies = {pending_rollup_key(version): {rollup_field(post_id, source_id, placement, day): 1}}
+    increments = {
+        click_key("post", post_id, "total", version): 1,
+        click_key("post", post_id, f"placement:{placement}", version): 1,
+    }
+    last_seen = {click_key("post", post_id, "last_seen", version): now}
+    ranked = {top_clicked_key("post", version): {post_id: 1}}
+    if source_id:
+        increments[click_key("source", source_id, "total", version)] = 1
+        increments[click_key("source", source_id, f"placement:{placement}", version)] = 1
+        last_seen[click_key("source", source_id, "last_seen", version)] = now
+        ranked[top_clicked_key("source", version)] = {source_id: 1}
+        if reader:
+            unique[readers_key("source", source_id, day, version)] = [reader]
+    return increments, last_seen, ranked, unique, tallies
+
+
+def record_click(post_id: int, source_id: int | None, placement: str, reader: str | None = None) -> dict | None:
+    # Returns the new counter values, or None when the click was buffered for a later flush.
+    # The tally in click_keys feeds the durable daily rollup, which the periodic rollup task writes to the DB.
+    increments, last_seen, ranked, unique, tallies = click_keys(post_id, source_id, placement, reader)
+    # Only a reader's first click of the day moves the trending rank; repeat clicks still count as clicks.
+    trending = trending_increment(post_id, POST_CLICK_WEIGHT)
+    post_readers_key = readers_key("post", post_id)
+    if getattr(settings, "CLICK_BUFFER_ENABLED", False):
+        # The shared sketch is the only place that knows whether another worker already saw this reader today.
+        if not reader or write_many(unique=unique, timeout=_analytics_retention_seconds()).get(post_readers_key):
+            ranked.update(trending)
+        click_buffer.add(increments, last_seen, ranked, tallies)
+        return None
+    if not reader:
+        ranked.update(trending)
+    counts = write_many(
+        increments=increments,
+        values=last_seen,
+        ranked=ranked,
+        unique=unique,
+        tallies=tallies,
+        timeout=_analytics_retention_seconds(),
+    )
+    if reader and counts.get(post_readers_key):
+        write_many(ranked=trending, timeout=_analytics_retention_seconds())
+    return counts
+
+
+def record_clicks(events, reader: str | None = None) -> int:
+    # Batched record_click for beacon payloads. `events` are (post_id, source_id, placement, at) tuples; the whole
+    # batch lands in one pipelined write, plus at most one more for readers' first-sighting trending bumps.
+    events = list(events)
+    if not events:
+        return 0
+    increments, last_seen, ranked, unique = Counter(), {}, defaultdict(Counter), defaultdict(set)
+    tallies = defaultdict(Counter)
+    reader_posts = {}
+    for post_id, source_id, placement, at in events:
+        event_increments, event_last_seen, event_ranked, event_unique, event_tallies = click_keys(
+            post_id, source_id, placement, reader, at
+        )
+        increments.update(event_increments)
+        for key, seen_at in event_last_seen.items():
+            last_seen[key] = max(seen_at, last_seen.get(key, seen_at))
+        for key, members in event_ranked.items():
+            ranked[key].update(members)
+        for key, items in event_unique.items():
+            unique[key].update(items)
+        for key, fields in event_tallies.items():
+            tallies[key].update(fields)
+        if reader:
+            reader_posts.setdefault(post_id, (readers_key("post", post_id, timezone.localdate(at)), at))
+        else:
+            ranked[TRENDING_KEY].update(trending_increment(post_id, POST_CLICK_WEIGHT, at)[TRENDING_KEY])
+
+    if getattr(settings, "CLICK_BUFFER_ENABLED", False):
+        counts = write_many(
+            unique={key: sorted(items) for key, items in unique.items()},
+            timeout=_analytics_retention_seconds(),
+        )
+        for post_id, (post_readers_key, at) in reader_posts.items():
+            if counts.get(post_readers_key):
+                ranked[TRENDING_KEY].update(trending_increment(post_id, POST_CLICK_WEIGHT, at)[TRENDING_KEY])
+        click_buffer.add(
+            dict(increments),
+            last_seen,
+            {key: dict(members) for key, members in ranked.items()},
+            {key: dict(fields) for key, fields in tallies.items()},
+            events=len(events),
+        )
+        return len(events)
+
+    counts = write_many(
+        increments=dict(increments),
+        values=last_seen,
+        ranked={key: dict(members) for key, members in ranked.items()},
+        unique={key: sorted(items) for key, items in unique.items()},
+        tallies={key: dict(fields) for key, fields in tallies.items()},
+        timeout=_analytics_retention_seconds(),
+    )
+    first_reads = Counter()
+    for post_id, (post_readers_key, at) in reader_posts.items():
+        if counts.get(post_readers_key):
+            first_reads.update(trending_increment(post_id, POST_CLICK_WEIGHT, at)[TRENDING_KEY])
+    if first_reads:
+        write_many(ranked={TRENDING_KEY: dict(first_reads)}, timeout=_analytics_retention_seconds())
+    return len(events)
+
+
+def top_clicked(kind: str, limit: int) -> list[int]:
+    # Candidate ids only: rankings may lag or hold deleted ids, so callers re-read exact totals and re-sort.
+    return [int(member) for member, _ in top_ranked(top_clicked_key(kind), limit)]
+
+
+def clear_click_metrics(kind: str, ids) -> None:
+    ids = list(ids)
+    if not ids:
+        return
+    cache.delete_many([key for obj_id in ids for key in click_metric_keys(kind, obj_id)])
+    discard_ranked(top_clicked_key(kind), ids)
+
+
+def reset_click_analytics() -> int:
+    previous = analytics_namespace.current()
+    version = analytics_namespace.bump()
+    # Only the rankings are dropped eagerly; in-process sketches would otherwise outlive their generation.
+    clear_ranked([top_clicked_key("post", previous), top_clicked_key("source", previous)])
+    return version
@@ -0,0 +1,39 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class LocalDelayedQueue:
+    # In-process stand-in for a broker's countdown when tasks run inline: entries wait here until they are due.
+
+    def __init__(self):
+        self._heap = []
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def push(self, delay_seconds: float, func, kwargs: dict) -> float:
+        run_at = time.time() + max(0.0, float(delay_seconds))
+        with self._lock:
+            heapq.heappush(self._heap, (run_at, next(self._sequence), func, dict(kwargs)))
+        return run_at
+
+    def pop_due(self, now: float | None = None) -> list[tuple]:
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, func, kwargs = heapq.heappop(self._heap)
+                due.append((func, kwargs))
+        return due
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+
+delayed_queue = LocalDelayedQueue()
@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from blog.models import Bookmark, Comment, Like, Post
+
+
+ENGAGEMENT_COUNTERS = ("like_count", "comment_count", "bookmark_count")
+RECONCILE_BATCH_SIZE = 500
+
+
+def adjust_engagement(post_id: int, field: str, delta: int) -> None:
+    # Single UPDATE ... SET n = n + delta, so concurrent likes never lose an increment.
+    Post.objects.filter(pk=post_id).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def _count_subquery(queryset) -> Coalesce:
+    totals = queryset.filter(post=OuterRef("pk")).order_by().values("post").annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(totals, output_field=IntegerField()), Value(0))
+
+
+def actual_engagement_counts() -> dict:
+    return {
+        "actual_likes": _count_subquery(Like.objects.all()),
+        "actual_comments": _count_subquery(Comment.objects.filter(approved=True)),
+        "actual_bookmarks": _count_subquery(Bookmark.objects.all()),
+    }
+
+
+def reconcile_engagement_counters(post_ids=None) -> int:
+    # Rewrites only the rows whose stored counters drifted from the source tables; returns how many.
+    queryset = Post.objects.all() if post_ids is None else Post.objects.filter(pk__in=list(post_ids))
+    drifted = [
+        Post(id=post_id, like_count=likes, comment_count=comments, bookmark_count=bookmarks)
+        for post_id, likes, comments, bookmarks in queryset.annotate(**actual_engagement_counts())
+        .exclude(
+            like_count=F("actual_likes"),
+            comment_count=F("actual_comments"),
+            bookmark_count=F("actual_bookmarks"),
+        )
+        .order_by()
+        .values_list("id", "actual_likes", "actual_comments", "actual_bookmarks")
+    ]
+    with transaction.atomic():
+        Post.objects.bulk_update(drifted, list(ENGAGEMENT_COUNTERS), batch_size=RECONCILE_BATCH_SIZE)
+    return len(drifted)
@@ -0,0 +1,173 @@
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+BYLINE_PATTERN = re.compile(
+    r"^(by\s+[A-Z]|[A-Z][A-Z .,'\-]{2,40}\s+\((?:reuters|ap|afp)\)|updated\b|published\b|photo:|image:)",
+    flags=re.IGNORECASE,
+)
+
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have having
+    he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+    nor not now of off on once only or other our ours ourselves out over own said same she should so some such
+    than that the their theirs them themselves then there these they this those through to too under until up
+    very was we were what when where which while who whom why will with would you your yours yourself
+    """.split()
+)
+
+
+class ExtractiveSummarizer:
+    DAMPING = 0.85
+    MAX_ITERATIONS = 50
+    TOLERANCE = 1.0e-6
+
+    def __init__(self, max_sentences: int = 3, max_words: int = 80):
+        self.max_sentences = max(1, int(max_sentences))
+        self.max_words = max(10, int(max_words))
+
+    def split_sentences(self, text: str) -> list[str]:
+        normalized = " ".join((text or "").split())
+        if not normalized:
+            return []
+        return [part.strip() for part in SENTENCE_SPLIT_PATTERN.split(normalized) if part.strip()]
+
+    def tokenize(self, sentence: str) -> list[str]:
+        return [word for word in WORD_PATTERN.findall(sentence.lower()) if word not in STOPWORDS and len(word) > 1]
+
+    def _is_boilerplate(self, sentence: str) -> bool:
+        words = sentence.split()
+        if len(words) < 5:
+            return True
+        return bool(BYLINE_PATTERN.match(sentence))
+
+    def _tfidf_rows(self, tokenized: list[list[str]]) -> tuple[list[str], list[dict[str, float]]]:
+        document_frequency = Counter()
+        for tokens in tokenized:
+            document_frequency.update(set(tokens))
+
+        vocabulary = sorted(document_frequency)
+        total = len(tokenized)
+        idf = {term: math.log((1 + total) / (1 + freq)) + 1.0 for term, freq in document_frequency.items()}
+
+        rows = []
+        for tokens in tokenized:
+            counts = Counter(tokens)
+            length = max(1, len(tokens))
+            rows.append({term: (count / length) * idf[term] for term, count in counts.items()})
+        return vocabulary, rows
+
+    def _rank_with_numpy(self, vocabulary: list[str], rows: list[dict[str, float]]) -> list[float]:
+        index = {term: position for position, term in enumerate(vocabulary)}
+        matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float64)
+        for row_number, row in enumerate(rows):
+            for term, weight in row.items():
+                matrix[row_number, index[term]] = weight
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        unit = matrix / norms
+        similarity = unit @ unit.T
+        np.fill_diagonal(similarity, 0.0)
+
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        out_weight[out_weight == 0] = 1.0
+        transition = (similarity / out_weight).T
+
+        size = len(rows)
+        scores = np.full(size, 1.0 / size)
+        teleport = (1.0 - self.DAMPING) / size
+        for _ in range(self.MAX_ITERATIONS):
+            updated = teleport + self.DAMPING * (transition @ scores)
+            if np.abs(updated - scores).sum() < self.TOLERANCE:
+                scores = updated
+                break
+            scores = updated
+        return scores.tolist()
+
+    def _rank_pure_python(self, rows: list[dict[str, float]]) -> list[float]:
+        norms = [math.sqrt(sum(weight * weight for weight in row.values())) or 1.0 for row in rows]
+        size = len(rows)
+        similarity = [[0.0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i + 1, size):
+                shared = rows[i].keys() & rows[j].keys()
+                if not shared:
+                    continue
+                value = sum(rows[i][term] * rows[j][term] for term in shared) / (norms[i] * norms[j])
+                similarity[i][j] = value
+                similarity[j][i] = value
+
+        out_weight = [sum(row) or 1.0 for row in similarity]
+        scores = [1.0 / size] * size
+        teleport = (1.0 - self.DAMPING) / size
+        for _ in range(self.MAX_ITERATIONS):
+            updated = [
+                teleport + self.DAMPING * sum(similarity[j][i] / out_weight[j] * scores[j] for j in range(size))
+                for i in range(size)
+            ]
+            delta = sum(abs(a - b) for a, b in zip(updated, scores))
+            scores = updated
+            if delta < self.TOLERANCE:
+                break
+        return scores
+
+    def score_sentences(self, sentences: list[str]) -> list[float]:
+        tokenized = [self.tokenize(sentence) for sentence in sentences]
+        vocabulary, rows = self._tfidf_rows(tokenized)
+        if not vocabulary:
+            return [0.0] * len(sentences)
+
+        if np is not None:
+            scores = self._rank_with_numpy(vocabulary, rows)
+        else:
+            scores = self._rank_pure_python(rows)
+
+        adjusted = []
+        for position, (sentence, score) in enumerate(zip(sentences, scores)):
+            # Lead sentences carry the news in most wire copy; datelines and bylines carry none.
+            position_weight = 1.0 + 0.5 / (1 + position)
+            if self._is_boilerplate(sentence):
+                position_weight *= 0.1
+            adjusted.append(score * position_weight)
+        return adjusted
+
+    def _truncate_words(self, text: str) -> str:
+        words = text.split()
+        if len(words) <= self.max_words:
+            return text
+        return " ".join(words[: self.max_words]) + "..."
+
+    def summarize(self, text: str) -> str:
+        sentences = self.split_sentences(text)
+        if not sentences:
+            return ""
+        if len(sentences) <= 1:
+            return self._truncate_words(sentences[0])
+
+        scores = self.score_sentences(sentences)
+        ranked = sorted(range(len(sentences)), key=lambda position: (-scores[position], position))
+
+        selected = []
+        word_budget = self.max_words
+        for position in ranked:
+            if len(selected) >= self.max_sentences:
+                break
+            length = len(sentences[position].split())
+            if selected and length > word_budget:
+                continue
+            selected.append(position)
+            word_budget -= length
+
+        summary = " ".join(sentences[position] for position in sorted(selected))
+        return self._truncate_words(summary)
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Post
+from blog.services.trending import homepage_score, trending_post_ids
+
+
+HOMEPAGE_SECTIONS_KEY = "homepage:sections"
+HOMEPAGE_SECTIONS_PENDING_KEY = "homepage:sections:pending"
+HOMEPAGE_SECTIONS = ("trending", "fresh", "editor")
+SECTION_SIZE = 4
+
+
+def sections_ttl_seconds() -> int:
+    return max(60, int(getattr(settings, "HOMEPAGE_SECTIONS_TTL_SECONDS", 900)))
+
+
+def sections_debounce_seconds() -> int:
+    return max(0, int(getattr(settings, "HOMEPAGE_SECTIONS_DEBOUNCE_SECONDS", 5)))
+
+
+def _trending_ids(limit: int, now) -> list[int]:
+    # The decayed trending set leads; a cold or short set is topped up from the durable signals.
+    candidate_ids = trending_post_ids(limit * 2)
+    live_ids = set(Post.published.filter(id__in=candidate_ids).values_list("id", flat=True))
+    ranked = [post_id for post_id in candidate_ids if post_id in live_ids][:limit]
+    if len(ranked) >= limit:
+        return ranked
+    rows = (
+        Post.published.exclude(id__in=ranked)
+        .order_by("-like_count", "-comment_count", "-publish")
+        .values_list("id", "like_count", "comment_count", "click_score", "source_article__source__click_score", "publish")[:12]
+    )
+    scored = sorted(
+        (
+            (homepage_score(likes, comments, post_clicks, source_clicks or 0, publish, now), publish, post_id)
+            for post_id, likes, comments, post_clicks, source_clicks, publish in rows
+        ),
+        reverse=True,
+    )
+    return ranked + [post_id for _, _, post_id in scored][:limit - len(ranked)]
+
+
+def build_homepage_sections(now=None) -> dict:
+    now = now or timezone.now()
+    latest = Post.published.order_by("-publish")
+    return {
+        "trending": _trending_ids(SECTION_SIZE, now),
+        "fresh": list(latest.filter(auto_generated=True).values_list("id", flat=True)[:SECTION_SIZE]),
+        "editor": list(latest.filter(auto_generated=False).values_list("id", flat=True)[:SECTION_SIZE]),
+        "built_at": now,
+    }
+
+
+def rebuild_homepage_sections(now=None, release: bool = True) -> dict:
+    # release=False keeps a held claim until it expires, which is what throttles the inline path.
+    if release:
+        cache.delete(HOMEPAGE_SECTIONS_PENDING_KEY)
+    sections = build_homepage_sections(now)
+    cache.set(HOMEPAGE_SECTIONS_KEY, sections, timeout=sections_ttl_seconds())
+    return sections
+
+
+def homepage_sections() -> dict:
+    # Only a cold cache (first hit after a flush or TTL expiry without a refresh) builds on the request path.
+    sections = cache.get(HOMEPAGE_SECTIONS_KEY)
+    if sections is None:
+        sections = rebuild_homepage_sections()
+    return sections
+
+
+def hydrate_homepage_sections(sections: dict) -> dict[str, list]:
+    # One in_bulk (plus the tags prefetch) for every section; ids unpublished since the build drop out.
+    ids = {post_id for name in HOMEPAGE_SECTIONS for post_id in sections.get(name, ())}
+    posts_by_id = (
+        Post.published.select_related("author", "category", "source_article__source")
+        .prefetch_related("tags")
+        .in_bulk(ids)
+        if ids
+        else {}
+    )
+    return {
+        name: [posts_by_id[post_id] for post_id in sections.get(name, ()) if post_id in posts_by_id]
+        for name in HOMEPAGE_SECTIONS
+    }
+
+
+def claim_homepage_rebuild(hold_seconds: int | None = None) -> bool:
+    # Coalesces a burst of likes/comments into one rebuild per debounce window. The default hold outlasts a
+    # queued rebuild, which releases it; an unreleased claim simply expires after hold_seconds.
+    if hold_seconds is None:
+        hold_seconds = max(1, sections_debounce_seconds()) * 4
+    return cache.add(HOMEPAGE_SECTIONS_PENDING_KEY, 1, timeout=max(1, hold_seconds))
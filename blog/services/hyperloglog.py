@@ -0,0 +1,42 @@
+import hashlib
+import math
+
+
+class HyperLogLog:
+    # Fixed-size cardinality sketch: 2**precision one-byte registers (2 KB at the default precision of 11),
+    # roughly 1.04 / sqrt(2**precision) relative error. Serialized as the raw register bytes.
+
+    def __init__(self, precision: int = 11, registers: bytes | None = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers and len(registers) == self.size else bytearray(self.size)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | None, precision: int = 11) -> "HyperLogLog":
+        return cls(precision, data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    def add(self, item: str) -> bool:
+        # True when a register changed, i.e. the item was (probably) not seen before; mirrors PFADD's reply.
+        value = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # Small-range correction (linear counting) keeps low counts near-exact.
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
@@ -0,0 +1,85 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date
+
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    # Quacks enough like django.core.paginator.Page for templates: no num_pages, since nothing counts rows.
+    object_list: list
+    number: int
+    next_cursor: str | None
+    has_previous: bool
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+
+def _json_value(value):
+    # Full isoformat: DjangoJSONEncoder drops to milliseconds, which would skip or repeat rows sharing a second.
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def encode_cursor(values, number: int) -> str:
+    raw = json.dumps({"p": [_json_value(value) for value in values], "n": number}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str | None, width: int) -> tuple[list, int] | None:
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("utf-8"))
+        values, number = payload["p"], int(payload["n"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != width:
+        return None
+    return values, max(2, number)
+
+
+def _after(ordering, values) -> Q:
+    # Lexicographic "comes after" for the sort key, e.g. publish < p OR (publish = p AND id < i).
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        clause = Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": values[index]})
+        for previous, value in zip(ordering[:index], values):
+            clause &= Q(**{previous.lstrip("-"): value})
+        condition |= clause
+    return condition
+
+
+def keyset_page(queryset, ordering, cursor: str | None, size: int) -> KeysetPage | None:
+    # Reads size + 1 rows past the cursor: the extra row only says whether an older page exists.
+    # Returns None for a cursor that does not decode.
+    ordering = tuple(ordering)
+    position = decode_cursor(cursor, len(ordering))
+    if cursor and position is None:
+        return None
+    queryset = queryset.order_by(*ordering)
+    number = 1
+    if position is not None:
+        values, number = position
+        queryset = queryset.filter(_after(ordering, values))
+    rows = list(queryset[:size + 1])
+    items = rows[:size]
+    next_cursor = None
+    if len(rows) > size:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, field.lstrip("-")) for field in ordering], number + 1)
+    return KeysetPage(items, number, next_cursor, position is not None)
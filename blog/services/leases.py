@@ -0,0 +1,61 @@
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+
+def lease_owner_token(label: str = "") -> str:
+    token = f"{socket.gethostname()[:24]}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+    if label:
+        token = f"{label[:16]}:{token}"
+    return token[:64]
+
+
+def _lease_seconds(lease_seconds: int | None) -> int:
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, "WORK_LEASE_SECONDS", 300)
+    return max(1, int(lease_seconds))
+
+
+def _unleased(now) -> Q:
+    return Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+
+
+def claim_batch(queryset: QuerySet, limit: int, owner: str, lease_seconds: int | None = None) -> list:
+    # Expired leases count as free, so rows abandoned by a crashed worker are picked up again.
+    limit = max(0, int(limit))
+    if limit == 0:
+        return []
+
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=_lease_seconds(lease_seconds))
+    model = queryset.model
+    available = queryset.filter(_unleased(now))
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                available.select_for_update(skip_locked=True, of=("self",)).values_list("id", flat=True)[:limit]
+            )
+            if ids:
+                model.objects.filter(id__in=ids).update(lease_owner=owner, lease_expires_at=expires_at)
+    else:
+        # No row locks (SQLite): the conditional UPDATE is the claim, and only rows it actually won are returned.
+        candidate_ids = list(available.values_list("id", flat=True)[:limit])
+        if not candidate_ids:
+            return []
+        model.objects.filter(_unleased(now), id__in=candidate_ids).update(lease_owner=owner, lease_expires_at=expires_at)
+
+    return list(queryset.filter(lease_owner=owner, lease_expires_at=expires_at))
+
+
+def release_batch(model, owner: str, ids=None) -> int:
+    queryset = model.objects.filter(lease_owner=owner)
+    if ids is not None:
+        queryset = queryset.filter(id__in=list(ids))
+    return queryset.update(lease_owner="", lease_expires_at=None)
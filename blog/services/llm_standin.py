@@ -0,0 +1,225 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+GEMINI_PATH_PATTERN = re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent$")
+GROQ_PATH = "/openai/v1/chat/completions"
+STATS_PATH = "/stats"
+
+
+@dataclass
+class StandInProfile:
+    latency: str = "lognormal"
+    latency_ms: float = 400.0
+    jitter_ms: float = 150.0
+    error_rate: float = 0.0
+    burst_every: int = 0
+    burst_length: int = 0
+    completion_tokens: int = 90
+    seed: int | None = None
+
+    def sample_latency_seconds(self, rng: random.Random) -> float:
+        if self.latency == "fixed":
+            millis = self.latency_ms
+        elif self.latency == "uniform":
+            millis = rng.uniform(max(0.0, self.latency_ms - self.jitter_ms), self.latency_ms + self.jitter_ms)
+        else:
+            # Lognormal with the configured median; jitter controls the tail width.
+            sigma = max(0.01, self.jitter_ms / max(1.0, self.latency_ms))
+            millis = self.latency_ms * rng.lognormvariate(0.0, sigma)
+        return max(0.0, millis) / 1000.0
+
+
+class StandInStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with getattr(self, "_lock", threading.Lock()):
+            self.requests = 0
+            self.ok = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.by_route = {"gemini": 0, "groq": 0}
+
+    def record(self, route: str, outcome: str):
+        with self._lock:
+            self.requests += 1
+            self.by_route[route] = self.by_route.get(route, 0) + 1
+            if outcome == "ok":
+                self.ok += 1
+            elif outcome == "rate_limited":
+                self.rate_limited += 1
+            else:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "ok": self.ok,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "by_route": dict(self.by_route),
+            }
+
+
+class StandInState:
+    def __init__(self, profile: StandInProfile):
+        self.profile = profile
+        self.stats = StandInStats()
+        self._rng = random.Random(profile.seed)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._burst_remaining = 0
+
+    def decide(self) -> tuple[str, float]:
+        with self._lock:
+            self._sequence += 1
+            latency = self.profile.sample_latency_seconds(self._rng)
+            if self._burst_remaining > 0:
+                self._burst_remaining -= 1
+                return "rate_limited", latency
+            if self.profile.burst_every and self._sequence % self.profile.burst_every == 0:
+                self._burst_remaining = max(0, self.profile.burst_length - 1)
+                return "rate_limited", latency
+            if self.profile.error_rate and self._rng.random() < self.profile.error_rate:
+                return "error", latency
+            return "ok", latency
+
+
+def _article_text_from_prompt(prompt: str) -> str:
+    _, _, article = (prompt or "").partition("Article:\n")
+    return article or prompt or ""
+
+
+def _fake_completion(prompt: str) -> str:
+    article = " ".join(_article_text_from_prompt(prompt).split())
+    first_sentence = re.split(r"(?<=[.!?])\s+", article, maxsplit=1)[0] if article else "No content."
+    return json.dumps({"summary": first_sentence[:400], "category": "Others"})
+
+
+def _prompt_tokens(prompt: str) -> int:
+    return max(1, int(len((prompt or "").split()) * 1.3))
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    server_version = "sudo-blog-llm-standin/1.0"
+
+    def log_message(self, format, *args):
+        return
+
+    def _write_json(self, status_code: int, payload: dict, headers: dict | None = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw.decode("utf-8") or "{}")
+        except ValueError:
+            return {}
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] == STATS_PATH:
+            self._write_json(200, self.server.state.stats.snapshot())
+            return
+        self._write_json(404, {"error": "not_found"})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        gemini_match = GEMINI_PATH_PATTERN.match(path)
+        if gemini_match:
+            route = "gemini"
+        elif path == GROQ_PATH:
+            route = "groq"
+        else:
+            self._write_json(404, {"error": "not_found"})
+            return
+
+        payload = self._read_json()
+        state = self.server.state
+        outcome, latency = state.decide()
+        time.sleep(latency)
+        state.stats.record(route, outcome)
+
+        if outcome == "rate_limited":
+            self._write_json(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}, {"Retry-After": "1"})
+            return
+        if outcome == "error":
+            self._write_json(503, {"error": {"code": 503, "status": "UNAVAILABLE"}})
+            return
+
+        completion_tokens = state.profile.completion_tokens
+        if route == "gemini":
+            parts = ((payload.get("contents") or [{}])[0].get("parts") or [{}])
+            prompt = parts[0].get("text", "")
+            prompt_tokens = _prompt_tokens(prompt)
+            self._write_json(
+                200,
+                {
+                    "candidates": [{"content": {"parts": [{"text": _fake_completion(prompt)}]}}],
+                    "usageMetadata": {
+                        "promptTokenCount": prompt_tokens,
+                        "candidatesTokenCount": completion_tokens,
+                        "totalTokenCount": prompt_tokens + completion_tokens,
+                    },
+                    "modelVersion": gemini_match.group("model"),
+                },
+            )
+            return
+
+        messages = payload.get("messages") or []
+        prompt = (messages[-1] or {}).get("content", "") if messages else ""
+        prompt_tokens = _prompt_tokens(prompt)
+        self._write_json(
+            200,
+            {
+                "id": f"standin-{state.stats.requests}",
+                "object": "chat.completion",
+                "model": payload.get("model", ""),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": _fake_completion(prompt)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+
+class LLMStandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, profile: StandInProfile | None = None):
+        super().__init__((host, port), StandInRequestHandler)
+        self.state = StandInState(profile or StandInProfile())
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="llm-standin", daemon=True)
+        thread.start()
+        return thread
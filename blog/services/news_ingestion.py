@@ -3,7 +3,7 @@ import html
 import json
 import re
 import ssl
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List
 from urllib.parse import urlencode
 from urllib.error import HTTPError, URLError
@@ -23,6 +23,7 @@ class FetchResult:
     fetched: int
     created: int
     updated: int
+    created_ids: List[int] = field(default_factory=list)
 
 
 class BaseProviderAdapter:
@@ -575,6 +576,8 @@ class NewsIngestionService:
     def ingest_items(self, source: NewsSource, items: List[Dict]) -> FetchResult:
         created = 0
         updated = 0
+        created_ids = []
+        pipeline_ids = []
 
         for item in items:
             title = item["title"]
@@ -616,19 +619,31 @@ class NewsIngestionService:
             )
             if is_created:
                 created += 1
+                created_ids.append(article.pk)
+                if article.status == Article.Status.INGESTED:
+                    pipeline_ids.append(article.pk)
             else:
                 updated += 1
                 if article.status == Article.Status.PUBLISHED:
                     article.status = Article.Status.INGESTED
                     article.save(update_fields=["status", "updated"])
 
+        if pipeline_ids:
+            transaction.on_commit(lambda: self._enqueue_article_pipeline(pipeline_ids))
+
         return FetchResult(
             source_name=source.name,
             fetched=len(items),
             created=created,
             updated=updated,
+            created_ids=created_ids,
         )
 
+    def _enqueue_article_pipeline(self, article_ids: List[int]) -> None:
+        from blog.tasks import enqueue_article_pipeline
+
+        enqueue_article_pipeline(article_ids)
+
     def fetch_and_store(self, source: NewsSource, max_items: int = 20) -> FetchResult:
         adapter = self.get_adapter(source, max_items=max_items)
         payload = adapter.fetch_payload()
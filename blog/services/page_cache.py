@@ -0,0 +1,135 @@
+import functools
+import hashlib
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.response import SimpleTemplateResponse
+
+
+PAGE_CACHE_PREFIX = "pagecache"
+# Headers the cached copy keeps; cookies and Vary are always per-response.
+STORED_HEADERS = ("Content-Type", "Content-Language", "X-Frame-Options")
+CSRF_INPUT_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def page_cache_enabled() -> bool:
+    return bool(getattr(settings, "PAGE_CACHE_ENABLED", False))
+
+
+def _fresh_seconds() -> int:
+    return max(1, int(getattr(settings, "PAGE_CACHE_SECONDS", 30)))
+
+
+def _stale_seconds() -> int:
+    return max(0, int(getattr(settings, "PAGE_CACHE_STALE_SECONDS", 120)))
+
+
+def page_entry_key(request) -> str:
+    # Scheme and host are part of the key: canonical and social-image URLs are rendered absolute.
+    digest = hashlib.sha256(request.build_absolute_uri().encode("utf-8")).hexdigest()[:32]
+    return f"{PAGE_CACHE_PREFIX}:page:{digest}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{PAGE_CACHE_PREFIX}:tag:{tag}"
+
+
+def _tag_versions(tags) -> dict[str, int]:
+    stored = cache.get_many([_tag_key(tag) for tag in tags])
+    return {tag: int(stored.get(_tag_key(tag), 0)) for tag in tags}
+
+
+def invalidate_page_tags(*tags: str) -> None:
+    # O(1) per tag: bumping the version marks every page that carries the tag stale; nothing is scanned.
+    for tag in tags:
+        key = _tag_key(tag)
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+
+def tag_page(request, *tags: str) -> None:
+    # Lets a view attach tags that are only known after its lookups (e.g. the post id on a detail page).
+    request.page_cache_tags = tuple(getattr(request, "page_cache_tags", ())) + tags
+
+
+def _bypass(request) -> bool:
+    if request.method != "GET" or not page_cache_enabled():
+        return True
+    # Logged-in users (and anyone holding session state or flash messages) always get a fresh render.
+    return settings.SESSION_COOKIE_NAME in request.COOKIES or "messages" in request.COOKIES
+
+
+def _cacheable(request, response) -> bool:
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    session = getattr(request, "session", None)
+    return not (session is not None and session.modified)
+
+
+def _from_entry(request, entry, state: str) -> HttpResponse:
+    content = entry["content"]
+    if entry["csrf"]:
+        # The cached copy's token belongs to whoever rendered it; swap in this visitor's own.
+        token = get_token(request).encode("ascii")
+        content = CSRF_INPUT_RE.sub(lambda match: match.group(1) + token + match.group(2), content)
+    response = HttpResponse(content, status=entry["status"])
+    for header, value in entry["headers"].items():
+        response[header] = value
+    response["X-Page-Cache"] = state
+    return response
+
+
+def _store(request, response, tags) -> None:
+    tags = sorted(set(tags))
+    entry = {
+        "content": response.content,
+        "status": response.status_code,
+        "headers": {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+        "csrf": bool(request.META.get("CSRF_COOKIE_NEEDS_UPDATE")),
+        "tags": _tag_versions(tags),
+        "fresh_until": time.time() + _fresh_seconds(),
+    }
+    cache.set(page_entry_key(request), entry, timeout=_fresh_seconds() + _stale_seconds())
+
+
+def cache_anonymous_page(*tags: str):
+    # Short-lived shared copy of an anonymous GET. Past its TTL, or once one of its tags is invalidated, the
+    # copy is stale: exactly one request (whoever wins the revalidate lock) re-renders while the rest keep
+    # being served the stale copy until PAGE_CACHE_STALE_SECONDS runs out.
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if _bypass(request):
+                return view(request, *args, **kwargs)
+
+            key = page_entry_key(request)
+            entry = cache.get(key)
+            if entry is not None:
+                fresh = entry["fresh_until"] > time.time() and _tag_versions(entry["tags"]) == entry["tags"]
+                if fresh:
+                    return _from_entry(request, entry, "hit")
+                if not cache.add(f"{key}:revalidate", 1, timeout=max(1, _fresh_seconds())):
+                    return _from_entry(request, entry, "stale")
+
+            response = view(request, *args, **kwargs)
+            if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+                response.render()
+            if _cacheable(request, response):
+                _store(request, response, tags + tuple(getattr(request, "page_cache_tags", ())))
+                cache.delete(f"{key}:revalidate")
+            elif entry is not None:
+                # e.g. the post was unpublished: drop the stale copy rather than keep serving it.
+                cache.delete_many([key, f"{key}:revalidate"])
+            response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapper
+
+    return decorator
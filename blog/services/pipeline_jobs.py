@@ -0,0 +1,96 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def _job_key(job_id: str) -> str:
+    return f"pipeline:job:{job_id}"
+
+
+def _job_ttl_seconds() -> int:
+    return max(300, int(getattr(settings, "PIPELINE_JOB_TTL_SECONDS", 86400)))
+
+
+def _now() -> str:
+    return timezone.now().isoformat()
+
+
+def create_job(steps: list[dict], requested_by: str = "", origin: str = "") -> dict:
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "origin": origin,
+        "requested_by": requested_by,
+        "created_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+        "steps": [
+            {
+                "action": step["action"],
+                "params": {key: value for key, value in step.items() if key != "action"},
+                "status": "pending",
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            for step in steps
+        ],
+    }
+    save_job(job)
+    return job
+
+
+def save_job(job: dict) -> None:
+    # Only the runner writes a job after creation, so a plain set is enough.
+    cache.set(_job_key(job["id"]), job, timeout=_job_ttl_seconds())
+
+
+def get_job(job_id: str) -> dict | None:
+    if not job_id:
+        return None
+    return cache.get(_job_key(str(job_id)))
+
+
+def mark_job_running(job: dict) -> None:
+    job["status"] = "running"
+    job["started_at"] = _now()
+    save_job(job)
+
+
+def mark_step_running(job: dict, index: int) -> None:
+    job["steps"][index]["status"] = "running"
+    job["steps"][index]["started_at"] = _now()
+    save_job(job)
+
+
+def mark_step_finished(job: dict, index: int, result=None, error: str | None = None) -> None:
+    step = job["steps"][index]
+    step["status"] = "error" if error else "ok"
+    step["finished_at"] = _now()
+    step["result"] = result
+    step["error"] = error
+    save_job(job)
+
+
+def mark_job_finished(job: dict, error: str | None = None) -> None:
+    job["status"] = "error" if error else "ok"
+    job["error"] = error
+    job["finished_at"] = _now()
+    for step in job["steps"]:
+        if step["status"] == "pending":
+            step["status"] = "skipped"
+    save_job(job)
+
+
+def job_progress(job: dict) -> dict:
+    steps = job.get("steps", [])
+    completed = sum(1 for step in steps if step["status"] in {"ok", "error", "skipped"})
+    return {
+        "completed_steps": completed,
+        "total_steps": len(steps),
+        "current_action": next((step["action"] for step in steps if step["status"] == "running"), None),
+    }
@@ -7,17 +7,28 @@ from urllib.request import Request, urlopen
 from django.conf import settings
 
 from blog.models import Article
+from blog.services.extractive import ExtractiveSummarizer
 
 
 class ArticleSummarizationService:
     ALLOWED_CATEGORIES = ("World", "Tech", "Sport", "Others")
 
-    def _fallback_summary(self, text: str, max_words: int = 80) -> str:
+    def _truncated_summary(self, text: str, max_words: int = 80) -> str:
         words = text.split()
         if len(words) <= max_words:
             return text
         return " ".join(words[:max_words]) + "..."
 
+    def _extractive_summarizer(self) -> ExtractiveSummarizer:
+        return ExtractiveSummarizer(
+            max_sentences=getattr(settings, "LOCAL_SUMMARY_MAX_SENTENCES", 3),
+            max_words=getattr(settings, "LOCAL_SUMMARY_MAX_WORDS", 80),
+        )
+
+    def _fallback_summary(self, text: str) -> str:
+        summary = self._extractive_summarizer().summarize(text)
+        return summary or self._truncated_summary(text)
+
     def _infer_category_from_text(self, text: str) -> str:
         text_blob = (text or "").lower()
         sport_terms = ("sport", "football", "soccer", "league", "match", "nba", "nfl", "cricket", "tennis")
@@ -104,12 +115,26 @@ class ArticleSummarizationService:
 
     def _provider_order(self) -> list[str]:
         preferred = getattr(settings, "AI_SUMMARY_PROVIDER", "gemini").lower().strip()
+        if preferred == "local":
+            return ["local"]
         if preferred == "groq":
             return ["groq", "gemini"]
         if preferred == "gemini":
             return ["gemini", "groq"]
         return ["gemini", "groq"]
 
+    def _providers_for_article(self, article: Article) -> list[str]:
+        max_trust = int(getattr(settings, "LOCAL_SUMMARY_MAX_TRUST_SCORE", 0))
+        if max_trust <= 0 or not article.source_id:
+            return self._provider_order()
+        # Batch callers pass the score in as an annotation so routing never costs a query per article.
+        trust_score = getattr(article, "source_trust_score", None)
+        if trust_score is None:
+            trust_score = article.source.trust_score
+        if trust_score < max_trust:
+            return ["local"]
+        return self._provider_order()
+
     def _compute_cost(self, provider: str, prompt_tokens: int, completion_tokens: int) -> Decimal:
         if provider == "gemini":
             input_rate = Decimal(str(getattr(settings, "GEMINI_INPUT_COST_PER_1K", "0")))
@@ -130,15 +155,13 @@ class ArticleSummarizationService:
             return "", {}
 
         model = getattr(settings, "GEMINI_MODEL", "gemini-2.0-flash")
+        base_url = getattr(settings, "GEMINI_API_BASE_URL", "https://generativelanguage.googleapis.com").rstrip("/")
         payload = {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {"temperature": 0.2, "maxOutputTokens": 220},
         }
         for key_index, api_key in enumerate(api_keys, start=1):
-            url = (
-                "https://generativelanguage.googleapis.com/v1beta/models/"
-                f"{model}:generateContent?key={api_key}"
-            )
+            url = f"{base_url}/v1beta/models/{model}:generateContent?key={api_key}"
             request = Request(
                 url,
                 data=json.dumps(payload).encode("utf-8"),
@@ -180,7 +203,8 @@ class ArticleSummarizationService:
             return "", {}
 
         model = getattr(settings, "GROQ_MODEL", "llama-3.3-70b-versatile")
-        url = "https://api.groq.com/openai/v1/chat/completions"
+        base_url = getattr(settings, "GROQ_API_BASE_URL", "https://api.groq.com").rstrip("/")
+        url = f"{base_url}/openai/v1/chat/completions"
         payload = {
             "model": model,
             "messages": [
@@ -223,16 +247,31 @@ class ArticleSummarizationService:
             "total_tokens": int(usage.get("total_tokens") or 0),
         }
 
-    def summarize_text(self, text: str) -> tuple[str, dict]:
+    def _summarize_with_local(self, text: str) -> tuple[str, dict]:
+        summary = self._extractive_summarizer().summarize(text)
+        if not summary:
+            return "", {}
+        return summary, {
+            "provider": "local",
+            "model": "textrank",
+            "category": self._infer_category_from_text(text),
+            "prompt_tokens": self._estimate_tokens(text),
+        }
+
+    def summarize_text(self, text: str, providers: list[str] | None = None) -> tuple[str, dict]:
         mode = getattr(settings, "SUMMARIZER_PROMPT_MODE", "brief").lower().strip()
         mode = "deep" if mode == "deep" else "brief"
         prompt = self._build_prompt(text, mode)
 
-        for provider in self._provider_order():
+        for provider in providers or self._provider_order():
             if provider == "gemini":
                 summary, meta = self._summarize_with_gemini(prompt)
-            else:
+            elif provider == "groq":
                 summary, meta = self._summarize_with_groq(prompt)
+            elif provider == "local":
+                summary, meta = self._summarize_with_local(text)
+            else:
+                continue
 
             if summary:
                 prompt_tokens = meta.get("prompt_tokens") or self._estimate_tokens(prompt)
@@ -262,8 +301,8 @@ class ArticleSummarizationService:
             "estimated_cost_usd": "0",
         }
 
-    def summarize_article(self, article: Article) -> Article:
-        summary, meta = self.summarize_text(article.body)
+    def summarize_article(self, article: Article, providers: list[str] | None = None) -> Article:
+        summary, meta = self.summarize_text(article.body, providers=providers or self._providers_for_article(article))
         article.summary = summary
         article.summary_provider = meta.get("provider", "")
         article.summary_model = meta.get("model", "")
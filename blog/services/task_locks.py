@@ -0,0 +1,157 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.services.cache_store import redis_client
+
+
+CONTENTION_POLICIES = ("skip", "wait", "coalesce")
+
+# Owner-checked refresh/delete, so a run whose lock already expired can never extend or drop a newer holder's lock.
+_REFRESH_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+_RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+
+def _lock_key(name: str) -> str:
+    return f"lock:task:{name}"
+
+
+def _info_key(name: str) -> str:
+    return f"lock:task:{name}:info"
+
+
+def _result_key(name: str) -> str:
+    return f"lock:task:{name}:last_result"
+
+
+def lock_ttl_seconds() -> int:
+    return max(10, int(getattr(settings, "TASK_LOCK_TTL_SECONDS", 300)))
+
+
+def lock_wait_seconds() -> float:
+    return max(0.0, float(getattr(settings, "TASK_LOCK_WAIT_SECONDS", 30)))
+
+
+def contention_policy(name: str) -> str:
+    overrides = getattr(settings, "TASK_LOCK_CONTENTION_OVERRIDES", {}) or {}
+    policy = (overrides.get(name) or getattr(settings, "TASK_LOCK_CONTENTION", "skip") or "skip").lower().strip()
+    return policy if policy in CONTENTION_POLICIES else "skip"
+
+
+def _compare_and_run(script: str, name: str, owner: str, *args) -> bool:
+    client = redis_client()
+    if client is not None:
+        serializer = cache._cache._serializer
+        return bool(client.eval(script, 1, cache.make_and_validate_key(_lock_key(name)), serializer.dumps(owner), *args))
+    return cache.get(_lock_key(name)) == owner
+
+
+def current_owner(name: str) -> str | None:
+    return cache.get(_lock_key(name))
+
+
+class TaskLock:
+    def __init__(self, name: str, owner: str | None = None, ttl: int | None = None):
+        self.name = name
+        self.owner = owner or uuid.uuid4().hex
+        self.ttl = ttl or lock_ttl_seconds()
+        self.handed_off = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def acquire(self) -> bool:
+        if not cache.add(_lock_key(self.name), self.owner, timeout=self.ttl):
+            return False
+        now = timezone.now()
+        cache.set(
+            _info_key(self.name),
+            {"owner": self.owner, "acquired_at": now, "heartbeat_at": now},
+            timeout=self.ttl,
+        )
+        return True
+
+    def heartbeat(self) -> bool:
+        if not _compare_and_run(_REFRESH_SCRIPT, self.name, self.owner, self.ttl * 1000):
+            return False
+        if redis_client() is None:
+            cache.touch(_lock_key(self.name), self.ttl)
+        info = cache.get(_info_key(self.name)) or {"owner": self.owner, "acquired_at": None}
+        info["heartbeat_at"] = timezone.now()
+        cache.set(_info_key(self.name), info, timeout=self.ttl)
+        return True
+
+    def start_heartbeat(self) -> None:
+        interval = max(1.0, self.ttl / 3)
+
+        def beat():
+            while not self._stop.wait(interval):
+                if not self.heartbeat():
+                    return
+
+        self._thread = threading.Thread(target=beat, name=f"lock-heartbeat-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop_heartbeat(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def hand_off(self) -> str:
+        # The lock now belongs to whoever finishes the work (e.g. a chord callback); the TTL bounds it if that never runs.
+        self.stop_heartbeat()
+        self.handed_off = True
+        return self.owner
+
+    def release(self, result=None) -> bool:
+        self.stop_heartbeat()
+        if result is not None:
+            cache.set(
+                _result_key(self.name),
+                {"owner": self.owner, "finished_at": timezone.now(), "result": result},
+                timeout=self.ttl,
+            )
+        if not _compare_and_run(_RELEASE_SCRIPT, self.name, self.owner):
+            return False
+        if redis_client() is None:
+            cache.delete(_lock_key(self.name))
+        cache.delete(_info_key(self.name))
+        return True
+
+
+def wait_for_release(name: str, timeout: float, poll_seconds: float = 0.5) -> bool:
+    deadline = time.monotonic() + timeout
+    while current_owner(name) is not None:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_seconds)
+    return True
+
+
+def finished_result(name: str, owner: str):
+    entry = cache.get(_result_key(name))
+    if entry and entry.get("owner") == owner:
+        return entry["result"]
+    return None
+
+
+def lock_keys(name: str) -> list[str]:
+    return [_lock_key(name), _info_key(name)]
+
+
+def lock_state(name: str, values: dict) -> dict:
+    # values comes from a read_many() that included lock_keys(name), so the monitoring page stays one round trip.
+    owner = values.get(_lock_key(name))
+    info = values.get(_info_key(name)) or {}
+    heartbeat_at = info.get("heartbeat_at") if owner else None
+    return {
+        "held": owner is not None,
+        "owner": owner,
+        "acquired_at": info.get("acquired_at") if owner else None,
+        "heartbeat_at": heartbeat_at,
+        "heartbeat_age_seconds": int((timezone.now() - heartbeat_at).total_seconds()) if heartbeat_at else None,
+    }
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.utils import timezone
+
+from blog.services.cache_store import increment, write_many
+
+
+DURATION_BUCKETS_SECONDS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+OVERFLOW_BUCKET = "inf"
+
+
+def _key(task_name: str, metric: str) -> str:
+    return f"monitoring:task:{task_name}:{metric}"
+
+
+def _bucket_label(upper_bound) -> str:
+    return OVERFLOW_BUCKET if upper_bound == OVERFLOW_BUCKET else f"{upper_bound:g}"
+
+
+def _bucket_labels() -> list[str]:
+    return [_bucket_label(bound) for bound in DURATION_BUCKETS_SECONDS] + [OVERFLOW_BUCKET]
+
+
+def run_history_size() -> int:
+    return max(1, int(getattr(settings, "MONITORING_RUN_HISTORY_SIZE", 20)))
+
+
+def record_task_run(task_name: str, duration_seconds: float, items: int, outcome: str, timeout: int) -> None:
+    label = OVERFLOW_BUCKET
+    for bound in DURATION_BUCKETS_SECONDS:
+        if duration_seconds <= bound:
+            label = _bucket_label(bound)
+            break
+
+    # The sequence number picks the ring-buffer slot, so concurrent runs never overwrite each other's entry.
+    sequence = increment(_key(task_name, "run_sequence"), 1, timeout)
+    slot = sequence % run_history_size()
+    duration_ms = int(round(duration_seconds * 1000))
+    write_many(
+        increments={
+            _key(task_name, f"duration_bucket:{label}"): 1,
+            _key(task_name, "duration_count"): 1,
+            _key(task_name, "duration_sum_ms"): duration_ms,
+        },
+        values={
+            _key(task_name, f"run_history:{slot}"): {
+                "sequence": sequence,
+                "finished_at": timezone.now(),
+                "duration_ms": duration_ms,
+                "items": int(items),
+                "outcome": outcome,
+            },
+        },
+        timeout=timeout,
+    )
+
+
+def task_metric_keys(task_name: str) -> list[str]:
+    keys = [_key(task_name, f"duration_bucket:{label}") for label in _bucket_labels()]
+    keys += [_key(task_name, "duration_count"), _key(task_name, "duration_sum_ms")]
+    keys += [_key(task_name, f"run_history:{slot}") for slot in range(run_history_size())]
+    return keys
+
+
+def _estimate_percentile_ms(buckets: list[dict], count: int, percentile: float):
+    if not count:
+        return None
+    target = percentile / 100.0 * count
+    running = 0
+    for bucket in buckets:
+        running += bucket["count"]
+        if running >= target:
+            # Upper bound of the bucket holding the percentile; the overflow bucket has no bound.
+            return None if bucket["le"] == OVERFLOW_BUCKET else int(float(bucket["le"]) * 1000)
+    return None
+
+
+def summarize_task_metrics(task_name: str, values: dict) -> dict:
+    buckets = [
+        {"le": label, "count": int(values.get(_key(task_name, f"duration_bucket:{label}"), 0))}
+        for label in _bucket_labels()
+    ]
+    count = int(values.get(_key(task_name, "duration_count"), 0))
+    sum_ms = int(values.get(_key(task_name, "duration_sum_ms"), 0))
+    runs = [
+        values[_key(task_name, f"run_history:{slot}")]
+        for slot in range(run_history_size())
+        if values.get(_key(task_name, f"run_history:{slot}"))
+    ]
+    runs.sort(key=lambda run: run["sequence"], reverse=True)
+    return {
+        "duration": {
+            "count": count,
+            "avg_ms": int(sum_ms / count) if count else None,
+            "p50_ms": _estimate_percentile_ms(buckets, count, 50),
+            "p95_ms": _estimate_percentile_ms(buckets, count, 95),
+            "buckets": buckets,
+        },
+        "recent_runs": runs,
+    }
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from math import exp
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from blog.models import Post
+from blog.services.cache_store import replace_ranked, top_ranked, write_many
+
+
+TRENDING_KEY = "analytics:trending:posts"
+
+# Forward decay: every event is stored pre-multiplied by exp((t - landmark) / tau), so decaying the whole set
+# is a single multiplication at read time and ZINCRBY never has to touch older members. exp() overflows a float
+# past ~709.78, so with the default tau = 14 days weights stay finite for about 27 years after the landmark
+# (until early 2051); a larger TRENDING_DECAY_DAYS stretches that proportionally. Moving the landmark means
+# rescaling the stored set, e.g. through refresh_trending_scores.
+TRENDING_LANDMARK = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+LIKE_WEIGHT = 5
+COMMENT_WEIGHT = 3
+POST_CLICK_WEIGHT = 4
+SOURCE_CLICK_WEIGHT = 2
+
+
+def _decay_days() -> float:
+    return max(1.0, float(getattr(settings, "TRENDING_DECAY_DAYS", 14)))
+
+
+def _trending_ttl_seconds() -> int:
+    return max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30))) * 24 * 60 * 60
+
+
+def _landmark_days(at) -> float:
+    return (at - TRENDING_LANDMARK).total_seconds() / 86400.0
+
+
+def forward_weight(amount: float, at=None) -> float:
+    return amount * exp(_landmark_days(at or timezone.now()) / _decay_days())
+
+
+def current_score(stored: float, now=None) -> float:
+    return stored * exp(-_landmark_days(now or timezone.now()) / _decay_days())
+
+
+def freshness_bonus(publish, now=None) -> int:
+    age_days = max(0, ((now or timezone.now()) - publish).days)
+    if age_days <= 7:
+        return 12
+    if age_days <= 30:
+        return 6
+    return 0
+
+
+def homepage_score(like_count, comment_count, post_clicks, source_clicks, publish, now=None) -> float:
+    return (
+        like_count * LIKE_WEIGHT
+        + comment_count * COMMENT_WEIGHT
+        + post_clicks * POST_CLICK_WEIGHT
+        + source_clicks * SOURCE_CLICK_WEIGHT
+        + freshness_bonus(publish, now)
+    )
+
+
+def trending_increment(post_id: int, amount: float, at=None) -> dict:
+    # In the shape write_many(ranked=...) takes, so clicks can ride in the counter pipeline.
+    return {TRENDING_KEY: {post_id: forward_weight(amount, at)}}
+
+
+def bump_trending(post_id: int, amount: float) -> None:
+    write_many(ranked=trending_increment(post_id, amount), timeout=_trending_ttl_seconds())
+
+
+def trending_post_ids(limit: int) -> list[int]:
+    return [int(member) for member, _ in top_ranked(TRENDING_KEY, limit)]
+
+
+def refresh_trending_scores(now=None) -> int:
+    # Re-anchors the live set on the durable signals: likes, approved comments, rolled-up click scores and
+    # freshness. Between refreshes, clicks, likes and comments adjust it incrementally.
+    now = now or timezone.now()
+    retention_days = max(1, int(getattr(settings, "ANALYTICS_RETENTION_DAYS", 30)))
+    rows = Post.published.filter(
+        Q(publish__gte=now - timedelta(days=retention_days)) | Q(click_score__gt=0)
+    ).values_list("id", "like_count", "comment_count", "click_score", "source_article__source__click_score", "publish")
+    scores = {
+        post_id: forward_weight(homepage_score(likes, comments, post_clicks, source_clicks or 0, publish, now), now)
+        for post_id, likes, comments, post_clicks, source_clicks, publish in rows
+    }
+    replace_ranked(TRENDING_KEY, scores, timeout=_trending_ttl_seconds())
+    return len(scores)
@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.models import Bookmark, Comment, Like, Post
+from blog.services.click_tracking import post_sources
+from blog.services.engagement import adjust_engagement, reconcile_engagement_counters
+from blog.services.page_cache import invalidate_page_tags
+from blog.services.trending import COMMENT_WEIGHT, bump_trending
+from blog.tasks import schedule_homepage_sections_refresh
+
+
+def _invalidate_pages_on_commit(*tags):
+    transaction.on_commit(lambda: invalidate_page_tags(*tags))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    # Publishing, unpublishing or re-dating a post can change every homepage section and listing page,
+    # and which posts (attributed to which source) the click endpoints accept.
+    schedule_homepage_sections_refresh()
+    _invalidate_pages_on_commit("posts", f"post:{instance.pk}")
+    transaction.on_commit(post_sources.invalidate)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def engagement_changed(sender, instance, **kwargs):
+    schedule_homepage_sections_refresh()
+    _invalidate_pages_on_commit(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=Bookmark)
+def bookmark_changed(sender, instance, **kwargs):
+    # Only the detail page shows a bookmark count.
+    _invalidate_pages_on_commit(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_engagement(instance.post_id, "like_count", 1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    adjust_engagement(instance.post_id, "like_count", -1)
+
+
+@receiver(post_save, sender=Bookmark)
+def bookmark_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_engagement(instance.post_id, "bookmark_count", 1)
+
+
+@receiver(post_delete, sender=Bookmark)
+def bookmark_deleted(sender, instance, **kwargs):
+    adjust_engagement(instance.post_id, "bookmark_count", -1)
+
+
+@receiver(pre_save, sender=Comment)
+def comment_saving(sender, instance, **kwargs):
+    # The stored approval, so comment_saved can tell a moderation decision from any other edit.
+    instance._was_approved = bool(instance.pk) and Comment.objects.filter(pk=instance.pk, approved=True).exists()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        if instance.approved:
+            adjust_engagement(instance.post_id, "comment_count", 1)
+    else:
+        # Moderation can flip `approved` either way; recount this one post rather than track the old value.
+        reconcile_engagement_counters([instance.post_id])
+    # A comment moves trending when it becomes visible (on creation or on approval), and back when hidden.
+    was_approved = getattr(instance, "_was_approved", False)
+    if instance.approved != was_approved:
+        bump_trending(instance.post_id, COMMENT_WEIGHT if instance.approved else -COMMENT_WEIGHT)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance.approved:
+        adjust_engagement(instance.post_id, "comment_count", -1)
@@ -2,14 +2,52 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.text import slugify
 from datetime import timedelta
+import functools
+import random
+import threading
 import time
 
 from blog.models import Article, Category, NewsSource, Post
-from blog.celery_compat import shared_task
+from blog.celery_compat import (
+    celery_chain,
+    chord,
+    fanout_available,
+    group,
+    inside_worker,
+    shared_task,
+    tasks_run_eagerly,
+)
 from blog.services import ArticleSummarizationService, NewsIngestionService
+from blog.services.budget import SummarizationBudgetGovernor, prioritized_pending_articles
+from blog.services.cache_store import write_many
+from blog.services.click_rollups import flush_click_rollups, refresh_click_scores, refresh_placement_rollups
+from blog.services.click_tracking import post_sources
+from blog.services.delayed_queue import delayed_queue
+from blog.services.homepage_sections import claim_homepage_rebuild, rebuild_homepage_sections, sections_debounce_seconds
+from blog.services.leases import claim_batch, lease_owner_token, release_batch
+from blog.services.page_cache import invalidate_page_tags
+from blog.services.pipeline_jobs import (
+    create_job as create_pipeline_job,
+    get_job as get_pipeline_job,
+    mark_job_finished,
+    mark_job_running,
+    mark_step_finished,
+    mark_step_running,
+)
+from blog.services.task_locks import (
+    TaskLock,
+    contention_policy as lock_contention_policy,
+    current_owner as current_lock_owner,
+    finished_result as finished_lock_result,
+    lock_wait_seconds,
+    wait_for_release as wait_for_lock_release,
+)
+from blog.services.task_metrics import record_task_run
 
 
 def _monitoring_retention_seconds() -> int:
@@ -22,92 +60,255 @@ def _monitoring_key(task_name: str, metric: str) -> str:
 
 
 def _record_task_start(task_name: str) -> None:
-    ttl = _monitoring_retention_seconds()
-    now = timezone.now()
-    total_runs_key = _monitoring_key(task_name, 'total_runs')
-    total_runs = int(cache.get(total_runs_key, 0)) + 1
-    cache.set(total_runs_key, total_runs, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_run_at'), now, timeout=ttl)
+    write_many(
+        increments={_monitoring_key(task_name, 'total_runs'): 1},
+        values={_monitoring_key(task_name, 'last_run_at'): timezone.now()},
+        timeout=_monitoring_retention_seconds(),
+    )
 
 
 def _record_task_success(task_name: str) -> None:
-    ttl = _monitoring_retention_seconds()
     now = timezone.now()
-    cache.set(_monitoring_key(task_name, 'last_status'), 'ok', timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_success_at'), now, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'consecutive_failures'), 0, timeout=ttl)
+    write_many(
+        values={
+            _monitoring_key(task_name, 'last_status'): 'ok',
+            _monitoring_key(task_name, 'last_success_at'): now,
+            _monitoring_key(task_name, 'consecutive_failures'): 0,
+        },
+        timeout=_monitoring_retention_seconds(),
+    )
 
 
 def _record_task_failure(task_name: str, exc: Exception) -> None:
-    ttl = _monitoring_retention_seconds()
     now = timezone.now()
-    total_failures_key = _monitoring_key(task_name, 'total_failures')
-    consecutive_key = _monitoring_key(task_name, 'consecutive_failures')
-    total_failures = int(cache.get(total_failures_key, 0)) + 1
-    consecutive_failures = int(cache.get(consecutive_key, 0)) + 1
-    cache.set(total_failures_key, total_failures, timeout=ttl)
-    cache.set(consecutive_key, consecutive_failures, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_status'), 'error', timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_failure_at'), now, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_error'), str(exc)[:300], timeout=ttl)
+    write_many(
+        increments={
+            _monitoring_key(task_name, 'total_failures'): 1,
+            _monitoring_key(task_name, 'consecutive_failures'): 1,
+        },
+        values={
+            _monitoring_key(task_name, 'last_status'): 'error',
+            _monitoring_key(task_name, 'last_failure_at'): now,
+            _monitoring_key(task_name, 'last_error'): str(exc)[:300],
+        },
+        timeout=_monitoring_retention_seconds(),
+    )
+
+
+_active_locks = threading.local()
+
+
+def _active_task_lock(task_name: str):
+    return getattr(_active_locks, 'locks', {}).get(task_name)
+
+
+def _record_lock_contention(task_name: str, outcome: str, holder: str | None) -> None:
+    write_many(
+        increments={_monitoring_key(task_name, 'lock_contended'): 1},
+        values={
+            _monitoring_key(task_name, 'last_lock_contention'): {
+                'at': timezone.now(),
+                'outcome': outcome,
+                'holder': holder,
+            },
+        },
+        timeout=_monitoring_retention_seconds(),
+    )
+
+
+def _single_run(func):
+    task_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not getattr(settings, 'TASK_LOCKS_ENABLED', True):
+            return func(*args, **kwargs)
+
+        lock = TaskLock(task_name)
+        if not lock.acquire():
+            holder = current_lock_owner(task_name)
+            policy = lock_contention_policy(task_name)
+            if policy == 'coalesce' and holder and wait_for_lock_release(task_name, lock_wait_seconds()):
+                # Share the finished run's payload instead of repeating the same work.
+                result = finished_lock_result(task_name, holder)
+                if result is not None:
+                    _record_lock_contention(task_name, 'coalesced', holder)
+                    return {'status': 'coalesced', 'lock_owner': holder, 'result': result}
+            acquired = (
+                policy == 'wait'
+                and wait_for_lock_release(task_name, lock_wait_seconds())
+                and lock.acquire()
+            )
+            if not acquired:
+                _record_lock_contention(task_name, 'skipped', holder)
+                return {'status': 'skipped', 'reason': 'already_running', 'lock_owner': holder}
+            _record_lock_contention(task_name, 'waited', holder)
+
+        lock.start_heartbeat()
+        locks = getattr(_active_locks, 'locks', None)
+        if locks is None:
+            locks = _active_locks.locks = {}
+        locks[task_name] = lock
+        payload = None
+        try:
+            payload = func(*args, **kwargs)
+            return payload
+        finally:
+            locks.pop(task_name, None)
+            if not lock.handed_off:
+                lock.release(result=payload)
+
+    return wrapper
+
+
+def _payload_item_count(payload) -> int:
+    if not isinstance(payload, dict):
+        return 0
+    counted = [
+        int(payload[key])
+        for key in ('fetched', 'summarized', 'published', 'reviewed', 'rolled_back', 'flushed')
+        if isinstance(payload.get(key), (int, bool))
+    ]
+    if counted:
+        return sum(counted)
+    if 'sources' in payload:
+        return int(payload['sources'])
+    return 1 if payload.get('status') == 'ok' else 0
+
+
+def _timed_task(func):
+    task_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            payload = func(*args, **kwargs)
+        except Exception:
+            record_task_run(task_name, time.perf_counter() - started, 0, 'error', _monitoring_retention_seconds())
+            raise
+        outcome = str(payload.get('status', 'ok')) if isinstance(payload, dict) else 'ok'
+        record_task_run(
+            task_name,
+            time.perf_counter() - started,
+            _payload_item_count(payload),
+            outcome,
+            _monitoring_retention_seconds(),
+        )
+        return payload
+
+    # Checked by the task-registry test, so a new task cannot ship without timing.
+    wrapper.timed = True
+    return wrapper
 
 
 def _retry_tuning():
     max_attempts = max(1, int(getattr(settings, 'TASK_RETRY_MAX_ATTEMPTS', 3)))
     backoff_base = max(1, int(getattr(settings, 'TASK_RETRY_BACKOFF_BASE_SECONDS', 2)))
     backoff_max = max(backoff_base, int(getattr(settings, 'TASK_RETRY_BACKOFF_MAX_SECONDS', 30)))
-    apply_sleep = bool(getattr(settings, 'TASK_RETRY_APPLY_SLEEP', False))
-    return max_attempts, backoff_base, backoff_max, apply_sleep
-
-
-def _retry_delay_seconds(attempt_number: int) -> int:
-    _, backoff_base, backoff_max, _ = _retry_tuning()
-    delay = backoff_base * (2 ** max(0, attempt_number - 1))
-    return min(backoff_max, delay)
-
-
-def _record_task_retry(task_name: str, attempt_number: int, delay_seconds: int, exc: Exception) -> None:
-    ttl = _monitoring_retention_seconds()
-    retries_key = _monitoring_key(task_name, 'total_retries')
-    total_retries = int(cache.get(retries_key, 0)) + 1
-    cache.set(retries_key, total_retries, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_retry_attempt'), attempt_number, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_retry_delay_seconds'), delay_seconds, timeout=ttl)
-    cache.set(_monitoring_key(task_name, 'last_retry_error'), str(exc)[:300], timeout=ttl)
-
+    return max_attempts, backoff_base, backoff_max
+
+
+def _retry_delay_seconds(attempt_number: int) -> float:
+    _, backoff_base, backoff_max = _retry_tuning()
+    delay = min(backoff_max, backoff_base * (2 ** max(0, attempt_number - 1)))
+    # Equal jitter: keep half the backoff, randomise the rest so a flapping upstream isn't hit in lockstep.
+    return round(delay / 2 + random.uniform(0, delay / 2), 2)
+
+
+def _record_task_retry(task_name: str, attempt_number: int, delay_seconds: float, exc: Exception) -> None:
+    write_many(
+        increments={_monitoring_key(task_name, 'total_retries'): 1},
+        values={
+            _monitoring_key(task_name, 'last_retry_attempt'): attempt_number,
+            _monitoring_key(task_name, 'last_retry_delay_seconds'): delay_seconds,
+            _monitoring_key(task_name, 'last_retry_error'): str(exc)[:300],
+        },
+        timeout=_monitoring_retention_seconds(),
+    )
+
+
+def _schedule_retry(task_name: str, task, task_kwargs: dict, attempt: int, exc: Exception) -> float:
+    delay_seconds = _retry_delay_seconds(attempt)
+    _record_task_retry(task_name, attempt, delay_seconds, exc)
+    retry_kwargs = {**task_kwargs, 'attempt': attempt + 1}
+    if inside_worker() and hasattr(task, 'apply_async'):
+        task.apply_async(kwargs=retry_kwargs, countdown=delay_seconds)
+    else:
+        delayed_queue.push(delay_seconds, task, retry_kwargs)
+    return delay_seconds
+
+
+def _run_or_schedule_retry(task_name: str, task, task_kwargs: dict, attempt: int, operation, non_retry_exceptions=()):
+    # Returns (result, None) on success or (None, delay) once a retry of just this item has been queued.
+    max_attempts, _, _ = _retry_tuning()
+    try:
+        return operation(), None
+    except non_retry_exceptions:
+        raise
+    except Exception as exc:
+        if attempt >= max_attempts:
+            raise
+        return None, _schedule_retry(task_name, task, task_kwargs, attempt, exc)
 
-def _execute_with_retry(task_name: str, operation, non_retry_exceptions=()):
-    max_attempts, _, _, apply_sleep = _retry_tuning()
-    attempt = 1
 
-    while True:
+def _drain_delayed_retries(now: float | None = None) -> int:
+    drained = 0
+    for func, kwargs in delayed_queue.pop_due(now):
         try:
-            return operation()
-        except non_retry_exceptions:
-            raise
-        except Exception as exc:
-            if attempt >= max_attempts:
-                raise
-
-            delay_seconds = _retry_delay_seconds(attempt)
-            _record_task_retry(task_name, attempt, delay_seconds, exc)
-            if apply_sleep:
-                time.sleep(delay_seconds)
-            attempt += 1
+            func(**kwargs)
+        except Exception:
+            # The retried task has already recorded its own failure metrics.
+            pass
+        drained += 1
+    return drained
 
 
 def _build_unique_slug(title: str, publish_dt):
     base = slugify(title)[:240] or "article"
     slug = base
     counter = 1
-    while Post.objects.filter(slug=slug, publish__date=publish_dt.date()).exists():
+    while Post.objects.filter(slug=slug, publish__date=_publish_date(publish_dt)).exists():
         suffix = f"-{counter}"
         slug = f"{base[:255 - len(suffix)]}{suffix}"
         counter += 1
     return slug
 
 
-def _qualifies_for_auto_publish(article: Article) -> bool:
+def _publish_date(publish_dt):
+    return timezone.localtime(publish_dt).date() if timezone.is_aware(publish_dt) else publish_dt.date()
+
+
+def _allocate_unique_slugs(entries) -> list[str]:
+    # entries: (title, publish_dt) pairs. One query loads every slug already taken on those dates
+    # for the candidate bases; suffixes are then picked in memory, including clashes inside the batch.
+    if not entries:
+        return []
+    bases = [slugify(title)[:240] or "article" for title, _ in entries]
+    dates = {_publish_date(publish_dt) for _, publish_dt in entries}
+
+    prefix_filter = Q()
+    for base in set(bases):
+        prefix_filter |= Q(slug__startswith=base)
+    taken: dict = {}
+    for slug, publish in Post.objects.filter(prefix_filter, publish__date__in=dates).values_list('slug', 'publish'):
+        taken.setdefault(_publish_date(publish), set()).add(slug)
+
+    slugs = []
+    for base, (_, publish_dt) in zip(bases, entries):
+        used = taken.setdefault(_publish_date(publish_dt), set())
+        slug = base
+        counter = 1
+        while slug in used:
+            suffix = f"-{counter}"
+            slug = f"{base[:255 - len(suffix)]}{suffix}"
+            counter += 1
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _qualifies_for_auto_publish(article: Article, posted_article_ids: set | None = None) -> bool:
     min_trust = getattr(settings, "AUTO_PUBLISH_MIN_TRUST_SCORE", 70)
     require_ad_safe = getattr(settings, "AUTO_PUBLISH_REQUIRE_AD_SAFE", True)
     min_originality = getattr(settings, "AUTO_PUBLISH_MIN_ORIGINALITY", 40)
@@ -127,6 +328,8 @@ def _qualifies_for_auto_publish(article: Article) -> bool:
             return False
     if article.status != Article.Status.SUMMARIZED:
         return False
+    if posted_article_ids is not None:
+        return article.pk not in posted_article_ids
     if Post.objects.filter(source_article=article).exists():
         return False
     return True
@@ -171,8 +374,75 @@ def _resolve_article_category(article: Article, category_cache: dict[str, Catego
     return obj
 
 
+def _published_posts_changed() -> None:
+    invalidate_page_tags('posts')
+    post_sources.invalidate()
+    schedule_homepage_sections_refresh()
+
+
+def _publish_or_review_articles(articles, author, category_cache: dict[str, Category]) -> tuple[int, int]:
+    # Constant query count regardless of batch size: one lookup for existing posts, one for taken
+    # slugs, then bulk writes inside a single transaction.
+    articles = list(articles)
+    if not articles:
+        return 0, 0
+
+    posted_article_ids = set(
+        Post.objects.filter(source_article_id__in=[article.pk for article in articles])
+        .values_list('source_article_id', flat=True)
+    )
+    to_publish = []
+    to_review = []
+    for article in articles:
+        if _qualifies_for_auto_publish(article, posted_article_ids):
+            to_publish.append(article)
+        else:
+            to_review.append(article)
+
+    now = timezone.now()
+    publish_times = [article.published_at or now for article in to_publish]
+    slugs = _allocate_unique_slugs([(article.title, publish_dt) for article, publish_dt in zip(to_publish, publish_times)])
+    posts = [
+        Post(
+            title=article.title,
+            slug=slug,
+            author=author,
+            body=article.summary or article.body,
+            summary=article.summary,
+            cover_image_url=article.image_url,
+            publish=publish_dt,
+            status=Post.Status.PUBLISHED,
+            auto_generated=True,
+            source_article=article,
+            category=_resolve_article_category(article, category_cache),
+        )
+        for article, slug, publish_dt in zip(to_publish, slugs, publish_times)
+    ]
+
+    for article in to_publish:
+        article.status = Article.Status.PUBLISHED
+        article.updated = now
+    for article in to_review:
+        article.status = Article.Status.PENDING_REVIEW
+        article.updated = now
+
+    with transaction.atomic():
+        Post.objects.bulk_create(posts)
+        Article.objects.bulk_update(to_publish + to_review, ['status', 'updated'])
+    if posts:
+        # bulk_create skips post_save, so the homepage sections and cached listing pages are refreshed here.
+        transaction.on_commit(_published_posts_changed)
+    return len(to_publish), len(to_review)
+
+
+def _publish_or_review_article(article: Article, author, category_cache: dict[str, Category]) -> bool:
+    published, _ = _publish_or_review_articles([article], author, category_cache)
+    return published == 1
+
+
 @shared_task
-def fetch_source_articles(source_id: int, max_items: int = 20) -> dict:
+@_timed_task
+def fetch_source_articles(source_id: int, max_items: int = 20, attempt: int = 1) -> dict:
     task_name = 'fetch_source_articles'
     _record_task_start(task_name)
     try:
@@ -218,11 +488,23 @@ def fetch_source_articles(source_id: int, max_items: int = 20) -> dict:
             service = NewsIngestionService()
             return service.fetch_and_store(source=source, max_items=effective_max_items)
 
-        result = _execute_with_retry(
+        result, retry_delay = _run_or_schedule_retry(
             task_name,
+            fetch_source_articles,
+            {'source_id': int(source.pk), 'max_items': max_items},
+            attempt,
             operation,
             non_retry_exceptions=(ObjectDoesNotExist,),
         )
+        if result is None:
+            return {
+                'source_id': int(source.pk),
+                'source_name': source.name,
+                'status': 'retry_scheduled',
+                'attempt': attempt,
+                'retry_in_seconds': retry_delay,
+            }
+
         payload = {
             'source_id': int(source.pk),
             'source_name': result.source_name,
@@ -244,10 +526,57 @@ def fetch_source_articles(source_id: int, max_items: int = 20) -> dict:
         raise
 
 
+def _fetch_source_outcome(source_id: int, max_items: int) -> dict:
+    try:
+        return {'result': fetch_source_articles(source_id=source_id, max_items=max_items)}
+    except Exception as exc:
+        source = NewsSource.objects.filter(id=source_id).values('name', 'provider').first()
+        return {
+            'failure': {
+                'source_id': int(source_id),
+                'source_name': (source or {}).get('name', ''),
+                'provider': (source or {}).get('provider', ''),
+                'error': str(exc)[:200],
+            }
+        }
+
+
+def _aggregate_source_outcomes(outcomes: list[dict], source_count: int) -> dict:
+    results = [outcome['result'] for outcome in outcomes if 'result' in outcome]
+    failures = [outcome['failure'] for outcome in outcomes if 'failure' in outcome]
+    return {
+        'status': 'ok' if not failures else 'partial',
+        'sources': source_count,
+        'results': results,
+        'failures': failures,
+    }
+
+
+@shared_task
+@_timed_task
+def fetch_source_articles_outcome(source_id: int, max_items: int = 20) -> dict:
+    return _fetch_source_outcome(source_id, max_items)
+
+
+@shared_task
+@_timed_task
+def aggregate_source_fetch_results(outcomes: list[dict], source_count: int, lock_owner: str | None = None) -> dict:
+    task_name = 'fetch_all_active_sources'
+    payload = _aggregate_source_outcomes(list(outcomes or []), source_count)
+    cache.set(_monitoring_key(task_name, 'last_fanout_result'), payload, timeout=_monitoring_retention_seconds())
+    _record_task_success(task_name)
+    if lock_owner:
+        TaskLock(task_name, owner=lock_owner).release(result=payload)
+    return payload
+
+
 @shared_task
+@_single_run
+@_timed_task
 def fetch_all_active_sources(max_items: int = 20) -> dict:
     task_name = 'fetch_all_active_sources'
     _record_task_start(task_name)
+    _drain_delayed_retries()
     try:
         if not getattr(settings, 'FEATURE_FLAG_INGESTION_ENABLED', True):
             payload = {'status': 'skipped', 'reason': 'feature_disabled', 'sources': 0, 'results': []}
@@ -264,28 +593,22 @@ def fetch_all_active_sources(max_items: int = 20) -> dict:
             _record_task_success(task_name)
             return payload
 
-        results = []
-        failures = []
-        for source_id in source_ids:
-            try:
-                results.append(fetch_source_articles(source_id=source_id, max_items=max_items))
-            except Exception as exc:
-                source = NewsSource.objects.filter(id=source_id).values('name', 'provider').first()
-                failures.append(
-                    {
-                        'source_id': int(source_id),
-                        'source_name': (source or {}).get('name', ''),
-                        'provider': (source or {}).get('provider', ''),
-                        'error': str(exc)[:200],
-                    }
+        if fanout_available(fetch_all_active_sources):
+            # One task per source spread over the worker pool; the chord callback records success.
+            header = group(
+                fetch_source_articles_outcome.s(source_id=source_id, max_items=max_items) for source_id in source_ids
+            )
+            lock = _active_task_lock(task_name)
+            async_result = chord(header)(
+                aggregate_source_fetch_results.s(
+                    source_count=len(source_ids),
+                    lock_owner=lock.hand_off() if lock else None,
                 )
+            )
+            return {'status': 'dispatched', 'sources': len(source_ids), 'chord_id': async_result.id}
 
-        payload = {
-            'status': 'ok' if not failures else 'partial',
-            'sources': len(source_ids),
-            'results': results,
-            'failures': failures,
-        }
+        outcomes = [_fetch_source_outcome(source_id, max_items) for source_id in source_ids]
+        payload = _aggregate_source_outcomes(outcomes, len(source_ids))
         _record_task_success(task_name)
         return payload
     except Exception as exc:
@@ -294,27 +617,59 @@ def fetch_all_active_sources(max_items: int = 20) -> dict:
 
 
 @shared_task
+@_single_run
+@_timed_task
 def summarize_pending_articles(limit: int = 20) -> dict:
     task_name = 'summarize_pending_articles'
     _record_task_start(task_name)
+    _drain_delayed_retries()
     try:
         if not getattr(settings, 'FEATURE_FLAG_SUMMARIZATION_ENABLED', True):
             payload = {'status': 'skipped', 'reason': 'feature_disabled', 'summarized': 0}
             _record_task_success(task_name)
             return payload
 
-        queryset = Article.objects.filter(status=Article.Status.INGESTED).order_by('-fetched_at')[:limit]
+        governor = SummarizationBudgetGovernor()
+        lease_owner = lease_owner_token(task_name)
+        claimed = claim_batch(prioritized_pending_articles(), limit, lease_owner)
         updated = 0
+        degraded = 0
 
-        for article in queryset:
-            def operation(current_article=article):
-                summarizer = ArticleSummarizationService()
-                return summarizer.summarize_article(current_article)
-
-            _execute_with_retry(task_name, operation)
-            updated += 1
+        retry_scheduled = 0
+        try:
+            for article in claimed:
+                providers = governor.providers_for(article)
+                if providers is not None:
+                    degraded += 1
+
+                def operation(current_article=article, current_providers=providers):
+                    summarizer = ArticleSummarizationService()
+                    return summarizer.summarize_article(current_article, providers=current_providers)
+
+                # A failing article is retried on its own later; the rest of the batch keeps going.
+                summarized_article, _ = _run_or_schedule_retry(
+                    task_name,
+                    summarize_ingested_article,
+                    {'article_id': int(article.pk)},
+                    1,
+                    operation,
+                )
+                if summarized_article is None:
+                    retry_scheduled += 1
+                    continue
+                governor.record_article(summarized_article)
+                updated += 1
+        finally:
+            release_batch(Article, lease_owner)
 
-        payload = {'status': 'ok', 'summarized': updated}
+        payload = {
+            'status': 'ok',
+            'summarized': updated,
+            'claimed': len(claimed),
+            'degraded': degraded,
+            'retry_scheduled': retry_scheduled,
+            'budget': governor.usage(),
+        }
         _record_task_success(task_name)
         return payload
     except Exception as exc:
@@ -323,6 +678,8 @@ def summarize_pending_articles(limit: int = 20) -> dict:
 
 
 @shared_task
+@_single_run
+@_timed_task
 def auto_publish_trusted_articles(limit: int = 20) -> dict:
     task_name = 'auto_publish_trusted_articles'
     _record_task_start(task_name)
@@ -344,39 +701,20 @@ def auto_publish_trusted_articles(limit: int = 20) -> dict:
             _record_task_failure(task_name, RuntimeError('no_staff_author'))
             return payload
 
-        candidates = (
+        lease_owner = lease_owner_token(task_name)
+        candidates = claim_batch(
             Article.objects.select_related('source')
             .filter(status=Article.Status.SUMMARIZED)
-            .order_by('-fetched_at')[:limit]
+            .order_by('-fetched_at'),
+            limit,
+            lease_owner,
         )
 
-        published = 0
-        reviewed = 0
         category_cache: dict[str, Category] = {}
-        for article in candidates:
-            if _qualifies_for_auto_publish(article):
-                publish_dt = article.published_at or timezone.now()
-                category = _resolve_article_category(article, category_cache)
-                Post.objects.create(
-                    title=article.title,
-                    slug=_build_unique_slug(article.title, publish_dt),
-                    author=author,
-                    body=article.summary or article.body,
-                    summary=article.summary,
-                    cover_image_url=article.image_url,
-                    publish=publish_dt,
-                    status=Post.Status.PUBLISHED,
-                    auto_generated=True,
-                    source_article=article,
-                    category=category,
-                )
-                article.status = Article.Status.PUBLISHED
-                article.save(update_fields=['status', 'updated'])
-                published += 1
-            else:
-                article.status = Article.Status.PENDING_REVIEW
-                article.save(update_fields=['status', 'updated'])
-                reviewed += 1
+        try:
+            published, reviewed = _publish_or_review_articles(candidates, author, category_cache)
+        finally:
+            release_batch(Article, lease_owner)
 
         payload = {
             'status': 'ok',
@@ -391,6 +729,8 @@ def auto_publish_trusted_articles(limit: int = 20) -> dict:
 
 
 @shared_task
+@_single_run
+@_timed_task
 def rollback_auto_published_posts(limit: int = 20) -> dict:
     task_name = 'rollback_auto_published_posts'
     _record_task_start(task_name)
@@ -400,22 +740,28 @@ def rollback_auto_published_posts(limit: int = 20) -> dict:
             _record_task_success(task_name)
             return payload
 
-        posts = (
+        lease_owner = lease_owner_token(task_name)
+        posts = claim_batch(
             Post.objects.select_related('source_article')
             .filter(auto_generated=True, source_article__isnull=False, status=Post.Status.PUBLISHED)
-            .order_by('-publish')[:limit]
+            .order_by('-publish'),
+            limit,
+            lease_owner,
         )
 
         rolled_back = 0
-        for post in posts:
-            source_article = post.source_article
-            post.status = Post.Status.DRAFT
-            post.save(update_fields=['status', 'updated'])
-
-            if source_article and source_article.status == Article.Status.PUBLISHED:
-                source_article.status = Article.Status.PENDING_REVIEW
-                source_article.save(update_fields=['status', 'updated'])
-            rolled_back += 1
+        try:
+            for post in posts:
+                source_article = post.source_article
+                post.status = Post.Status.DRAFT
+                post.save(update_fields=['status', 'updated'])
+
+                if source_article and source_article.status == Article.Status.PUBLISHED:
+                    source_article.status = Article.Status.PENDING_REVIEW
+                    source_article.save(update_fields=['status', 'updated'])
+                rolled_back += 1
+        finally:
+            release_batch(Post, lease_owner)
 
         payload = {'status': 'ok', 'rolled_back': rolled_back}
         _record_task_success(task_name)
@@ -423,3 +769,278 @@ def rollback_auto_published_posts(limit: int = 20) -> dict:
     except Exception as exc:
         _record_task_failure(task_name, exc)
         raise
+
+
+def _event_pipeline_mode() -> str:
+    mode = (getattr(settings, 'EVENT_PIPELINE_MODE', 'off') or 'off').lower().strip()
+    return mode if mode in {'inline', 'celery'} else 'off'
+
+
+def enqueue_article_pipeline(article_ids) -> int:
+    article_ids = [int(article_id) for article_id in article_ids or []]
+    mode = _event_pipeline_mode()
+    if mode == 'off' or not article_ids:
+        return 0
+
+    failed = 0
+    for article_id in article_ids:
+        if mode == 'celery' and celery_chain is not None:
+            celery_chain(
+                summarize_ingested_article.si(article_id=article_id),
+                publish_summarized_article.si(article_id=article_id),
+            ).apply_async()
+            continue
+        # Inline runs in the ingest commit hook: one bad article must neither skip the rest nor fail the request.
+        # Each task already records its own failure; the article keeps its status for the sweepers.
+        try:
+            summarize_ingested_article(article_id=article_id)
+            publish_summarized_article(article_id=article_id)
+        except Exception:
+            failed += 1
+    return len(article_ids) - failed
+
+
+@shared_task
+@_timed_task
+def summarize_ingested_article(article_id: int, attempt: int = 1) -> dict:
+    task_name = 'summarize_ingested_article'
+    _record_task_start(task_name)
+    try:
+        if not getattr(settings, 'FEATURE_FLAG_SUMMARIZATION_ENABLED', True):
+            payload = {'status': 'skipped', 'reason': 'feature_disabled', 'article_id': int(article_id)}
+            _record_task_success(task_name)
+            return payload
+
+        lease_owner = lease_owner_token(task_name)
+        claimed = claim_batch(prioritized_pending_articles().filter(id=article_id), 1, lease_owner)
+        if not claimed:
+            # Already summarized, or a sweeper run holds the lease.
+            payload = {'status': 'skipped', 'reason': 'not_claimed', 'article_id': int(article_id)}
+            _record_task_success(task_name)
+            return payload
+
+        governor = SummarizationBudgetGovernor()
+        article = claimed[0]
+        try:
+            providers = governor.providers_for(article)
+
+            def operation():
+                return ArticleSummarizationService().summarize_article(article, providers=providers)
+
+            summarized_article, retry_delay = _run_or_schedule_retry(
+                task_name,
+                summarize_ingested_article,
+                {'article_id': int(article_id)},
+                attempt,
+                operation,
+            )
+        finally:
+            release_batch(Article, lease_owner)
+
+        if summarized_article is None:
+            return {
+                'status': 'retry_scheduled',
+                'article_id': int(article_id),
+                'attempt': attempt,
+                'retry_in_seconds': retry_delay,
+            }
+
+        governor.record_article(summarized_article)
+        payload = {
+            'status': 'ok',
+            'article_id': int(article_id),
+            'provider': article.summary_provider,
+            'degraded': providers is not None,
+        }
+        _record_task_success(task_name)
+        return payload
+    except Exception as exc:
+        _record_task_failure(task_name, exc)
+        raise
+
+
+@shared_task
+@_timed_task
+def publish_summarized_article(article_id: int) -> dict:
+    task_name = 'publish_summarized_article'
+    _record_task_start(task_name)
+    try:
+        if not getattr(settings, 'FEATURE_FLAG_AUTOPUBLISH_ENABLED', True):
+            payload = {'status': 'skipped', 'reason': 'feature_disabled', 'article_id': int(article_id)}
+            _record_task_success(task_name)
+            return payload
+
+        author = get_user_model().objects.filter(is_staff=True).order_by('id').first()
+        if not author:
+            payload = {'status': 'error', 'reason': 'no_staff_author', 'article_id': int(article_id)}
+            _record_task_failure(task_name, RuntimeError('no_staff_author'))
+            return payload
+
+        lease_owner = lease_owner_token(task_name)
+        claimed = claim_batch(
+            Article.objects.select_related('source').filter(id=article_id, status=Article.Status.SUMMARIZED),
+            1,
+            lease_owner,
+        )
+        if not claimed:
+            payload = {'status': 'skipped', 'reason': 'not_claimed', 'article_id': int(article_id)}
+            _record_task_success(task_name)
+            return payload
+
+        try:
+            published = _publish_or_review_article(claimed[0], author, {})
+        finally:
+            release_batch(Article, lease_owner)
+
+        payload = {'status': 'ok', 'article_id': int(article_id), 'published': published}
+        _record_task_success(task_name)
+        return payload
+    except Exception as exc:
+        _record_task_failure(task_name, exc)
+        raise
+
+
+@shared_task
+@_single_run
+@_timed_task
+def rollup_click_analytics() -> dict:
+    task_name = 'rollup_click_analytics'
+    _record_task_start(task_name)
+    try:
+        flushed = flush_click_rollups()
+        scored = refresh_click_scores()
+        placement_rows = refresh_placement_rollups()
+        payload = {
+            'status': 'ok',
+            'flushed': flushed,
+            'scored_posts': scored['posts'],
+            'scored_sources': scored['sources'],
+            'trending_posts': scored['trending'],
+            'placement_rows': placement_rows,
+        }
+        _record_task_success(task_name)
+        return payload
+    except Exception as exc:
+        _record_task_failure(task_name, exc)
+        raise
+
+
+@shared_task
+@_single_run
+@_timed_task
+def refresh_homepage_sections() -> dict:
+    task_name = 'refresh_homepage_sections'
+    _record_task_start(task_name)
+    try:
+        sections = rebuild_homepage_sections()
+        payload = {
+            'status': 'ok',
+            'trending': len(sections['trending']),
+            'fresh': len(sections['fresh']),
+            'editor': len(sections['editor']),
+        }
+        _record_task_success(task_name)
+        return payload
+    except Exception as exc:
+        _record_task_failure(task_name, exc)
+        raise
+
+
+def _homepage_sections_refresh_mode() -> str:
+    mode = (getattr(settings, 'HOMEPAGE_SECTIONS_REFRESH_MODE', 'celery') or 'celery').lower().strip()
+    return mode if mode in {'inline', 'celery', 'off'} else 'celery'
+
+
+def _dispatch_homepage_sections_refresh() -> None:
+    try:
+        refresh_homepage_sections.apply_async(countdown=sections_debounce_seconds())
+    except Exception:
+        # No reachable broker: rebuild here rather than fail the write. The claim is kept and simply expires,
+        # so the rebuild stays debounced while the broker is down.
+        rebuild_homepage_sections(release=False)
+
+
+def schedule_homepage_sections_refresh() -> None:
+    # Runs after the surrounding transaction commits so the rebuild sees the new like/comment/post.
+    mode = _homepage_sections_refresh_mode()
+    if mode == 'off':
+        return
+    if mode == 'celery' and hasattr(refresh_homepage_sections, 'apply_async') and not tasks_run_eagerly():
+        if claim_homepage_rebuild():
+            transaction.on_commit(_dispatch_homepage_sections_refresh)
+        return
+    # Inline rebuilds on the write path at most once per debounce window; changes inside the window show up
+    # with the next rebuild (a later write, the periodic click rollup, or the sections TTL).
+    if claim_homepage_rebuild(sections_debounce_seconds()):
+        transaction.on_commit(lambda: rebuild_homepage_sections(release=False))
+
+
+def _pipeline_job_mode() -> str:
+    mode = (getattr(settings, 'PIPELINE_JOB_MODE', 'celery') or 'celery').lower().strip()
+    return mode if mode in {'celery', 'thread', 'inline'} else 'celery'
+
+
+def _run_pipeline_step(action: str, params: dict) -> dict:
+    if action == 'fetch':
+        max_items = params.get('max_items', 20)
+        if params.get('source_id') is not None:
+            return fetch_source_articles(source_id=params['source_id'], max_items=max_items)
+        return fetch_all_active_sources(max_items=max_items)
+    if action == 'summarize':
+        return summarize_pending_articles(limit=params.get('limit', 20))
+    if action == 'publish':
+        return auto_publish_trusted_articles(limit=params.get('limit', 20))
+    if action == 'rollback':
+        return rollback_auto_published_posts(limit=params.get('limit', 20))
+    raise ValueError(f'Unsupported pipeline action: {action}')
+
+
+# A full run outlives CELERY_TASK_TIME_LIMIT, which is sized for the individual steps.
+@shared_task(time_limit=getattr(settings, 'PIPELINE_JOB_TIME_LIMIT', 1800))
+@_timed_task
+def run_pipeline_job(job_id: str) -> dict:
+    job = get_pipeline_job(job_id)
+    if job is None:
+        return {'status': 'missing', 'job_id': job_id}
+
+    mark_job_running(job)
+    for index, step in enumerate(job['steps']):
+        mark_step_running(job, index)
+        try:
+            result = _run_pipeline_step(step['action'], step['params'])
+        except Exception as exc:
+            error = str(exc)[:400]
+            mark_step_finished(job, index, error=error)
+            mark_job_finished(job, error=error)
+            return {'status': 'error', 'job_id': job_id}
+        mark_step_finished(job, index, result=result)
+
+    mark_job_finished(job)
+    return {'status': 'ok', 'job_id': job_id}
+
+
+def _run_pipeline_job_in_thread(job_id: str) -> None:
+    def target():
+        try:
+            run_pipeline_job(job_id)
+        finally:
+            connection.close()
+
+    threading.Thread(target=target, name=f'pipeline-job-{job_id[:8]}', daemon=True).start()
+
+
+def enqueue_pipeline_job(steps: list[dict], requested_by: str = '', origin: str = '') -> dict:
+    job = create_pipeline_job(steps, requested_by=requested_by, origin=origin)
+    mode = _pipeline_job_mode()
+    if mode == 'inline':
+        run_pipeline_job(job['id'])
+    elif mode == 'celery' and hasattr(run_pipeline_job, 'apply_async') and not tasks_run_eagerly():
+        try:
+            run_pipeline_job.apply_async(kwargs={'job_id': job['id']})
+        except Exception:
+            # No reachable broker: keep the request fast and run the job beside the web worker instead.
+            _run_pipeline_job_in_thread(job['id'])
+    else:
+        # Thread mode, no Celery, or eager Celery, whose apply_async would run every step inside this request.
+        _run_pipeline_job_in_thread(job['id'])
+    return get_pipeline_job(job['id']) or job
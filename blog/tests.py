@@ -2,23 +2,67 @@ from django.contrib.auth import get_user_model
 from django.core import mail
 from django.core.management import call_command
 from io import BytesIO, StringIO
+import gzip
+import json
+import math
+import threading
+import time
 from unittest.mock import patch
-from django.test import TestCase, override_settings
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from kombu.exceptions import OperationalError
 from django.utils import timezone
 from datetime import timedelta
 from django.core.cache import cache
 from urllib.error import HTTPError
 from urllib.parse import parse_qs, urlparse
 
-from .models import Article, Bookmark, Comment, Like, NewsSource, NewsletterSubscriber, Post
+from .models import (
+    Article,
+    Bookmark,
+    Category,
+    ClickDaily,
+    Comment,
+    Like,
+    NewsSource,
+    NewsletterSubscriber,
+    PlacementDaily,
+    Post,
+)
 from .admin import _clear_post_click_metrics, _clear_source_click_metrics
 from .services import NewsIngestionService
+from .services.budget import SummarizationBudgetGovernor, prioritized_pending_articles
+from .services.click_rollups import flush_click_rollups, placement_summary, refresh_click_scores
+from .services.cache_store import LocalTopK, drain_tally, read_many, write_many
+from .services.click_tracking import (
+    click_buffer,
+    click_key,
+    pending_rollup_key,
+    post_sources,
+    record_click,
+    reset_click_analytics,
+    top_clicked_key,
+    unique_readers,
+)
+from .services.delayed_queue import delayed_queue
+from .services.homepage_sections import HOMEPAGE_SECTIONS_KEY, HOMEPAGE_SECTIONS_PENDING_KEY
+from .services.hyperloglog import HyperLogLog
+from .services.page_cache import invalidate_page_tags, page_entry_key
+from .services.leases import claim_batch, release_batch
+from .services.llm_standin import LLMStandInServer, StandInProfile
 from .services.summarization import ArticleSummarizationService
+from .services.task_locks import TaskLock, current_owner as current_lock_owner
+from .services.trending import current_score, forward_weight, trending_post_ids
 from .tasks import (
+    _drain_delayed_retries,
     auto_publish_trusted_articles,
+    fetch_all_active_sources,
     fetch_source_articles,
+    refresh_homepage_sections,
     rollback_auto_published_posts,
+    rollup_click_analytics,
     summarize_pending_articles,
 )
 
@@ -356,6 +400,83 @@ class SummarizationTests(TestCase):
         self.assertEqual(result["summarized"], 1)
         self.assertEqual(ingested.status, Article.Status.SUMMARIZED)
 
+    @override_settings(AI_SUMMARY_PROVIDER="gemini", GEMINI_API_KEY="", GROQ_API_KEY="")
+    def test_summarize_pending_articles_prefers_auto_publish_candidates(self):
+        trusted_source = NewsSource.objects.create(
+            name="Trusted Summary Feed",
+            provider=NewsSource.Provider.NEWSAPI,
+            trust_score=90,
+            auto_publish=True,
+        )
+        newest_low_priority = Article.objects.create(
+            source=self.source,
+            title="Newest low priority",
+            body=" ".join(["content"] * 100),
+            source_url="https://example.com/newest-low-priority",
+            status=Article.Status.INGESTED,
+            originality_score=10,
+        )
+        trusted = Article.objects.create(
+            source=trusted_source,
+            title="Older trusted story",
+            body=" ".join(["content"] * 100),
+            source_url="https://example.com/older-trusted",
+            status=Article.Status.INGESTED,
+            originality_score=80,
+            fetched_at=timezone.now() - timedelta(hours=2),
+        )
+
+        summarize_pending_articles(limit=1)
+
+        trusted.refresh_from_db()
+        newest_low_priority.refresh_from_db()
+        self.assertEqual(trusted.status, Article.Status.SUMMARIZED)
+        self.assertEqual(newest_low_priority.status, Article.Status.INGESTED)
+
+    @override_settings(
+        AI_SUMMARY_PROVIDER="gemini",
+        GEMINI_API_KEY="",
+        GROQ_API_KEY="",
+        LLM_DAILY_TOKEN_BUDGET=1000,
+        LLM_BUDGET_RESERVE_RATIO=0.2,
+        LLM_BUDGET_RESERVE_MIN_PRIORITY=150,
+    )
+    def test_summarize_pending_articles_degrades_low_priority_when_budget_is_nearly_spent(self):
+        cache.clear()
+        SummarizationBudgetGovernor().record("gemini", 900, "0.01")
+        trusted_source = NewsSource.objects.create(
+            name="Budget Trusted Feed",
+            provider=NewsSource.Provider.NEWSAPI,
+            trust_score=90,
+            auto_publish=True,
+        )
+        trusted = Article.objects.create(
+            source=trusted_source,
+            title="Trusted budget story",
+            body=" ".join(["content"] * 100),
+            source_url="https://example.com/budget-trusted",
+            status=Article.Status.INGESTED,
+            originality_score=80,
+        )
+        low_priority = Article.objects.create(
+            source=self.source,
+            title="Low priority budget story",
+            body="Markets moved sideways today. Traders waited for the central bank decision later this week.",
+            source_url="https://example.com/budget-low",
+            status=Article.Status.INGESTED,
+        )
+
+        result = summarize_pending_articles(limit=10)
+
+        trusted.refresh_from_db()
+        low_priority.refresh_from_db()
+        self.assertEqual(result["degraded"], 1)
+        self.assertEqual(trusted.summary_provider, "fallback")
+        self.assertEqual(low_priority.summary_provider, "local")
+        self.assertEqual(result["budget"]["providers"]["gemini"]["tokens"], 900)
+        self.assertEqual(result["budget"]["providers"]["local"]["calls"], 1)
+        self.assertEqual(result["budget"]["utilization"], 0.9)
+
     @override_settings(
         AI_SUMMARY_PROVIDER="groq",
         GROQ_API_KEY="",
@@ -377,6 +498,159 @@ class SummarizationTests(TestCase):
         article.refresh_from_db()
         self.assertEqual(article.summary_prompt_mode, "deep")
 
+    @override_settings(AI_SUMMARY_PROVIDER="gemini", GEMINI_API_KEY="", GROQ_API_KEY="")
+    def test_fallback_summary_skips_dateline_and_byline(self):
+        body = (
+            "By Jane Doe. "
+            "Updated 5 minutes ago. "
+            "The central bank raised interest rates by half a point on Tuesday to fight inflation. "
+            "Markets had expected the central bank to hold rates steady this month. "
+            "Analysts said the inflation data forced the central bank to act sooner than planned. "
+            "The weather in the capital was mild."
+        )
+        summary, meta = ArticleSummarizationService().summarize_text(body)
+
+        self.assertEqual(meta["provider"], "fallback")
+        self.assertNotIn("Jane Doe", summary)
+        self.assertIn("central bank raised interest rates", summary)
+
+    @override_settings(AI_SUMMARY_PROVIDER="local", LOCAL_SUMMARY_MAX_SENTENCES=2, LOCAL_SUMMARY_MAX_WORDS=200)
+    def test_local_provider_summarizes_without_network(self):
+        article = Article.objects.create(
+            source=self.source,
+            title="Local summary story",
+            body=(
+                "Engineers shipped a new battery chemistry for electric buses. "
+                "The battery chemistry doubles range for electric buses in cold weather. "
+                "City officials plan to order buses with the new battery next year. "
+                "A spokesperson declined to comment."
+            ),
+            source_url="https://example.com/local-summary",
+            status=Article.Status.INGESTED,
+        )
+
+        with patch("blog.services.summarization.urlopen") as urlopen_mock:
+            ArticleSummarizationService().summarize_article(article)
+
+        urlopen_mock.assert_not_called()
+        article.refresh_from_db()
+        self.assertEqual(article.summary_provider, "local")
+        self.assertEqual(article.summary_model, "textrank")
+        self.assertEqual(article.summary_estimated_cost_usd, 0)
+        self.assertEqual(len([part for part in article.summary.split(". ") if part]), 2)
+
+    @override_settings(
+        AI_SUMMARY_PROVIDER="gemini",
+        GEMINI_API_KEY="live-key",
+        GROQ_API_KEY="",
+        LOCAL_SUMMARY_MAX_TRUST_SCORE=40,
+    )
+    def test_low_trust_source_routes_to_local_provider(self):
+        self.source.trust_score = 20
+        self.source.save(update_fields=["trust_score", "updated"])
+        article = Article.objects.create(
+            source=self.source,
+            title="Low trust story",
+            body="Rumours spread about a merger between two retailers. Neither retailer confirmed the merger talks.",
+            source_url="https://example.com/low-trust",
+            status=Article.Status.INGESTED,
+        )
+
+        with patch("blog.services.summarization.urlopen") as urlopen_mock:
+            ArticleSummarizationService().summarize_article(article)
+
+        urlopen_mock.assert_not_called()
+        article.refresh_from_db()
+        self.assertEqual(article.summary_provider, "local")
+
+    @override_settings(AI_SUMMARY_PROVIDER="gemini", LOCAL_SUMMARY_MAX_TRUST_SCORE=40)
+    def test_claimed_batch_routes_by_trust_without_per_article_queries(self):
+        for index, trust_score in enumerate((10, 60, 30)):
+            source = NewsSource.objects.create(
+                name=f"Trust Feed {index}",
+                provider=NewsSource.Provider.CUSTOM,
+                trust_score=trust_score,
+            )
+            Article.objects.create(
+                source=source,
+                title=f"Trust story {index}",
+                body="Body.",
+                source_url=f"https://example.com/trust-{index}",
+                status=Article.Status.INGESTED,
+            )
+
+        claimed = claim_batch(prioritized_pending_articles(), 10, "worker-a")
+        summarizer = ArticleSummarizationService()
+        with self.assertNumQueries(0):
+            routes = {article.source.trust_score: summarizer._providers_for_article(article) for article in claimed}
+        self.assertEqual(routes, {10: ["local"], 30: ["local"], 60: ["gemini", "groq"]})
+
+        fetched = Article.objects.get(source__trust_score=10)
+        self.assertEqual(summarizer._providers_for_article(fetched), ["local"])
+
+    def test_llm_standin_serves_gemini_and_groq_shapes(self):
+        server = LLMStandInServer("127.0.0.1", 0, StandInProfile(latency="fixed", latency_ms=0, seed=1))
+        server.start_in_background()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        text = "Regulators approved the merger after a year of review. Shares rose in early trading."
+
+        with override_settings(
+            GEMINI_API_BASE_URL=server.base_url,
+            GROQ_API_BASE_URL=server.base_url,
+            GEMINI_API_KEYS="",
+            GEMINI_API_KEY="standin-key",
+            GROQ_API_KEY="standin-key",
+        ):
+            gemini_summary, gemini_meta = ArticleSummarizationService().summarize_text(text, providers=["gemini"])
+            groq_summary, groq_meta = ArticleSummarizationService().summarize_text(text, providers=["groq"])
+
+        self.assertEqual(gemini_meta["provider"], "gemini")
+        self.assertEqual(groq_meta["provider"], "groq")
+        self.assertEqual(gemini_summary, "Regulators approved the merger after a year of review.")
+        self.assertEqual(groq_summary, gemini_summary)
+        self.assertEqual(server.state.stats.snapshot()["by_route"], {"gemini": 1, "groq": 1})
+
+    def test_llm_standin_rate_limit_burst_falls_through_to_next_provider(self):
+        server = LLMStandInServer(
+            "127.0.0.1",
+            0,
+            StandInProfile(latency="fixed", latency_ms=0, burst_every=1, burst_length=1, seed=1),
+        )
+        server.start_in_background()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with override_settings(
+            GEMINI_API_BASE_URL=server.base_url,
+            GROQ_API_BASE_URL=server.base_url,
+            GEMINI_API_KEYS="key-a,key-b",
+            GEMINI_API_KEY="",
+            GROQ_API_KEY="",
+        ):
+            _, meta = ArticleSummarizationService().summarize_text("Short body for the burst test.")
+
+        stats = server.state.stats.snapshot()
+        self.assertEqual(meta["provider"], "fallback")
+        self.assertEqual(stats["rate_limited"], 2)
+        self.assertEqual(stats["by_route"]["gemini"], 2)
+
+    def test_benchmark_summarization_command_reports_each_scenario(self):
+        output = StringIO()
+        call_command(
+            "benchmark_summarization",
+            "--articles=6",
+            "--concurrency=1,3",
+            "--batch-size=3",
+            "--latency=fixed",
+            "--latency-ms=0",
+            stdout=output,
+        )
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len([line for line in lines if line.split()[:2] in (["1", "3"], ["3", "3"])]), 2)
+        self.assertIn("Best throughput:", output.getvalue())
+
 
 class AutoPublishWorkflowTests(TestCase):
     def setUp(self):
@@ -515,6 +789,72 @@ class AutoPublishWorkflowTests(TestCase):
         self.assertEqual(result["reviewed"], 1)
         self.assertEqual(article.status, Article.Status.PENDING_REVIEW)
 
+    @override_settings(
+        AUTO_PUBLISH_MIN_TRUST_SCORE=70,
+        AUTO_PUBLISH_MIN_ORIGINALITY=40,
+        AUTO_PUBLISH_REQUIRE_AD_SAFE=True,
+    )
+    def test_auto_publish_uses_constant_queries_and_unique_slugs(self):
+        publish_dt = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        Category.objects.create(name="Tech", slug="tech")
+        Post.objects.create(
+            title="Same headline",
+            slug="same-headline",
+            author=self.user,
+            body="existing",
+            publish=publish_dt,
+            status=Post.Status.PUBLISHED,
+        )
+
+        def create_batch(prefix, count):
+            for index in range(count):
+                Article.objects.create(
+                    source=self.source,
+                    title="Same headline",
+                    body="body",
+                    summary="summary",
+                    summary_category="Tech",
+                    source_url=f"https://example.com/{prefix}-{index}",
+                    originality_score=60,
+                    is_ad_safe=True,
+                    published_at=publish_dt,
+                    status=Article.Status.SUMMARIZED,
+                )
+
+        create_batch("small", 2)
+        with CaptureQueriesContext(connection) as small_batch:
+            auto_publish_trusted_articles(limit=50)
+        create_batch("large", 20)
+        with CaptureQueriesContext(connection) as large_batch:
+            result = auto_publish_trusted_articles(limit=50)
+
+        self.assertEqual(result["published"], 20)
+        self.assertEqual(len(large_batch), len(small_batch))
+        slugs = list(Post.objects.filter(title="Same headline").values_list("slug", flat=True))
+        self.assertEqual(len(slugs), 23)
+        self.assertEqual(len(set(slugs)), 23)
+        self.assertIn("same-headline-22", slugs)
+
+    @override_settings(TIME_ZONE="Africa/Addis_Ababa")
+    def test_single_and_batch_slug_paths_agree_on_publish_date_near_midnight(self):
+        from datetime import datetime, timezone as dt_timezone
+
+        from .tasks import _allocate_unique_slugs, _build_unique_slug
+
+        # 22:30 UTC on Jan 1 is already Jan 2 in UTC+3, which is the day the publish__date lookup sees.
+        Post.objects.create(
+            title="Midnight headline",
+            slug="midnight-headline",
+            author=self.user,
+            body="existing",
+            publish=datetime(2026, 1, 1, 22, 30, tzinfo=dt_timezone.utc),
+            status=Post.Status.PUBLISHED,
+        )
+        publish_dt = datetime(2026, 1, 1, 23, 0, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(_build_unique_slug("Midnight headline", publish_dt), "midnight-headline-1")
+        self.assertEqual(_allocate_unique_slugs([("Midnight headline", publish_dt)]), ["midnight-headline-1"])
+
     def test_rollback_auto_published_posts_reverts_statuses(self):
         article = Article.objects.create(
             source=self.source,
@@ -546,6 +886,54 @@ class AutoPublishWorkflowTests(TestCase):
         self.assertEqual(post.status, Post.Status.DRAFT)
         self.assertEqual(article.status, Article.Status.PENDING_REVIEW)
 
+    def test_auto_publish_skips_articles_leased_by_another_worker(self):
+        leased = Article.objects.create(
+            source=self.source,
+            title="Leased elsewhere",
+            body="body",
+            summary="summary",
+            source_url="https://example.com/leased-elsewhere",
+            originality_score=80,
+            status=Article.Status.SUMMARIZED,
+            lease_owner="other-worker",
+            lease_expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        result = auto_publish_trusted_articles(limit=10)
+
+        leased.refresh_from_db()
+        self.assertEqual(result["published"] + result["reviewed"], 0)
+        self.assertEqual(leased.status, Article.Status.SUMMARIZED)
+        self.assertEqual(leased.lease_owner, "other-worker")
+        self.assertFalse(Post.objects.filter(source_article=leased).exists())
+
+    def test_claim_batch_reclaims_expired_leases_and_skips_live_ones(self):
+        expired = Article.objects.create(
+            source=self.source,
+            title="Abandoned claim",
+            body="body",
+            source_url="https://example.com/abandoned-claim",
+            lease_owner="crashed-worker",
+            lease_expires_at=timezone.now() - timedelta(minutes=1),
+        )
+        Article.objects.create(
+            source=self.source,
+            title="Live claim",
+            body="body",
+            source_url="https://example.com/live-claim",
+            lease_owner="busy-worker",
+            lease_expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        queryset = Article.objects.filter(status=Article.Status.INGESTED).order_by("-fetched_at")
+
+        first = claim_batch(queryset, 10, "worker-a")
+        second = claim_batch(queryset, 10, "worker-b")
+
+        self.assertEqual([article.pk for article in first], [expired.pk])
+        self.assertEqual(second, [])
+        self.assertEqual(release_batch(Article, "worker-a"), 1)
+        self.assertEqual([article.pk for article in claim_batch(queryset, 10, "worker-b")], [expired.pk])
+
     @override_settings(FEATURE_FLAG_TELEGRAM_INGESTION_ENABLED=False)
     def test_fetch_source_articles_skips_when_telegram_flag_disabled(self):
         telegram_source = NewsSource.objects.create(
@@ -577,6 +965,170 @@ class AutoPublishWorkflowTests(TestCase):
         self.assertEqual(second["status"], "skipped")
         self.assertEqual(second["reason"], "telegram_schedule_window")
 
+    @override_settings(
+        EVENT_PIPELINE_MODE="inline",
+        EXTERNAL_NEWS_MIN_ARTICLE_WORDS=1,
+        MIN_ORIGINALITY_SCORE=0,
+        AUTO_PUBLISH_MIN_ORIGINALITY=0,
+        AI_SUMMARY_PROVIDER="gemini",
+        GEMINI_API_KEY="",
+        GEMINI_API_KEYS="",
+        GROQ_API_KEY="",
+    )
+    def test_event_pipeline_publishes_new_article_on_ingest_commit(self):
+        cache.clear()
+        items = [
+            {
+                "title": "Breaking chip export story",
+                "body": "Regulators approved new chip export rules today. Manufacturers expect faster shipments next month.",
+                "source_url": "https://example.com/breaking-chip-export",
+                "external_id": "breaking-1",
+            }
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            result = NewsIngestionService().ingest_items(source=self.source, items=items)
+
+        article = Article.objects.get(source_url="https://example.com/breaking-chip-export")
+        # The pipeline enqueue, then the publish step's page-cache invalidation and the homepage rebuild it schedules.
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(result.created_ids, [article.pk])
+        self.assertEqual(article.status, Article.Status.PUBLISHED)
+        self.assertEqual(article.lease_owner, "")
+        self.assertTrue(Post.published.filter(source_article=article).exists())
+
+    @override_settings(
+        EVENT_PIPELINE_MODE="inline",
+        EXTERNAL_NEWS_MIN_ARTICLE_WORDS=1,
+        MIN_ORIGINALITY_SCORE=0,
+        AUTO_PUBLISH_MIN_ORIGINALITY=0,
+        AI_SUMMARY_PROVIDER="gemini",
+        GEMINI_API_KEY="",
+        GEMINI_API_KEYS="",
+        GROQ_API_KEY="",
+    )
+    def test_event_pipeline_isolates_a_failing_article_in_the_batch(self):
+        items = [
+            {
+                "title": "Broken harbour story",
+                "body": "Port officials reopened the harbour after a storm. Shipping lanes cleared by the afternoon.",
+                "source_url": "https://example.com/broken-harbour",
+                "external_id": "batch-1",
+            },
+            {
+                "title": "Healthy rail story",
+                "body": "The rail operator added night trains between the two cities. Tickets go on sale next week.",
+                "source_url": "https://example.com/healthy-rail",
+                "external_id": "batch-2",
+            },
+        ]
+        original = SummarizationBudgetGovernor.providers_for
+
+        def providers_for(governor, article):
+            if article.source_url.endswith("broken-harbour"):
+                raise RuntimeError("budget store unavailable")
+            return original(governor, article)
+
+        with patch.object(SummarizationBudgetGovernor, "providers_for", providers_for):
+            with self.captureOnCommitCallbacks(execute=True):
+                NewsIngestionService().ingest_items(source=self.source, items=items)
+
+        broken = Article.objects.get(source_url="https://example.com/broken-harbour")
+        healthy = Article.objects.get(source_url="https://example.com/healthy-rail")
+        self.assertEqual(broken.status, Article.Status.INGESTED)
+        self.assertEqual(broken.lease_owner, "")
+        self.assertEqual(healthy.status, Article.Status.PUBLISHED)
+        self.assertTrue(Post.published.filter(source_article=healthy).exists())
+
+    @override_settings(EVENT_PIPELINE_MODE="off", EXTERNAL_NEWS_MIN_ARTICLE_WORDS=1, MIN_ORIGINALITY_SCORE=0)
+    def test_event_pipeline_off_leaves_articles_for_sweepers(self):
+        items = [
+            {
+                "title": "Sweeper story",
+                "body": "Officials confirmed the new policy will take effect next quarter across the region.",
+                "source_url": "https://example.com/sweeper-story",
+                "external_id": "sweeper-1",
+            }
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NewsIngestionService().ingest_items(source=self.source, items=items)
+
+        article = Article.objects.get(source_url="https://example.com/sweeper-story")
+        self.assertEqual(article.status, Article.Status.INGESTED)
+        self.assertFalse(Post.objects.filter(source_article=article).exists())
+
+    def test_fetch_all_active_sources_fans_out_per_source_when_run_as_task(self):
+        from celery import current_app
+        from blog.services.news_ingestion import FetchResult
+
+        cache.clear()
+        broken_source = NewsSource.objects.create(name="Broken Feed", provider=NewsSource.Provider.GNEWS)
+
+        def fake_fetch(self, source, max_items=20):
+            if source.pk == broken_source.pk:
+                raise RuntimeError("provider down")
+            return FetchResult(source_name=source.name, fetched=2, created=2, updated=0)
+
+        previous_eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        self.addCleanup(setattr, current_app.conf, "task_always_eager", previous_eager)
+
+        with override_settings(TASK_RETRY_MAX_ATTEMPTS=1), patch(
+            "blog.tasks.NewsIngestionService.fetch_and_store", fake_fetch
+        ):
+            dispatched = fetch_all_active_sources.apply(kwargs={"max_items": 5}).get()
+            inline = fetch_all_active_sources(max_items=5)
+
+        fanout_payload = cache.get("monitoring:task:fetch_all_active_sources:last_fanout_result")
+        self.assertEqual(dispatched["status"], "dispatched")
+        self.assertEqual(dispatched["sources"], 2)
+        self.assertEqual(fanout_payload["status"], "partial")
+        self.assertEqual([item["source_name"] for item in fanout_payload["results"]], ["Trusted Feed"])
+        self.assertEqual(fanout_payload["failures"][0]["source_name"], "Broken Feed")
+        self.assertEqual(inline["results"], fanout_payload["results"])
+        self.assertEqual(inline["failures"], fanout_payload["failures"])
+        self.assertEqual(cache.get("monitoring:task:fetch_all_active_sources:last_status"), "ok")
+        self.assertIsNone(current_lock_owner("fetch_all_active_sources"))
+
+    def test_pipeline_task_skips_while_another_run_holds_the_lock(self):
+        from .views import _monitoring_snapshot
+
+        cache.clear()
+        lock = TaskLock("summarize_pending_articles")
+        self.assertTrue(lock.acquire())
+
+        with patch("blog.tasks.ArticleSummarizationService.summarize_article") as summarize_mock:
+            skipped = summarize_pending_articles(limit=5)
+            snapshot = _monitoring_snapshot("summarize_pending_articles")
+            lock.release()
+            completed = summarize_pending_articles(limit=5)
+
+        self.assertEqual(skipped, {"status": "skipped", "reason": "already_running", "lock_owner": lock.owner})
+        self.assertTrue(snapshot["lock"]["held"])
+        self.assertEqual(snapshot["lock"]["owner"], lock.owner)
+        self.assertEqual(snapshot["lock_contended"], 1)
+        self.assertEqual(completed["status"], "ok")
+        self.assertIsNone(current_lock_owner("summarize_pending_articles"))
+        self.assertEqual(summarize_mock.call_count, 0)
+
+    @override_settings(TASK_LOCK_CONTENTION_OVERRIDES={"auto_publish_trusted_articles": "coalesce"}, TASK_LOCK_WAIT_SECONDS=5)
+    def test_pipeline_task_coalesces_into_running_job(self):
+        cache.clear()
+        lock = TaskLock("auto_publish_trusted_articles")
+        self.assertTrue(lock.acquire())
+        running_result = {"status": "ok", "published": 4, "reviewed": 0}
+        releaser = threading.Timer(0.2, lock.release, kwargs={"result": running_result})
+        releaser.start()
+        self.addCleanup(releaser.cancel)
+
+        with patch("blog.tasks._publish_or_review_articles") as publish_mock:
+            result = auto_publish_trusted_articles(limit=5)
+
+        self.assertEqual(result, {"status": "coalesced", "lock_owner": lock.owner, "result": running_result})
+        publish_mock.assert_not_called()
+        self.assertEqual(cache.get("monitoring:task:auto_publish_trusted_articles:last_lock_contention")["outcome"], "coalesced")
+
     @override_settings(
         FEATURE_FLAG_AUTOPUBLISH_ENABLED=True,
         FEATURE_FLAG_TELEGRAM_AUTOPUBLISH_ENABLED=False,
@@ -616,6 +1168,69 @@ class AutoPublishWorkflowTests(TestCase):
         self.assertEqual(cache.get("monitoring:task:summarize_pending_articles:consecutive_failures"), 0)
         self.assertGreaterEqual(int(cache.get("monitoring:task:summarize_pending_articles:total_runs", 0)), 1)
 
+    def test_task_monitoring_counters_do_not_lose_concurrent_increments(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from .tasks import _record_task_failure, _record_task_start
+
+        cache.clear()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: _record_task_start("summarize_pending_articles"), range(200)))
+            list(executor.map(lambda _: _record_task_failure("summarize_pending_articles", RuntimeError("x")), range(50)))
+
+        self.assertEqual(cache.get("monitoring:task:summarize_pending_articles:total_runs"), 200)
+        self.assertEqual(cache.get("monitoring:task:summarize_pending_articles:total_failures"), 50)
+        self.assertEqual(cache.get("monitoring:task:summarize_pending_articles:consecutive_failures"), 50)
+
+    def test_monitoring_overview_reads_all_tasks_in_one_batch(self):
+        from .views import MONITORED_TASKS, _monitoring_overview
+
+        cache.clear()
+        summarize_pending_articles(limit=1)
+
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many_mock:
+            overview = _monitoring_overview()
+
+        get_many_mock.assert_called_once()
+        self.assertEqual(len(overview["tasks"]), len(MONITORED_TASKS))
+        summarize = next(item for item in overview["tasks"] if item["task"] == "summarize_pending_articles")
+        self.assertEqual(summarize["last_status"], "ok")
+        self.assertEqual(summarize["total_runs"], 1)
+
+    @override_settings(MONITORING_RUN_HISTORY_SIZE=2)
+    def test_task_timing_records_histogram_and_capped_run_history(self):
+        from django.core.exceptions import ObjectDoesNotExist
+        from .views import _monitoring_snapshot
+
+        cache.clear()
+        for _ in range(3):
+            auto_publish_trusted_articles(limit=5)
+        with self.assertRaises(ObjectDoesNotExist):
+            fetch_source_articles(source_id=999999, max_items=1)
+
+        publish_snapshot = _monitoring_snapshot("auto_publish_trusted_articles")
+        fetch_snapshot = _monitoring_snapshot("fetch_source_articles")
+
+        self.assertEqual(publish_snapshot["duration"]["count"], 3)
+        self.assertEqual(sum(bucket["count"] for bucket in publish_snapshot["duration"]["buckets"]), 3)
+        self.assertIsNotNone(publish_snapshot["duration"]["p95_ms"])
+        self.assertEqual([run["sequence"] for run in publish_snapshot["recent_runs"]], [3, 2])
+        self.assertEqual(publish_snapshot["recent_runs"][0]["outcome"], "ok")
+        self.assertEqual(fetch_snapshot["recent_runs"][0]["outcome"], "error")
+
+    def test_every_registered_blog_task_is_timed(self):
+        from celery import current_app
+
+        def is_timed(func):
+            while func is not None:
+                if getattr(func, "timed", False):
+                    return True
+                func = getattr(func, "__wrapped__", None)
+            return False
+
+        task_names = sorted(name for name in current_app.tasks if name.startswith("blog.tasks."))
+        self.assertIn("blog.tasks.run_pipeline_job", task_names)
+        self.assertEqual([name for name in task_names if not is_timed(current_app.tasks[name].run)], [])
+
     def test_task_monitoring_records_failure_metrics(self):
         cache.clear()
 
@@ -642,12 +1257,75 @@ class AutoPublishWorkflowTests(TestCase):
             "blog.tasks.NewsIngestionService.fetch_and_store",
             side_effect=[RuntimeError("temporary failure"), DummyResult()],
         ):
+            delayed_queue.clear()
             result = fetch_source_articles(source_id=self.source.id, max_items=1)
+            self.assertEqual(result["status"], "retry_scheduled")
+            self.assertEqual(len(delayed_queue), 1)
+            self.assertEqual(_drain_delayed_retries(now=time.time() + 600), 1)
 
-        self.assertEqual(result["status"], "ok")
+        self.assertEqual(len(delayed_queue), 0)
         self.assertGreaterEqual(int(cache.get("monitoring:task:fetch_source_articles:total_retries", 0)), 1)
         self.assertEqual(cache.get("monitoring:task:fetch_source_articles:last_status"), "ok")
 
+    @override_settings(TASK_RETRY_MAX_ATTEMPTS=3)
+    def test_summarize_pending_articles_retries_failed_article_without_blocking_batch(self):
+        cache.clear()
+        delayed_queue.clear()
+        self.addCleanup(delayed_queue.clear)
+        for index in range(3):
+            Article.objects.create(
+                source=self.source,
+                external_id=f"retry-item-{index}",
+                source_url=f"https://example.com/retry-item-{index}",
+                title=f"Retry item {index}",
+                body="Body text",
+                status=Article.Status.INGESTED,
+            )
+
+        def summarize(article, providers=None):
+            if article.external_id == "retry-item-1":
+                raise RuntimeError("provider timeout")
+            article.status = Article.Status.SUMMARIZED
+            article.save(update_fields=["status"])
+            return article
+
+        with patch("blog.tasks.ArticleSummarizationService.summarize_article", side_effect=summarize):
+            result = summarize_pending_articles(limit=10)
+
+        self.assertEqual(result["summarized"], 2)
+        self.assertEqual(result["retry_scheduled"], 1)
+        self.assertEqual(len(delayed_queue), 1)
+        self.assertEqual(
+            Article.objects.get(external_id="retry-item-1").status,
+            Article.Status.INGESTED,
+        )
+
+    @override_settings(TASK_RETRY_MAX_ATTEMPTS=3, TASK_RETRY_BACKOFF_BASE_SECONDS=4)
+    def test_summarize_pending_articles_in_worker_schedules_retry_on_broker(self):
+        cache.clear()
+        delayed_queue.clear()
+        self.addCleanup(delayed_queue.clear)
+        article = Article.objects.create(
+            source=self.source,
+            external_id="worker-retry-item",
+            source_url="https://example.com/worker-retry-item",
+            title="Worker retry item",
+            body="Body text",
+            status=Article.Status.INGESTED,
+        )
+
+        with patch(
+            "blog.tasks.ArticleSummarizationService.summarize_article",
+            side_effect=RuntimeError("provider timeout"),
+        ), patch("blog.tasks.summarize_ingested_article.apply_async") as apply_async_mock:
+            result = summarize_pending_articles.apply(kwargs={"limit": 5}).get()
+
+        self.assertEqual(result["retry_scheduled"], 1)
+        self.assertEqual(len(delayed_queue), 0)
+        apply_async_mock.assert_called_once()
+        self.assertEqual(apply_async_mock.call_args.kwargs["kwargs"], {"article_id": article.pk, "attempt": 2})
+        self.assertGreaterEqual(apply_async_mock.call_args.kwargs["countdown"], 2)
+
     @override_settings(FEATURE_FLAG_INGESTION_ENABLED=False)
     def test_fetch_source_articles_respects_ingestion_feature_flag(self):
         result = fetch_source_articles(source_id=self.source.id, max_items=1)
@@ -721,6 +1399,32 @@ class SeoAndHomepageTests(TestCase):
         self.assertIn("editor_posts", response.context)
         self.assertTrue(response.context["show_in_feed_ad"])
 
+    def test_post_list_pages_with_opaque_cursor_links(self):
+        for idx in range(7, 10):
+            Post.objects.create(
+                title=f"Post {idx}",
+                slug=f"post-{idx}",
+                author=self.user,
+                body="body",
+                status=Post.Status.PUBLISHED,
+            )
+        first = self.client.get(reverse("blog:post_list"))
+        page = first.context["page_obj"]
+        self.assertTrue(page.has_next)
+        self.assertContains(first, f"?cursor={page.next_cursor}")
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(reverse("blog:post_list"), {"cursor": page.next_cursor})
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(second.context["page_obj"].number, 2)
+        self.assertFalse(second.context["page_obj"].has_next)
+        ids = [post.id for post in first.context["posts"]] + [post.id for post in second.context["posts"]]
+        self.assertEqual(ids, list(Post.published.order_by("-publish", "-id").values_list("id", flat=True)))
+
+        searched = self.client.get(reverse("blog:post_list"), {"q": "Post", "cursor": "garbage"})
+        self.assertEqual(searched.status_code, 200)
+        self.assertEqual(searched.context["page_obj"].number, 1)
+
     def test_sports_hub_renders_tables_tab(self):
         self.source.provider = NewsSource.Provider.OPENLIGADB
         self.source.save(update_fields=["provider", "updated"])
@@ -797,8 +1501,14 @@ class SeoAndHomepageTests(TestCase):
         source_post.comments.create(user=self.user, body="Nice", approved=True)
         other_post.likes.create(user=self.user)
 
-        source_id = source_post.source_article.source_id
-        cache.set(f"analytics:clicks:source:{source_id}:total", 25, timeout=60 * 60)
+        ClickDaily.objects.create(
+            post=source_post,
+            source_id=source_post.source_article.source_id,
+            placement="feed",
+            date=timezone.localdate(),
+            count=25,
+        )
+        refresh_click_scores()
 
         response = self.client.get(reverse("blog:post_list"))
         self.assertEqual(response.status_code, 200)
@@ -806,6 +1516,7 @@ class SeoAndHomepageTests(TestCase):
         self.assertGreaterEqual(len(trending), 2)
         self.assertEqual(trending[0].id, source_post.id)
 
+    @override_settings(ANALYTICS_RETENTION_DAYS=90)
     def test_source_click_decay_lets_fresh_content_win(self):
         cache.clear()
         stale_post = Post.published.get(slug="post-2")
@@ -814,33 +1525,22 @@ class SeoAndHomepageTests(TestCase):
         stale_post.likes.create(user=self.user)
         fresh_post.likes.create(user=self.user)
 
-        stale_source_id = stale_post.source_article.source_id
-        fresh_source_id = fresh_post.source_article.source_id
-        cache.set(f"analytics:clicks:source:{stale_source_id}:total", 100, timeout=60 * 60)
-        cache.set(
-            f"analytics:clicks:source:{stale_source_id}:last_seen",
-            timezone.now() - timedelta(days=60),
-            timeout=60 * 60,
-        )
-        cache.set(f"analytics:clicks:source:{fresh_source_id}:total", 10, timeout=60 * 60)
-        cache.set(
-            f"analytics:clicks:source:{fresh_source_id}:last_seen",
-            timezone.now(),
-            timeout=60 * 60,
-        )
-
-        cache.set(f"analytics:clicks:post:{stale_post.id}:total", 50, timeout=60 * 60)
-        cache.set(
-            f"analytics:clicks:post:{stale_post.id}:last_seen",
-            timezone.now() - timedelta(days=60),
-            timeout=60 * 60,
+        today = timezone.localdate()
+        ClickDaily.objects.create(
+            post=stale_post,
+            source_id=stale_post.source_article.source_id,
+            placement="feed",
+            date=today - timedelta(days=60),
+            count=100,
         )
-        cache.set(f"analytics:clicks:post:{fresh_post.id}:total", 10, timeout=60 * 60)
-        cache.set(
-            f"analytics:clicks:post:{fresh_post.id}:last_seen",
-            timezone.now(),
-            timeout=60 * 60,
+        ClickDaily.objects.create(
+            post=fresh_post,
+            source_id=fresh_post.source_article.source_id,
+            placement="feed",
+            date=today,
+            count=10,
         )
+        refresh_click_scores()
 
         response = self.client.get(reverse("blog:post_list"))
         self.assertEqual(response.status_code, 200)
@@ -848,6 +1548,319 @@ class SeoAndHomepageTests(TestCase):
         self.assertGreaterEqual(len(trending), 2)
         self.assertEqual(trending[0].id, fresh_post.id)
 
+    def test_homepage_trending_is_one_range_read_updated_by_clicks(self):
+        cache.clear()
+        clicked_post = Post.published.get(slug="post-1")
+        other_post = Post.published.get(slug="post-2")
+        other_post.likes.create(user=self.user)
+        refresh_click_scores()
+        self.assertNotEqual(trending_post_ids(1), [clicked_post.id])
+
+        for _ in range(3):
+            record_click(clicked_post.id, None, "feed")
+
+        self.assertEqual(trending_post_ids(1), [clicked_post.id])
+        refresh_homepage_sections()
+        response = self.client.get(reverse("blog:post_list"))
+        self.assertEqual(list(response.context["trending_posts"])[0].id, clicked_post.id)
+
+    def test_homepage_sections_are_materialized_and_refreshed_on_engagement(self):
+        cache.clear()
+        liked_post = Post.published.get(slug="post-1")
+        self.client.get(reverse("blog:post_list"))
+        with self.assertNumQueries(4):
+            # Keyset page rows and tags, then one in_bulk (plus tags) for all three sections.
+            response = self.client.get(reverse("blog:post_list"))
+        self.assertEqual(len(response.context["trending_posts"]), 4)
+
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("blog:post_like", args=[liked_post.id]))
+        self.assertEqual(cache.get(HOMEPAGE_SECTIONS_KEY)["trending"][0], liked_post.id)
+
+        self.client.logout()
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("blog:post_list"))
+        self.assertEqual(response.context["trending_posts"][0].id, liked_post.id)
+
+    def test_comment_moves_trending_when_moderation_approves_it(self):
+        from .services.trending import COMMENT_WEIGHT
+
+        post = Post.published.get(slug="post-1")
+        with patch("blog.signals.bump_trending") as bump_mock:
+            comment = post.comments.create(user=self.user, body="Held for review", approved=False)
+            comment.body = "Edited while held"
+            comment.save()
+            bump_mock.assert_not_called()
+
+            comment.approved = True
+            comment.save()
+            comment.body = "Edited after approval"
+            comment.save()
+            comment.approved = False
+            comment.save()
+
+        self.assertEqual(
+            [call.args for call in bump_mock.call_args_list], [(post.id, COMMENT_WEIGHT), (post.id, -COMMENT_WEIGHT)]
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+
+    @override_settings(HOMEPAGE_SECTIONS_DEBOUNCE_SECONDS=30)
+    def test_homepage_section_refreshes_are_debounced_in_both_modes(self):
+        posts = list(Post.published.order_by("id")[:3])
+        self.client.force_login(self.user)
+
+        cache.clear()
+        with override_settings(HOMEPAGE_SECTIONS_REFRESH_MODE="inline"), patch(
+            "blog.tasks.rebuild_homepage_sections"
+        ) as rebuild_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                for post in posts:
+                    self.client.post(reverse("blog:post_like", args=[post.id]))
+        rebuild_mock.assert_called_once_with(release=False)
+
+        cache.clear()
+        with patch("blog.tasks.refresh_homepage_sections.apply_async") as apply_async_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                for post in posts:
+                    self.client.post(reverse("blog:post_like", args=[post.id]))
+        apply_async_mock.assert_called_once_with(countdown=30)
+
+    def test_homepage_section_refresh_falls_back_inline_when_the_broker_is_down(self):
+        posts = list(Post.published.order_by("id")[:2])
+        self.client.force_login(self.user)
+        cache.clear()
+
+        with patch(
+            "blog.tasks.refresh_homepage_sections.apply_async",
+            side_effect=OperationalError("Error 111 connecting to 127.0.0.1:6379. Connection refused."),
+        ) as apply_async_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse("blog:post_like", args=[posts[1].id]))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(posts[1].id, cache.get(HOMEPAGE_SECTIONS_KEY)["trending"])
+            self.assertTrue(cache.get(HOMEPAGE_SECTIONS_PENDING_KEY))
+
+            # The claim outlives the fallback rebuild, so the next write inside the window skips the broker.
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.client.post(reverse("blog:post_like", args=[posts[0].id])).status_code, 200)
+        apply_async_mock.assert_called_once()
+
+    @override_settings(PAGE_CACHE_ENABLED=True, PAGE_CACHE_SECONDS=30, PAGE_CACHE_STALE_SECONDS=120)
+    def test_anonymous_pages_are_microcached_and_invalidated_by_tags(self):
+        cache.clear()
+        post = Post.published.get(slug="post-1")
+        url = post.get_absolute_url()
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "miss")
+        with self.assertNumQueries(0):
+            hit = self.client.get(url)
+        self.assertEqual(hit["X-Page-Cache"], "hit")
+        self.assertContains(hit, 'name="csrfmiddlewaretoken"')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.comments.create(user=self.user, body="Fresh take on the story", approved=True)
+        revalidated = self.client.get(url)
+        self.assertEqual(revalidated["X-Page-Cache"], "miss")
+        self.assertContains(revalidated, "Fresh take on the story")
+
+        # While another request holds the revalidate lock, everyone else is served the stale copy.
+        invalidate_page_tags(f"post:{post.id}")
+        cache.add(f"{page_entry_key(RequestFactory().get(url))}:revalidate", 1)
+        with self.assertNumQueries(0):
+            stale = self.client.get(url)
+        self.assertEqual(stale["X-Page-Cache"], "stale")
+
+        self.client.force_login(self.user)
+        self.assertFalse(self.client.get(url).has_header("X-Page-Cache"))
+
+    def test_engagement_counters_follow_writes_and_reconcile_repairs_drift(self):
+        post = Post.published.get(slug="post-1")
+        self.client.force_login(self.user)
+        liked = self.client.post(reverse("blog:post_like", args=[post.id]))
+        bookmarked = self.client.post(reverse("blog:post_bookmark", args=[post.id]))
+        self.assertEqual(liked.json()["count"], 1)
+        self.assertEqual(bookmarked.json()["count"], 1)
+        comment = post.comments.create(user=self.user, body="Counted", approved=True)
+        post.comments.create(user=self.user, body="Held for review", approved=False)
+        post.refresh_from_db()
+        self.assertEqual((post.like_count, post.comment_count, post.bookmark_count), (1, 1, 1))
+
+        comment.approved = False
+        comment.save(update_fields=["approved"])
+        self.assertEqual(self.client.post(reverse("blog:post_like", args=[post.id])).json()["count"], 0)
+        post.refresh_from_db()
+        self.assertEqual((post.like_count, post.comment_count), (0, 0))
+
+        Post.objects.filter(pk=post.pk).update(like_count=40, bookmark_count=0)
+        output = StringIO()
+        call_command("reconcile_engagement_counters", stdout=output)
+        self.assertIn("1 posts repaired", output.getvalue())
+        post.refresh_from_db()
+        self.assertEqual((post.like_count, post.comment_count, post.bookmark_count), (0, 0, 1))
+
+        from .views import digest_posts_queryset
+
+        with CaptureQueriesContext(connection) as queries:
+            digest = digest_posts_queryset(hours=24 * 365)
+        self.assertTrue(digest)
+        self.assertFalse(any("blog_like" in query["sql"] for query in queries.captured_queries))
+
+    def test_trending_forward_decay_matches_lazy_decay(self):
+        now = timezone.now()
+        stored = forward_weight(10, now - timedelta(days=14)) + forward_weight(4, now)
+        self.assertAlmostEqual(current_score(stored, now), 10 * math.exp(-1) + 4, places=6)
+
+    def test_click_rollups_survive_cache_loss_and_feed_ranking(self):
+        cache.clear()
+        post_sources.invalidate()
+        post = Post.published.get(slug="post-1")
+        url = reverse("blog:track_post_click")
+        for index, placement in enumerate(("feed", "feed", "hero")):
+            self.client.post(url, {"post_id": post.id, "placement": placement}, REMOTE_ADDR=f"10.0.0.{index}")
+
+        result = rollup_click_analytics()
+        cache.clear()
+        self.client.post(url, {"post_id": post.id, "placement": "feed"})
+        with self.assertNumQueries(6):
+            # Live-post check, then insert-missing, re-read and one bulk UPDATE inside a savepoint.
+            flush_click_rollups()
+
+        self.assertEqual(result["flushed"], 3)
+        self.assertEqual(
+            dict(ClickDaily.objects.filter(post=post).values_list("placement", "count")),
+            {"feed": 3, "hero": 1},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.click_score, 3.0)
+        self.assertEqual(post.source_article.source.click_score, 3.0)
+
+    def test_click_rollups_drain_the_shared_tally_and_restore_it_on_failure(self):
+        cache.clear()
+        post = Post.published.get(slug="post-1")
+        today = timezone.localdate()
+        # Another web worker's clicks only ever reach this process through the shared cache.
+        write_many(tallies={pending_rollup_key(): {f"{post.id}::feed:{today.isoformat()}": 4}})
+        record_click(post.id, None, "feed")
+
+        with patch("blog.services.click_rollups.upsert_click_rollups", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                flush_click_rollups()
+        self.assertEqual(flush_click_rollups(), 5)
+        self.assertEqual(flush_click_rollups(), 0)
+        self.assertEqual(ClickDaily.objects.get(post=post, placement="feed", date=today).count, 5)
+
+    def test_repeat_clicks_from_one_reader_count_once_in_ranking(self):
+        cache.clear()
+        post_sources.invalidate()
+        repeated = Post.published.get(slug="post-1")
+        spread = Post.published.get(slug="post-2")
+        refresh_click_scores()
+        url = reverse("blog:track_post_click")
+        for _ in range(5):
+            self.client.post(url, {"post_id": repeated.id, "placement": "feed"}, REMOTE_ADDR="10.1.0.1")
+        for index in range(3):
+            self.client.post(url, {"post_id": spread.id, "placement": "feed"}, REMOTE_ADDR=f"10.2.0.{index}")
+
+        self.assertEqual(cache.get(click_key("post", repeated.id, "total")), 5)
+        self.assertEqual(unique_readers("post", [repeated.id, spread.id]), {repeated.id: 1, spread.id: 3})
+        self.assertEqual(trending_post_ids(1), [spread.id])
+
+        flush_click_rollups()
+        refresh_click_scores()
+        repeated.refresh_from_db()
+        spread.refresh_from_db()
+        self.assertEqual(repeated.click_score, 1.0)
+        self.assertEqual(spread.click_score, 3.0)
+
+    def test_click_endpoints_reject_a_post_as_soon_as_it_is_unpublished(self):
+        cache.clear()
+        post_sources.invalidate()
+        post = Post.published.get(slug="post-1")
+        url = reverse("blog:track_post_click")
+        self.assertEqual(self.client.post(url, {"post_id": post.id, "placement": "feed"}).status_code, 200)
+
+        post.status = Post.Status.DRAFT
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save(update_fields=["status", "updated"])
+
+        self.assertEqual(self.client.post(url, {"post_id": post.id, "placement": "feed"}).status_code, 404)
+        batch = self.client.post(
+            reverse("blog:track_post_clicks_batch"),
+            data=json.dumps([{"post_id": post.id, "placement": "feed"}]),
+            content_type="application/json",
+        )
+        self.assertEqual(batch.json()["rejected"], 1)
+
+    def test_click_batch_accepts_json_and_gzip_beacons(self):
+        cache.clear()
+        post_sources.invalidate()
+        post = Post.published.get(slug="post-1")
+        url = reverse("blog:track_post_clicks_batch")
+        ts = int(timezone.now().timestamp() * 1000)
+        events = [
+            {"post_id": post.id, "placement": "feed", "ts": ts},
+            {"post_id": post.id, "placement": "hero", "ts": ts},
+            {"post_id": 999999, "placement": "feed"},
+            {"placement": "feed"},
+        ]
+        response = self.client.post(url, data=json.dumps(events), content_type="application/json")
+        self.assertEqual(response.json(), {"tracked": True, "accepted": 2, "rejected": 2})
+
+        # Map is warm now: validating and writing a batch costs no queries.
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                url,
+                data=gzip.compress(json.dumps({"events": events[:1]}).encode("utf-8")),
+                content_type="application/json",
+                HTTP_CONTENT_ENCODING="gzip",
+            )
+        self.assertEqual(response.json()["accepted"], 1)
+        self.assertEqual(cache.get(click_key("post", post.id, "total")), 3)
+        self.assertEqual(cache.get(click_key("post", post.id, "placement:hero")), 1)
+        self.assertEqual(unique_readers("post", [post.id]), {post.id: 1})
+        self.assertEqual(sum(drain_tally(pending_rollup_key()).values()), 3)
+
+        self.assertEqual(self.client.post(url, data="not json", content_type="application/json").status_code, 400)
+        bomb = gzip.compress(b"[" + b" " * 200000 + b"]")
+        self.assertEqual(self.client.post(url, data=bomb, content_type="application/json").status_code, 400)
+
+    def test_hyperloglog_estimates_within_fixed_size(self):
+        sketch = HyperLogLog()
+        for index in range(20000):
+            sketch.add(f"reader-{index}")
+        self.assertEqual(len(sketch.to_bytes()), 2048)
+        self.assertLess(abs(sketch.count() - 20000) / 20000, 0.05)
+
+        other = HyperLogLog.from_bytes(sketch.to_bytes())
+        self.assertFalse(other.add("reader-1"))
+        other.merge(HyperLogLog.from_bytes(None))
+        self.assertEqual(other.count(), sketch.count())
+
+    def test_placement_rollups_aggregate_daily_clicks_for_dashboard(self):
+        first = Post.published.get(slug="post-1")
+        second = Post.published.get(slug="post-2")
+        today = timezone.localdate()
+        ClickDaily.objects.create(post=first, placement="trending-card-title", date=today, count=6)
+        ClickDaily.objects.create(post=second, placement="trending-card-title", date=today, count=3)
+        ClickDaily.objects.create(post=first, placement="card-image", date=today - timedelta(days=1), count=1)
+        ClickDaily.objects.create(post=first, placement="card-image", date=today - timedelta(days=20), count=50)
+
+        self.assertEqual(rollup_click_analytics()["placement_rows"], 2)
+        self.assertEqual(
+            PlacementDaily.objects.get(placement="trending-card-title", date=today).posts,
+            2,
+        )
+
+        summary = placement_summary(days=14)
+        self.assertEqual([entry["placement"] for entry in summary["placements"]], ["trending-card-title", "card-image"])
+        self.assertEqual(summary["total_clicks"], 10)
+        self.assertEqual(summary["placements"][0]["share"], 0.9)
+
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse("blog:analytics_dashboard"))
+        self.assertContains(response, "trending-card-title")
+
     def test_search_mode_disables_in_feed_ad_guardrail(self):
         response = self.client.get(reverse("blog:post_list"), {"q": "Post"})
         self.assertEqual(response.status_code, 200)
@@ -915,6 +1928,7 @@ class SeoAndHomepageTests(TestCase):
 
     def test_click_tracking_endpoint_records_counts(self):
         cache.clear()
+        post_sources.invalidate()
         post = Post.published.get(slug="post-1")
         post.source_article.source.trust_score = 80
         post.source_article.source.save(update_fields=["trust_score", "updated"])
@@ -927,11 +1941,83 @@ class SeoAndHomepageTests(TestCase):
         self.assertEqual(response.json()["total_clicks"], 1)
         self.assertEqual(response.json()["source_clicks"], 1)
 
-        key = f"analytics:clicks:post:{post.id}:placement:card-title"
+        key = click_key("post", post.id, "placement:card-title")
         self.assertEqual(cache.get(key), 1)
-        source_key = f"analytics:clicks:source:{post.source_article.source_id}:total"
+        source_key = click_key("source", post.source_article.source_id, "total")
         self.assertEqual(cache.get(source_key), 1)
 
+    def test_click_tracking_skips_database_once_post_map_is_warm(self):
+        cache.clear()
+        post_sources.invalidate()
+        post = Post.published.get(slug="post-1")
+        url = reverse("blog:track_post_click")
+        self.client.post(url, {"post_id": post.id, "placement": "card"})
+
+        with self.assertNumQueries(0):
+            response = self.client.post(url, {"post_id": post.id, "placement": "card"})
+            missing = self.client.post(url, {"post_id": 999999, "placement": "card"})
+
+        self.assertEqual(response.json()["total_clicks"], 2)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_click_tracking_counts_concurrent_clicks_exactly(self):
+        cache.clear()
+        post = Post.published.get(slug="post-1")
+        source_id = post.source_article.source_id
+
+        def click():
+            for _ in range(25):
+                record_click(post.id, source_id, "feed")
+
+        workers = [threading.Thread(target=click) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(cache.get(click_key("post", post.id, "total")), 100)
+        self.assertEqual(cache.get(click_key("source", source_id, "placement:feed")), 100)
+
+    @override_settings(CLICK_BUFFER_ENABLED=True, CLICK_BUFFER_MAX_EVENTS=1000, CLICK_BUFFER_FLUSH_SECONDS=60)
+    def test_click_tracking_buffers_until_flush(self):
+        cache.clear()
+        click_buffer.flush()
+        post_sources.invalidate()
+        post = Post.published.get(slug="post-1")
+
+        for _ in range(3):
+            response = self.client.post(reverse("blog:track_post_click"), {"post_id": post.id, "placement": "hero"})
+            self.assertTrue(response.json()["buffered"])
+
+        self.assertIsNone(cache.get(click_key("post", post.id, "total")))
+        self.assertEqual(click_buffer.flush(), 3)
+        self.assertEqual(cache.get(click_key("post", post.id, "total")), 3)
+        self.assertEqual(cache.get(click_key("post", post.id, "placement:hero")), 3)
+        self.assertEqual(flush_click_rollups(), 3)
+
+    @override_settings(CLICK_BUFFER_ENABLED=True, CLICK_BUFFER_MAX_EVENTS=1000, CLICK_BUFFER_FLUSH_SECONDS=60)
+    def test_buffered_clicks_check_the_shared_reader_sketch_before_trending(self):
+        from .services.cache_store import clear_ranked, top_ranked
+        from .services.click_tracking import readers_key, record_clicks
+        from .services.trending import TRENDING_KEY
+
+        cache.clear()
+        click_buffer.flush()
+        clear_ranked([TRENDING_KEY])
+        seen = Post.published.get(slug="post-1")
+        unseen = Post.published.get(slug="post-2")
+        # Another worker already recorded this reader on `seen` today and flushed.
+        write_many(unique={readers_key("post", seen.id): ["reader-a"]})
+
+        record_click(seen.id, None, "feed", reader="reader-a")
+        record_clicks([(seen.id, None, "feed", timezone.now()), (unseen.id, None, "feed", timezone.now())], "reader-a")
+        click_buffer.flush()
+
+        trending = dict(top_ranked(TRENDING_KEY, 10))
+        self.assertNotIn(str(seen.id), trending)
+        self.assertIn(str(unseen.id), trending)
+        self.assertEqual(cache.get(click_key("post", seen.id, "total")), 2)
+
     def test_bookmark_toggle_endpoint_creates_and_removes(self):
         post = Post.published.get(slug="post-1")
         self.client.force_login(self.user)
@@ -1087,8 +2173,16 @@ class SeoAndHomepageTests(TestCase):
         cache.clear()
         post = Post.published.get(slug="post-1")
         source = post.source_article.source
-        cache.set(f"analytics:clicks:post:{post.id}:total", 13, timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:total", 42, timeout=60 * 60)
+        reset_click_analytics()
+        self.addCleanup(reset_click_analytics)
+        write_many(
+            increments={
+                click_key("post", post.id, "total"): 13,
+                click_key("source", source.id, "total"): 42,
+            },
+            ranked={top_clicked_key("post"): {post.id: 13}, top_clicked_key("source"): {source.id: 42}},
+            timeout=60 * 60,
+        )
 
         self.client.force_login(self.staff_user)
         response = self.client.get(reverse("blog:analytics_dashboard"))
@@ -1097,6 +2191,54 @@ class SeoAndHomepageTests(TestCase):
         self.assertContains(response, "13")
         self.assertContains(response, source.name)
         self.assertContains(response, "42")
+        self.assertEqual(response.context["top_posts"][0]["post"], post)
+        self.assertEqual(response.context["top_sources"][0]["source"], source)
+
+    def test_analytics_dashboard_query_count_does_not_grow_with_posts(self):
+        cache.clear()
+        reset_click_analytics()
+        self.addCleanup(reset_click_analytics)
+        self.client.force_login(self.staff_user)
+        self.client.get(reverse("blog:analytics_dashboard"))
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(reverse("blog:analytics_dashboard"))
+
+        category = Category.objects.first()
+        Post.objects.bulk_create(
+            Post(
+                title=f"Bulk analytics {index}",
+                slug=f"bulk-analytics-{index}",
+                author=self.staff_user,
+                body="Body",
+                category=category,
+                status=Post.Status.PUBLISHED,
+                publish=timezone.now(),
+            )
+            for index in range(40)
+        )
+        for index, post in enumerate(Post.published.filter(slug__startswith="bulk-analytics-")):
+            for _ in range(index % 3 + 1):
+                record_click(post.id, None, "feed")
+
+        with CaptureQueriesContext(connection) as grown:
+            response = self.client.get(reverse("blog:analytics_dashboard"))
+
+        self.assertEqual(len(grown), len(baseline))
+        clicks = [item["clicks"] for item in response.context["top_posts"]]
+        self.assertEqual(clicks, sorted(clicks, reverse=True))
+        self.assertEqual(clicks[0], 3)
+
+    def test_local_top_k_keeps_heavy_hitters_within_capacity(self):
+        ranking = LocalTopK(capacity=5, width=256)
+        for member in range(200):
+            ranking.add(str(member), 1)
+        for member in ("7", "42", "99"):
+            ranking.add(member, 50)
+
+        top = ranking.top(3)
+        self.assertEqual({member for member, _ in top}, {"7", "42", "99"})
+        self.assertTrue(all(score >= 51 for _, score in top))
+        self.assertEqual(len(ranking.top(10)), 5)
 
     def test_analytics_dashboard_requires_staff(self):
         response = self.client.get(reverse("blog:analytics_dashboard"))
@@ -1106,13 +2248,14 @@ class SeoAndHomepageTests(TestCase):
         response = self.client.post(reverse("blog:run_manual_pipeline"), {"action": "full"})
         self.assertEqual(response.status_code, 302)
 
+    @override_settings(PIPELINE_JOB_MODE="inline")
     def test_manual_pipeline_endpoint_runs_full_action_for_staff(self):
         self.client.force_login(self.staff_user)
 
-        with patch("blog.views.fetch_all_active_sources", return_value={"status": "ok", "sources": 1}) as fetch_mock, patch(
-            "blog.views.summarize_pending_articles", return_value={"status": "ok", "summarized": 3}
+        with patch("blog.tasks.fetch_all_active_sources", return_value={"status": "ok", "sources": 1}) as fetch_mock, patch(
+            "blog.tasks.summarize_pending_articles", return_value={"status": "ok", "summarized": 3}
         ) as summarize_mock, patch(
-            "blog.views.auto_publish_trusted_articles", return_value={"status": "ok", "published": 2, "reviewed": 1}
+            "blog.tasks.auto_publish_trusted_articles", return_value={"status": "ok", "published": 2, "reviewed": 1}
         ) as publish_mock:
             response = self.client.post(
                 reverse("blog:run_manual_pipeline"),
@@ -1133,13 +2276,16 @@ class SeoAndHomepageTests(TestCase):
         dashboard = self.client.get(reverse("blog:analytics_dashboard"))
         self.assertEqual(dashboard.status_code, 200)
         self.assertContains(dashboard, "Last Manual Run")
+        self.assertContains(dashboard, "Pipeline Job")
+        self.assertContains(dashboard, "(3/3 steps)")
 
+    @override_settings(PIPELINE_JOB_MODE="inline")
     def test_manual_pipeline_endpoint_runs_single_action_for_staff(self):
         self.client.force_login(self.staff_user)
 
-        with patch("blog.views.fetch_all_active_sources") as fetch_mock, patch(
-            "blog.views.summarize_pending_articles", return_value={"status": "ok", "summarized": 5}
-        ) as summarize_mock, patch("blog.views.auto_publish_trusted_articles") as publish_mock:
+        with patch("blog.tasks.fetch_all_active_sources") as fetch_mock, patch(
+            "blog.tasks.summarize_pending_articles", return_value={"status": "ok", "summarized": 5}
+        ) as summarize_mock, patch("blog.tasks.auto_publish_trusted_articles") as publish_mock:
             response = self.client.post(
                 reverse("blog:run_manual_pipeline"),
                 {
@@ -1153,6 +2299,36 @@ class SeoAndHomepageTests(TestCase):
         fetch_mock.assert_not_called()
         publish_mock.assert_not_called()
 
+    def test_manual_pipeline_endpoint_returns_before_steps_run(self):
+        self.client.force_login(self.staff_user)
+
+        with patch("blog.tasks.run_pipeline_job.apply_async") as apply_async_mock, patch(
+            "blog.tasks.fetch_all_active_sources"
+        ) as fetch_mock:
+            response = self.client.post(reverse("blog:run_manual_pipeline"), {"action": "fetch"})
+
+        self.assertEqual(response.status_code, 302)
+        fetch_mock.assert_not_called()
+        job_id = apply_async_mock.call_args.kwargs["kwargs"]["job_id"]
+        status_response = self.client.get(reverse("blog:pipeline_job_status", args=[job_id]))
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.json()["status"], "queued")
+        self.assertEqual(status_response.json()["progress"]["total_steps"], 1)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True, PIPELINE_JOB_MODE="celery")
+    def test_manual_pipeline_endpoint_uses_a_thread_when_celery_is_eager(self):
+        self.client.force_login(self.staff_user)
+
+        with patch("blog.tasks.run_pipeline_job.apply_async") as apply_async_mock, patch(
+            "blog.tasks._run_pipeline_job_in_thread"
+        ) as thread_mock, patch("blog.tasks.fetch_all_active_sources") as fetch_mock:
+            response = self.client.post(reverse("blog:run_manual_pipeline"), {"action": "fetch"})
+
+        self.assertEqual(response.status_code, 302)
+        apply_async_mock.assert_not_called()
+        fetch_mock.assert_not_called()
+        thread_mock.assert_called_once()
+
     @override_settings(ANALYTICS_RETENTION_DAYS=14)
     def test_analytics_dashboard_shows_retention_policy(self):
         self.client.force_login(self.staff_user)
@@ -1192,20 +2368,54 @@ class SeoAndHomepageTests(TestCase):
         cache.clear()
         post = Post.published.get(slug="post-1")
         source = post.source_article.source
-        cache.set(f"analytics:clicks:post:{post.id}:total", 7, timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:total", 19, timeout=60 * 60)
+        cache.set(click_key("post", post.id, "total"), 7, timeout=60 * 60)
+        cache.set(click_key("source", source.id, "total"), 19, timeout=60 * 60)
 
         self.client.force_login(self.staff_user)
         response = self.client.get(reverse("blog:analytics_export_csv"))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "text/csv")
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("type,id,title_or_name,clicks,source_clicks,publish_or_updated,meta", content)
         self.assertIn(post.title, content)
         self.assertIn(source.name, content)
         self.assertIn("7", content)
         self.assertIn("19", content)
 
+    @override_settings(ANALYTICS_EXPORT_CHUNK_SIZE=100)
+    def test_analytics_export_streams_ndjson_in_chunks(self):
+        cache.clear()
+        category = Category.objects.first()
+        Post.objects.bulk_create(
+            Post(
+                title=f"Export bulk {index}",
+                slug=f"export-bulk-{index}",
+                author=self.staff_user,
+                body="Body",
+                category=category,
+                status=Post.Status.PUBLISHED,
+                publish=timezone.now(),
+            )
+            for index in range(250)
+        )
+        post = Post.published.get(slug="export-bulk-7")
+        cache.set(click_key("post", post.id, "total"), 5, timeout=60 * 60)
+
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse("blog:analytics_export_csv"), {"output": "ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="analytics-dashboard.ndjson"', response["Content-Disposition"])
+        with patch("blog.services.analytics_export.read_many", wraps=read_many) as batched_reads:
+            rows = [json.loads(line) for line in b"".join(response.streaming_content).decode("utf-8").splitlines()]
+
+        post_rows = [row for row in rows if row["type"] == "post"]
+        self.assertEqual(len(post_rows), Post.published.count())
+        self.assertEqual(next(row for row in post_rows if row["id"] == post.id)["clicks"], 5)
+        self.assertTrue(any(row["type"] == "source" for row in rows))
+        self.assertEqual(batched_reads.call_count, 4)
+
     def test_analytics_export_trending_snapshot_is_staff_only(self):
         response = self.client.get(reverse("blog:analytics_export_trending_snapshot"))
         self.assertEqual(response.status_code, 302)
@@ -1215,14 +2425,14 @@ class SeoAndHomepageTests(TestCase):
         post = Post.published.get(slug="post-1")
         post.likes.create(user=self.user)
         post.comments.create(user=self.user, body="Good", approved=True)
-        cache.set(f"analytics:clicks:post:{post.id}:total", 14, timeout=60 * 60)
-        cache.set(f"analytics:clicks:post:{post.id}:last_seen", timezone.now(), timeout=60 * 60)
+        cache.set(click_key("post", post.id, "total"), 14, timeout=60 * 60)
+        cache.set(click_key("post", post.id, "last_seen"), timezone.now(), timeout=60 * 60)
 
         self.client.force_login(self.staff_user)
         response = self.client.get(reverse("blog:analytics_export_trending_snapshot"))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "text/csv")
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("rank,post_id,title,score,likes,comments,post_clicks,source_clicks,freshness_bonus,source_name,publish_date", content)
         self.assertIn(post.title, content)
 
@@ -1237,36 +2447,84 @@ class SeoAndHomepageTests(TestCase):
         cache.clear()
         post = Post.published.get(slug="post-1")
         source = post.source_article.source
-        cache.set(f"analytics:clicks:post:{post.id}:total", 8, timeout=60 * 60)
-        cache.set(f"analytics:clicks:post:{post.id}:last_seen", timezone.now(), timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:total", 21, timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:last_seen", timezone.now(), timeout=60 * 60)
+        cache.set(click_key("post", post.id, "total"), 8, timeout=60 * 60)
+        cache.set(click_key("post", post.id, "last_seen"), timezone.now(), timeout=60 * 60)
+        cache.set(click_key("source", source.id, "total"), 21, timeout=60 * 60)
+        cache.set(click_key("source", source.id, "last_seen"), timezone.now(), timeout=60 * 60)
+        cache.set(click_key("post", post.id, "placement:hero"), 3, timeout=60 * 60)
+
+        ClickDaily.objects.create(post=post, source=source, placement="hero", date=timezone.localdate(), count=3)
 
         _clear_post_click_metrics(post.id)
         _clear_source_click_metrics(source.id)
 
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{post.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{post.id}:last_seen"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{source.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{source.id}:last_seen"))
+        self.assertFalse(ClickDaily.objects.filter(post=post).exists())
+
+        self.assertIsNone(cache.get(click_key("post", post.id, "total")))
+        self.assertIsNone(cache.get(click_key("post", post.id, "last_seen")))
+        self.assertIsNone(cache.get(click_key("post", post.id, "placement:hero")))
+        self.assertIsNone(cache.get(click_key("source", source.id, "total")))
+        self.assertIsNone(cache.get(click_key("source", source.id, "last_seen")))
+
+    def test_per_post_click_reset_rescores_only_the_affected_rows(self):
+        cache.clear()
+        cleared = Post.published.get(slug="post-1")
+        source = cleared.source_article.source
+        kept = Post.published.exclude(pk=cleared.pk).first()
+        today = timezone.localdate()
+        ClickDaily.objects.create(post=cleared, source=source, placement="feed", date=today, count=3)
+        ClickDaily.objects.create(post=kept, source=source, placement="feed", date=today, count=2)
+        refresh_click_scores()
+
+        with patch("blog.services.click_rollups.refresh_trending_scores") as trending_mock, patch(
+            "blog.services.click_rollups.count_unique", return_value={}
+        ) as count_unique_mock:
+            _clear_post_click_metrics(cleared.id)
+
+        trending_mock.assert_not_called()
+        # Unique readers are read for the affected source's remaining rows only.
+        self.assertEqual(
+            {pair for call in count_unique_mock.call_args_list for pair in call.args[0]}, {(kept.id, today)}
+        )
+        cleared.refresh_from_db()
+        kept.refresh_from_db()
+        source.refresh_from_db()
+        self.assertEqual((cleared.click_score, kept.click_score, source.click_score), (0, 2.0, 2.0))
+        self.assertEqual(PlacementDaily.objects.get(placement="feed", date=today).clicks, 2)
 
     def test_analytics_reset_all_clears_all_metrics(self):
         cache.clear()
         post = Post.published.get(slug="post-1")
         source = post.source_article.source
-        cache.set(f"analytics:clicks:post:{post.id}:total", 8, timeout=60 * 60)
-        cache.set(f"analytics:clicks:post:{post.id}:last_seen", timezone.now(), timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:total", 21, timeout=60 * 60)
-        cache.set(f"analytics:clicks:source:{source.id}:last_seen", timezone.now(), timeout=60 * 60)
+        cache.set(click_key("post", post.id, "total"), 8, timeout=60 * 60)
+        cache.set(click_key("post", post.id, "last_seen"), timezone.now(), timeout=60 * 60)
+        cache.set(click_key("source", source.id, "total"), 21, timeout=60 * 60)
+        cache.set(click_key("source", source.id, "last_seen"), timezone.now(), timeout=60 * 60)
+
+        unpublished = Post.published.get(slug="post-2")
+        cache.set(click_key("post", unpublished.id, "placement:feed"), 5, timeout=60 * 60)
+        Post.objects.filter(pk=unpublished.pk).update(status=Post.Status.DRAFT)
+        ClickDaily.objects.create(post=post, source=source, placement="feed", date=timezone.localdate(), count=8)
+        refresh_click_scores()
+        post.refresh_from_db()
+        self.assertGreater(post.click_score, 0)
 
         self.client.force_login(self.staff_user)
         response = self.client.post(reverse("blog:analytics_reset_all"), {"confirm": "yes"})
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.json()["reset"])
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{post.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:post:{post.id}:last_seen"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{source.id}:total"))
-        self.assertIsNone(cache.get(f"analytics:clicks:source:{source.id}:last_seen"))
+        self.assertFalse(ClickDaily.objects.exists())
+        post.refresh_from_db()
+        source.refresh_from_db()
+        self.assertEqual((post.click_score, source.click_score), (0, 0))
+        self.assertIsNone(cache.get(click_key("post", post.id, "total")))
+        self.assertIsNone(cache.get(click_key("post", post.id, "last_seen")))
+        self.assertIsNone(cache.get(click_key("post", unpublished.id, "placement:feed")))
+        self.assertIsNone(cache.get(click_key("source", source.id, "total")))
+        self.assertIsNone(cache.get(click_key("source", source.id, "last_seen")))
+
+        record_click(post.id, None, "feed")
+        self.assertEqual(cache.get(click_key("post", post.id, "total")), 1)
 
     @override_settings(ANALYTICS_RETENTION_DAYS=12)
     def test_report_analytics_retention_command_outputs_policy(self):
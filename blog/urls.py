@@ -15,12 +15,14 @@ urlpatterns = [
     path("bookmarks/", views.bookmarks_list, name="bookmarks_list"),
     path("newsletter/subscribe/", views.newsletter_subscribe, name="newsletter_subscribe"),
     path("analytics/click/", views.track_post_click, name="track_post_click"),
+    path("analytics/clicks/", views.track_post_clicks_batch, name="track_post_clicks_batch"),
     path("analytics/", views.analytics_dashboard, name="analytics_dashboard"),
     path("analytics/health.json", views.monitoring_health, name="monitoring_health"),
     path("analytics/launch-readiness.json", views.launch_readiness_health, name="launch_readiness_health"),
     path("analytics/export.csv", views.analytics_export_csv, name="analytics_export_csv"),
     path("analytics/reset/", views.analytics_reset_all, name="analytics_reset_all"),
     path("analytics/run-pipeline/", views.run_manual_pipeline, name="run_manual_pipeline"),
+    path("analytics/pipeline-jobs/<str:job_id>.json", views.pipeline_job_status, name="pipeline_job_status"),
     path("analytics/trending-snapshot.csv", views.analytics_export_trending_snapshot, name="analytics_export_trending_snapshot"),
     path("tag/<slug:tag_slug>/",views.PostListView.as_view(),name="post_list_by_tag"),
     path("tag/<slug:tag_slug>/social-image.svg", views.tag_social_image, name="tag_social_image"),
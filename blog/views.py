@@ -5,6 +5,7 @@ from django.db.models import Case, When, Value, IntegerField, F, ExpressionWrapp
 from django.http import HttpResponse, JsonResponse
 from django.core.cache import cache
 from django.views.generic import ListView
+from django.utils.decorators import method_decorator
 from .forms import CommentForm, EmailPostForm, NewsletterSubscriptionForm
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
@@ -15,17 +16,42 @@ from django.urls import reverse
 from django.utils import timezone
 from django.conf import settings
 from xml.sax.saxutils import escape
-from datetime import timedelta
-from math import exp
+from datetime import datetime, timedelta, timezone as dt_timezone
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
+import hashlib
 import json
-import csv
+import zlib
 
 from taggit.models import Tag
 from django.db.models import Count
+from blog.services.analytics_export import ANALYTICS_EXPORT_HEADER, analytics_rows, streaming_export
+from blog.services.cache_store import read_many
+from blog.services.click_rollups import clear_click_rollups, placement_summary
+from blog.services.click_tracking import (
+    click_key,
+    normalize_placement,
+    post_sources,
+    record_click,
+    record_clicks,
+    reset_click_analytics,
+    top_clicked,
+    unique_readers,
+)
+from blog.services.homepage_sections import homepage_sections, hydrate_homepage_sections
+from blog.services.keyset import keyset_page
 from blog.services.launch_readiness import compute_launch_readiness_checks
-from blog.tasks import fetch_all_active_sources, summarize_pending_articles, auto_publish_trusted_articles
+from blog.services.page_cache import cache_anonymous_page, tag_page
+from blog.services.pipeline_jobs import get_job as get_pipeline_job, job_progress
+from blog.services.task_locks import lock_keys, lock_state
+from blog.services.task_metrics import summarize_task_metrics, task_metric_keys
+from blog.services.trending import (
+    LIKE_WEIGHT,
+    bump_trending,
+    freshness_bonus,
+    homepage_score,
+)
+from blog.tasks import enqueue_pipeline_job
 
 
 MONITORED_TASKS = [
@@ -34,6 +60,10 @@ MONITORED_TASKS = [
     'summarize_pending_articles',
     'auto_publish_trusted_articles',
     'rollback_auto_published_posts',
+    'summarize_ingested_article',
+    'publish_summarized_article',
+    'rollup_click_analytics',
+    'refresh_homepage_sections',
 ]
 
 
@@ -105,65 +135,24 @@ def _tag_social_image_url(request, tag):
 
 
 def _post_freshness_bonus(post):
-    age_days = max(0, (timezone.now() - post.publish).days)
-    if age_days <= 7:
-        return 12
-    if age_days <= 30:
-        return 6
-    return 0
-
-
-def _source_click_totals(posts):
-    source_ids = {
-        post.source_article.source_id
-        for post in posts
-        if post.source_article_id and post.source_article and post.source_article.source_id
-    }
-    return {
-        source_id: int(cache.get(f'analytics:clicks:source:{source_id}:total', 0))
-        for source_id in source_ids
-    }
-
-
-def _source_click_signal(source_id):
-    total = int(cache.get(f'analytics:clicks:source:{source_id}:total', 0))
-    last_seen = cache.get(f'analytics:clicks:source:{source_id}:last_seen')
-    if not total or not last_seen:
-        return total
+    return freshness_bonus(post.publish)
 
-    age_days = max(0.0, (timezone.now() - last_seen).total_seconds() / 86400.0)
-    half_life_days = 14.0
-    decay = exp(-age_days / half_life_days)
-    return total * decay
 
-
-def _post_click_signal(post_id):
-    total = int(cache.get(f'analytics:clicks:post:{post_id}:total', 0))
-    last_seen = cache.get(f'analytics:clicks:post:{post_id}:last_seen')
-    if not total or not last_seen:
-        return total
-
-    age_days = max(0.0, (timezone.now() - last_seen).total_seconds() / 86400.0)
-    half_life_days = 14.0
-    decay = exp(-age_days / half_life_days)
-    return total * decay
+def _source_click_score(post):
+    # Decay-weighted clicks precomputed from the ClickDaily rollups by rollup_click_analytics.
+    if post.source_article_id and post.source_article and post.source_article.source_id:
+        return post.source_article.source.click_score
+    return 0
 
 
 def _rank_homepage_posts(posts):
     def score(post):
-        source_id = None
-        if post.source_article_id and post.source_article and post.source_article.source_id:
-            source_id = post.source_article.source_id
-        source_clicks = _source_click_signal(source_id) if source_id else 0
-        post_clicks = _post_click_signal(post.id)
-        like_count = getattr(post, 'like_count', 0)
-        comment_count = getattr(post, 'comment_count', 0)
-        return (
-            like_count * 5
-            + comment_count * 3
-            + post_clicks * 4
-            + source_clicks * 2
-            + _post_freshness_bonus(post)
+        return homepage_score(
+            getattr(post, 'like_count', 0),
+            getattr(post, 'comment_count', 0),
+            post.click_score,
+            _source_click_score(post),
+            post.publish,
         )
 
     ranked = sorted(posts, key=lambda post: (score(post), post.publish), reverse=True)
@@ -171,15 +160,12 @@ def _rank_homepage_posts(posts):
 
 
 def _home_feed_score(post):
-    source_id = None
-    if post.source_article_id and post.source_article and post.source_article.source_id:
-        source_id = post.source_article.source_id
-    source_clicks = _source_click_signal(source_id) if source_id else 0
-    post_clicks = _post_click_signal(post.id)
+    source_clicks = _source_click_score(post)
+    post_clicks = post.click_score
     like_count = getattr(post, 'like_count', 0)
     comment_count = getattr(post, 'comment_count', 0)
     freshness = _post_freshness_bonus(post)
-    total = like_count * 5 + comment_count * 3 + post_clicks * 4 + source_clicks * 2 + freshness
+    total = homepage_score(like_count, comment_count, post_clicks, source_clicks, post.publish)
     return {
         'like_count': like_count,
         'comment_count': comment_count,
@@ -190,21 +176,9 @@ def _home_feed_score(post):
     }
 
 
-def _cached_click_count(key_prefix, obj_id):
-    return int(cache.get(f'{key_prefix}:{obj_id}:total', 0))
-
-
 def _clear_all_analytics_metrics():
-    post_ids = Post.published.values_list('id', flat=True)
-    source_ids = NewsSource.objects.filter(is_active=True).values_list('id', flat=True)
-
-    for post_id in post_ids:
-        cache.delete(f'analytics:clicks:post:{post_id}:total')
-        cache.delete(f'analytics:clicks:post:{post_id}:last_seen')
-
-    for source_id in source_ids:
-        cache.delete(f'analytics:clicks:source:{source_id}:total')
-        cache.delete(f'analytics:clicks:source:{source_id}:last_seen')
+    reset_click_analytics()
+    clear_click_rollups()
 
 
 def _analytics_retention_seconds():
@@ -212,22 +186,18 @@ def _analytics_retention_seconds():
     return retention_days * 24 * 60 * 60
 
 
-def _retention_summary(posts, sources):
-    now = timezone.now()
-    post_last_seen = []
-    source_last_seen = []
+RETENTION_READ_CHUNK = 500
 
-    for post in posts:
-        ts = cache.get(f'analytics:clicks:post:{post.id}:last_seen')
-        if ts:
-            post_last_seen.append(ts)
 
-    for source in sources:
-        ts = cache.get(f'analytics:clicks:source:{source.id}:last_seen')
-        if ts:
-            source_last_seen.append(ts)
+def _retention_summary(post_ids, source_ids):
+    now = timezone.now()
+    keys = [click_key('post', post_id, 'last_seen') for post_id in post_ids]
+    keys.extend(click_key('source', source_id, 'last_seen') for source_id in source_ids)
+
+    all_last_seen = []
+    for start in range(0, len(keys), RETENTION_READ_CHUNK):
+        all_last_seen.extend(ts for ts in read_many(keys[start:start + RETENTION_READ_CHUNK]).values() if ts)
 
-    all_last_seen = post_last_seen + source_last_seen
     oldest_days = None
     newest_days = None
     if all_last_seen:
@@ -241,24 +211,131 @@ def _retention_summary(posts, sources):
     }
 
 
-def _monitoring_snapshot(task_name):
+def _post_source_id(post):
+    return post.source_article.source_id if post.source_article_id and post.source_article and post.source_article.source_id else 0
+
+
+def _top_clicked_posts(limit=10):
+    # Candidates come from the incremental ranking; exact totals are then read in one batch and re-sorted.
+    # Fewer than `limit` tracked posts are padded with the newest ones, as the full listing used to show.
+    posts_by_id = Post.published.select_related('source_article__source').in_bulk(top_clicked('post', limit * 2))
+    posts = list(posts_by_id.values())
+    if len(posts) < limit:
+        posts.extend(
+            Post.published.select_related('source_article__source')
+            .exclude(id__in=list(posts_by_id))
+            .order_by('-publish')[:limit - len(posts)]
+        )
+
+    totals = read_many(
+        [click_key('post', post.id, 'total') for post in posts]
+        + [click_key('source', _post_source_id(post), 'total') for post in posts if _post_source_id(post)]
+    )
+    top = sorted(
+        (
+            {
+                'post': post,
+                'clicks': int(totals.get(click_key('post', post.id, 'total'), 0)),
+                'source_clicks': int(totals.get(click_key('source', _post_source_id(post), 'total'), 0)),
+            }
+            for post in posts
+        ),
+        key=lambda item: (item['clicks'], item['source_clicks'], item['post'].publish),
+        reverse=True,
+    )[:limit]
+    readers = unique_readers('post', [item['post'].id for item in top])
+    for item in top:
+        item['readers'] = readers.get(item['post'].id, 0)
+    return top
+
+
+def _top_clicked_sources(limit=10):
+    sources_by_id = NewsSource.objects.filter(is_active=True).in_bulk(top_clicked('source', limit * 2))
+    sources = list(sources_by_id.values())
+    if len(sources) < limit:
+        sources.extend(
+            NewsSource.objects.filter(is_active=True)
+            .exclude(id__in=list(sources_by_id))
+            .order_by('-trust_score', '-updated')[:limit - len(sources)]
+        )
+
+    totals = read_many(click_key('source', source.id, 'total') for source in sources)
+    top = sorted(
+        (
+            {'source': source, 'clicks': int(totals.get(click_key('source', source.id, 'total'), 0))}
+            for source in sources
+        ),
+        key=lambda item: (item['clicks'], item['source'].trust_score, item['source'].updated),
+        reverse=True,
+    )[:limit]
+    readers = unique_readers('source', [item['source'].id for item in top])
+    for item in top:
+        item['readers'] = readers.get(item['source'].id, 0)
+    return top
+
+
+def _analytics_tracked_ids():
+    return (
+        list(Post.published.order_by().values_list('id', flat=True)),
+        list(NewsSource.objects.filter(is_active=True).order_by().values_list('id', flat=True)),
+    )
+
+
+MONITORING_METRICS = (
+    'last_status',
+    'last_run_at',
+    'last_success_at',
+    'last_failure_at',
+    'last_error',
+    'total_runs',
+    'total_failures',
+    'total_retries',
+    'consecutive_failures',
+    'lock_contended',
+    'last_lock_contention',
+)
+
+
+def _monitoring_snapshot_from_values(task_name, values):
     prefix = f'monitoring:task:{task_name}'
     return {
         'task': task_name,
-        'last_status': cache.get(f'{prefix}:last_status') or 'never',
-        'last_run_at': cache.get(f'{prefix}:last_run_at'),
-        'last_success_at': cache.get(f'{prefix}:last_success_at'),
-        'last_failure_at': cache.get(f'{prefix}:last_failure_at'),
-        'last_error': cache.get(f'{prefix}:last_error') or '',
-        'total_runs': int(cache.get(f'{prefix}:total_runs', 0)),
-        'total_failures': int(cache.get(f'{prefix}:total_failures', 0)),
-        'total_retries': int(cache.get(f'{prefix}:total_retries', 0)),
-        'consecutive_failures': int(cache.get(f'{prefix}:consecutive_failures', 0)),
+        'last_status': values.get(f'{prefix}:last_status') or 'never',
+        'last_run_at': values.get(f'{prefix}:last_run_at'),
+        'last_success_at': values.get(f'{prefix}:last_success_at'),
+        'last_failure_at': values.get(f'{prefix}:last_failure_at'),
+        'last_error': values.get(f'{prefix}:last_error') or '',
+        'total_runs': int(values.get(f'{prefix}:total_runs', 0)),
+        'total_failures': int(values.get(f'{prefix}:total_failures', 0)),
+        'total_retries': int(values.get(f'{prefix}:total_retries', 0)),
+        'consecutive_failures': int(values.get(f'{prefix}:consecutive_failures', 0)),
+        'lock_contended': int(values.get(f'{prefix}:lock_contended', 0)),
+        'last_lock_contention': values.get(f'{prefix}:last_lock_contention'),
     }
 
 
+def _monitoring_snapshots(task_names):
+    keys = [f'monitoring:task:{task_name}:{metric}' for task_name in task_names for metric in MONITORING_METRICS]
+    for task_name in task_names:
+        keys.extend(task_metric_keys(task_name))
+        keys.extend(lock_keys(task_name))
+    values = read_many(keys)
+    return [
+        {
+            **_monitoring_snapshot_from_values(task_name, values),
+            **summarize_task_metrics(task_name, values),
+            'lock': lock_state(task_name, values),
+        }
+        for task_name in task_names
+    ]
+
+
+def _monitoring_snapshot(task_name):
+    return _monitoring_snapshots([task_name])[0]
+
+
 def _monitoring_overview():
-    snapshots = [_monitoring_snapshot(task_name) for task_name in MONITORED_TASKS]
+    snapshots = _monitoring_snapshots(MONITORED_TASKS)
     alert_count = sum(
         1
         for item in snapshots
@@ -287,14 +364,11 @@ def digest_posts_queryset(hours=48, limit=8):
     posts = list(
         Post.published.filter(publish__gte=cutoff)
         .select_related('source_article__source')
-        .annotate(
-            like_count=Count('likes', distinct=True),
-            comment_count=Count('comments', filter=Q(comments__approved=True), distinct=True),
-        )
         .order_by('-publish')[:30]
     )
     return _rank_homepage_posts(posts)[:limit]
 
+@method_decorator(cache_anonymous_page('posts'), name='dispatch')
 class PostListView(ListView):
     tag = None
     queryset = Post.published.all()
@@ -309,6 +383,7 @@ class PostListView(ListView):
             .select_related('author', 'category', 'source_article__source')
             .prefetch_related('tags')
         )
+        self.keyset_ordering = ('-publish', '-id')
         self.tag = None
         tag_slug = self.kwargs.get('tag_slug')
         search_query = (self.request.GET.get('q') or '').strip()
@@ -333,9 +408,19 @@ class PostListView(ListView):
                     default=Value(0),
                     output_field=IntegerField(),
                 )
-            ).order_by('-relevance', '-publish')
+            )
+            self.keyset_ordering = ('-relevance', '-publish', '-id')
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pagination: ?cursor= carries the last row's sort key, so an old page is one indexed range
+        # read like the first, and nothing runs COUNT(*). Unknown or stale cursors fall back to the first page.
+        cursor = self.request.GET.get('cursor')
+        page = keyset_page(queryset, self.keyset_ordering, cursor, page_size)
+        if page is None:
+            page = keyset_page(queryset, self.keyset_ordering, None, page_size)
+        return None, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['tag'] = self.tag
@@ -355,38 +440,18 @@ class PostListView(ListView):
         )
 
         if not self.tag and not self.search_query:
-            base = Post.published.all()
-            trending_candidates = list(
-                base.select_related('author', 'category', 'source_article__source')
-                .prefetch_related('tags')
-                .annotate(
-                    like_count=Count('likes', distinct=True),
-                    comment_count=Count('comments', filter=Q(comments__approved=True), distinct=True),
-                )
-                .order_by('-like_count', '-comment_count', '-publish')[:12]
-            )
-            trending_posts = _rank_homepage_posts(trending_candidates)[:4]
-            fresh_auto_posts = (
-                base.filter(auto_generated=True)
-                .select_related('author', 'category', 'source_article__source')
-                .prefetch_related('tags')
-                .order_by('-publish')[:4]
-            )
-            editor_posts = (
-                base.filter(auto_generated=False)
-                .select_related('author', 'category', 'source_article__source')
-                .prefetch_related('tags')
-                .order_by('-publish')[:4]
-            )
-            context['trending_posts'] = list(trending_posts)
-            context['fresh_auto_posts'] = list(fresh_auto_posts)
-            context['editor_posts'] = list(editor_posts)
+            # Section ids are materialized by refresh_homepage_sections; the request only hydrates them.
+            sections = hydrate_homepage_sections(homepage_sections())
+            context['trending_posts'] = sections['trending']
+            context['fresh_auto_posts'] = sections['fresh']
+            context['editor_posts'] = sections['editor']
 
         if self.search_query:
             context['search_mode'] = True
 
         return context
 
+@cache_anonymous_page()
 def post_detail(request, year, month, day, post):
     post = get_object_or_404(
         Post,
@@ -396,6 +461,7 @@ def post_detail(request, year, month, day, post):
         slug=post,
         status=Post.Status.PUBLISHED
     )
+    tag_page(request, f'post:{post.id}')
     
     # List of active comments for this post
     comments = post.comments.filter(approved=True)
@@ -419,8 +485,6 @@ def post_detail(request, year, month, day, post):
         .select_related('source_article__source')
         .annotate(
             same_tags=Count('tags', filter=Q(tags__in=post_tags_ids), distinct=True),
-            like_count=Count('likes', distinct=True),
-            comment_count=Count('comments', filter=Q(comments__approved=True), distinct=True),
             same_source=same_source_annotation,
         )
         .annotate(
@@ -529,13 +593,15 @@ def post_like(request, post_id):
     if like.exists():
         like.delete()
         is_liked = False
+        bump_trending(post.id, -LIKE_WEIGHT)
     else:
         Like.objects.create(post=post, user=request.user)
         is_liked = True
+        bump_trending(post.id, LIKE_WEIGHT)
     
     return JsonResponse({
         'liked': is_liked,
-        'count': post.likes.count()
+        'count': Post.objects.values_list('like_count', flat=True).get(pk=post.pk),
     })
 
 
@@ -555,7 +621,7 @@ def post_bookmark(request, post_id):
     return JsonResponse(
         {
             'bookmarked': is_bookmarked,
-            'count': post.bookmarks.count(),
+            'count': Post.objects.values_list('bookmark_count', flat=True).get(pk=post.pk),
         }
     )
 
@@ -581,6 +647,7 @@ def bookmarks_list(request):
 
 
 @require_GET
+@cache_anonymous_page('posts')
 def sports_hub(request):
     active_tab = (request.GET.get('tab') or 'news').strip().lower()
     if active_tab not in {'news', 'fixtures', 'tables'}:
@@ -589,10 +656,6 @@ def sports_hub(request):
     base = (
         Post.published.select_related('author', 'category', 'source_article__source')
         .prefetch_related('tags')
-        .annotate(
-            like_count=Count('likes', distinct=True),
-            comment_count=Count('comments', filter=Q(comments__approved=True), distinct=True),
-        )
     )
     sports_posts = list(
         base.filter(
@@ -662,53 +725,110 @@ def newsletter_subscribe(request):
     return JsonResponse({'subscribed': True, 'email': email})
 
 
+def _reader_fingerprint(request):
+    # Hashed, never stored raw. The session cookie identifies a browser without a session lookup;
+    # cookieless clients fall back to address + user agent.
+    session_id = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    raw = session_id or f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]
+
+
 @require_POST
 @csrf_exempt
 def track_post_click(request):
     post_id = request.POST.get('post_id')
-    placement = (request.POST.get('placement') or 'unknown').strip().lower()[:32]
+    placement = normalize_placement(request.POST.get('placement'))
 
     if not post_id or not str(post_id).isdigit():
         return JsonResponse({'tracked': False, 'reason': 'invalid_post_id'}, status=400)
 
     post_id = int(post_id)
-    if not Post.published.filter(id=post_id).exists():
+    found, source_id = post_sources.lookup(post_id)
+    if not found:
         return JsonResponse({'tracked': False, 'reason': 'not_found'}, status=404)
 
-    post = Post.published.select_related('source_article__source').get(id=post_id)
-    source_id = post.source_article.source_id if post.source_article_id and post.source_article else None
-
-    total_key = f'analytics:clicks:post:{post_id}:total'
-    placement_key = f'analytics:clicks:post:{post_id}:placement:{placement}'
-    source_total_key = f'analytics:clicks:source:{source_id}:total' if source_id else None
-    source_placement_key = f'analytics:clicks:source:{source_id}:placement:{placement}' if source_id else None
-    ttl_seconds = _analytics_retention_seconds()
-    total_count = cache.get(total_key, 0) + 1
-    placement_count = cache.get(placement_key, 0) + 1
-    cache.set(total_key, total_count, timeout=ttl_seconds)
-    cache.set(placement_key, placement_count, timeout=ttl_seconds)
-    source_total_count = None
-    if source_total_key:
-        source_total_count = cache.get(source_total_key, 0) + 1
-        cache.set(source_total_key, source_total_count, timeout=ttl_seconds)
-        cache.set(f'analytics:clicks:source:{source_id}:last_seen', timezone.now(), timeout=ttl_seconds)
-    cache.set(f'analytics:clicks:post:{post_id}:last_seen', timezone.now(), timeout=ttl_seconds)
-    if source_placement_key:
-        source_placement_count = cache.get(source_placement_key, 0) + 1
-        cache.set(source_placement_key, source_placement_count, timeout=ttl_seconds)
+    counts = record_click(post_id, source_id, placement, reader=_reader_fingerprint(request))
+    if counts is None:
+        # Buffered: the totals are written on the next flush.
+        return JsonResponse({'tracked': True, 'post_id': post_id, 'source_id': source_id, 'placement': placement, 'buffered': True})
 
+    source_total = counts.get(click_key('source', source_id, 'total')) if source_id else None
     return JsonResponse(
         {
             'tracked': True,
             'post_id': post_id,
             'source_id': source_id,
             'placement': placement,
-            'total_clicks': int(total_count),
-            'source_clicks': int(source_total_count) if source_total_count is not None else None,
+            'total_clicks': int(counts.get(click_key('post', post_id, 'total'), 0)),
+            'source_clicks': int(source_total) if source_total is not None else None,
         }
     )
 
 
+def _click_batch_body(request):
+    # Beacon bodies are small JSON arrays; gzip is accepted (by header or magic bytes) with a bounded inflate
+    # so a tiny compressed body cannot expand past CLICK_BATCH_MAX_BYTES.
+    max_bytes = int(getattr(settings, 'CLICK_BATCH_MAX_BYTES', 65536))
+    body = request.body
+    if len(body) > max_bytes:
+        return None
+    if request.headers.get('Content-Encoding', '').lower() == 'gzip' or body[:2] == b'\x1f\x8b':
+        try:
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            body = inflater.decompress(body, max_bytes)
+        except zlib.error:
+            return None
+        if inflater.unconsumed_tail:
+            return None
+    try:
+        payload = json.loads(body.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if isinstance(payload, dict):
+        payload = payload.get('events')
+    return payload if isinstance(payload, list) else None
+
+
+def _click_event_time(value, now):
+    # Client clocks drift: ms or s epochs are accepted, anything in the future or older than the window is now.
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return now
+    if ts > 1e11:
+        ts /= 1000.0
+    max_age = int(getattr(settings, 'CLICK_BATCH_MAX_AGE_SECONDS', 86400))
+    if not now.timestamp() - max_age <= ts <= now.timestamp():
+        return now
+    return datetime.fromtimestamp(ts, tz=dt_timezone.utc)
+
+
+@require_POST
+@csrf_exempt
+def track_post_clicks_batch(request):
+    payload = _click_batch_body(request)
+    if payload is None:
+        return JsonResponse({'tracked': False, 'reason': 'invalid_payload'}, status=400)
+    max_events = int(getattr(settings, 'CLICK_BATCH_MAX_EVENTS', 50))
+
+    now = timezone.now()
+    events = []
+    rejected = max(0, len(payload) - max_events)
+    for item in payload[:max_events]:
+        post_id = item.get('post_id') if isinstance(item, dict) else None
+        if not str(post_id or '').isdigit():
+            rejected += 1
+            continue
+        found, source_id = post_sources.lookup(int(post_id))
+        if not found:
+            rejected += 1
+            continue
+        events.append((int(post_id), source_id, normalize_placement(item.get('placement')), _click_event_time(item.get('ts'), now)))
+
+    accepted = record_clicks(events, reader=_reader_fingerprint(request))
+    return JsonResponse({'tracked': bool(accepted), 'accepted': accepted, 'rejected': rejected})
+
+
 @require_GET
 def post_social_image(request, year, month, day, post):
     post_obj = get_object_or_404(
@@ -770,39 +890,16 @@ def tag_social_image(request, tag_slug):
 @staff_member_required
 @require_GET
 def analytics_dashboard(request):
-    posts = list(Post.published.select_related('source_article__source').order_by('-publish'))
-    sources = list(NewsSource.objects.filter(is_active=True).order_by('name'))
+    post_ids, source_ids = _analytics_tracked_ids()
     retention_days = max(1, int(getattr(settings, 'ANALYTICS_RETENTION_DAYS', 30)))
-    retention_summary = _retention_summary(posts, sources)
+    retention_summary = _retention_summary(post_ids, source_ids)
     monitoring_overview = _monitoring_overview()
+    manual_ops_job = get_pipeline_job(request.session.get('manual_ops_job_id'))
+    if manual_ops_job:
+        manual_ops_job = {**manual_ops_job, 'progress': job_progress(manual_ops_job)}
 
-    top_posts = sorted(
-        (
-            {
-                'post': post,
-                'clicks': _cached_click_count('analytics:clicks:post', post.id),
-                'source_clicks': _cached_click_count(
-                    'analytics:clicks:source',
-                    post.source_article.source_id if post.source_article_id and post.source_article and post.source_article.source_id else 0,
-                ),
-            }
-            for post in posts
-        ),
-        key=lambda item: (item['clicks'], item['source_clicks'], item['post'].publish),
-        reverse=True,
-    )[:10]
-
-    top_sources = sorted(
-        (
-            {
-                'source': source,
-                'clicks': _cached_click_count('analytics:clicks:source', source.id),
-            }
-            for source in sources
-        ),
-        key=lambda item: (item['clicks'], item['source'].trust_score, item['source'].updated),
-        reverse=True,
-    )[:10]
+    top_posts = _top_clicked_posts()
+    top_sources = _top_clicked_sources()
 
     return render(
         request,
@@ -811,13 +908,16 @@ def analytics_dashboard(request):
             'canonical_url': request.build_absolute_uri(),
             'top_posts': top_posts,
             'top_sources': top_sources,
-            'tracked_posts_count': len(posts),
-            'tracked_sources_count': len(sources),
+            'tracked_posts_count': len(post_ids),
+            'tracked_sources_count': len(source_ids),
             'total_clicks': sum(item['clicks'] for item in top_posts),
             'analytics_retention_days': retention_days,
+            'unique_reader_days': max(1, int(getattr(settings, 'ANALYTICS_UNIQUE_READER_DAYS', 7))),
+            'placement_summary': placement_summary(),
             'retention_summary': retention_summary,
             'monitoring_overview': monitoring_overview,
             'manual_ops_result': request.session.pop('manual_ops_result', None),
+            'manual_ops_job': manual_ops_job,
         },
     )
 
@@ -844,14 +944,19 @@ def run_manual_pipeline(request):
         request.session['manual_ops_result'] = result
         return redirect('blog:analytics_dashboard')
 
+    steps = []
+    if action in {'fetch', 'full'}:
+        steps.append({'action': 'fetch', 'max_items': fetch_limit})
+    if action in {'summarize', 'full'}:
+        steps.append({'action': 'summarize', 'limit': summarize_limit})
+    if action in {'publish', 'full'}:
+        steps.append({'action': 'publish', 'limit': publish_limit})
+
     try:
-        if action in {'fetch', 'full'}:
-            result['fetch'] = fetch_all_active_sources(max_items=fetch_limit)
-        if action in {'summarize', 'full'}:
-            result['summarize'] = summarize_pending_articles(limit=summarize_limit)
-        if action in {'publish', 'full'}:
-            result['publish'] = auto_publish_trusted_articles(limit=publish_limit)
-        result['status'] = 'ok'
+        job = enqueue_pipeline_job(steps, requested_by=request.user.get_username(), origin='dashboard')
+        result['status'] = job['status']
+        result['job_id'] = job['id']
+        request.session['manual_ops_job_id'] = job['id']
     except Exception as exc:
         result['status'] = 'error'
         result['error'] = str(exc)[:400]
@@ -860,6 +965,15 @@ def run_manual_pipeline(request):
     return redirect('blog:analytics_dashboard')
 
 
+@staff_member_required
+@require_GET
+def pipeline_job_status(request, job_id):
+    job = get_pipeline_job(job_id)
+    if job is None:
+        return JsonResponse({'status': 'not_found', 'job_id': job_id}, status=404)
+    return JsonResponse({**job, 'progress': job_progress(job)})
+
+
 @staff_member_required
 @require_GET
 def monitoring_health(request):
@@ -895,84 +1009,38 @@ def launch_readiness_health(request):
 @staff_member_required
 @require_GET
 def analytics_export_csv(request):
-    posts = list(Post.published.select_related('source_article__source').order_by('-publish'))
-    sources = list(NewsSource.objects.filter(is_active=True).order_by('name'))
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="analytics-dashboard.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow([
-        'type',
-        'id',
-        'title_or_name',
-        'clicks',
-        'source_clicks',
-        'publish_or_updated',
-        'meta',
-    ])
-
-    for post in posts:
-        source_id = post.source_article.source_id if post.source_article_id and post.source_article and post.source_article.source_id else None
-        writer.writerow([
-            'post',
-            post.id,
-            post.title,
-            _cached_click_count('analytics:clicks:post', post.id),
-            _cached_click_count('analytics:clicks:source', source_id) if source_id else 0,
-            post.publish.isoformat(),
-            post.source_article.source.name if post.source_article_id and post.source_article and post.source_article.source else '',
-        ])
+    return streaming_export(
+        'analytics-dashboard',
+        ANALYTICS_EXPORT_HEADER,
+        analytics_rows(),
+        request.GET.get('output'),
+    )
 
-    for source in sources:
-        writer.writerow([
-            'source',
-            source.id,
-            source.name,
-            _cached_click_count('analytics:clicks:source', source.id),
-            '',
-            source.updated.isoformat(),
-            source.get_provider_display(),
-        ])
 
-    return response
+TRENDING_SNAPSHOT_HEADER = [
+    'rank',
+    'post_id',
+    'title',
+    'score',
+    'likes',
+    'comments',
+    'post_clicks',
+    'source_clicks',
+    'freshness_bonus',
+    'source_name',
+    'publish_date',
+]
 
 
-@staff_member_required
-@require_GET
-def analytics_export_trending_snapshot(request):
+def _trending_snapshot_rows():
     posts = list(
         Post.published.select_related('source_article__source')
-        .prefetch_related('tags')
-        .annotate(
-            like_count=Count('likes', distinct=True),
-            comment_count=Count('comments', filter=Q(comments__approved=True), distinct=True),
-        )
         .order_by('-publish')[:20]
     )
 
-    ranked = _rank_homepage_posts(posts)[:10]
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="trending-snapshot.csv"'
-    writer = csv.writer(response)
-    writer.writerow([
-        'rank',
-        'post_id',
-        'title',
-        'score',
-        'likes',
-        'comments',
-        'post_clicks',
-        'source_clicks',
-        'freshness_bonus',
-        'source_name',
-        'publish_date',
-    ])
-
-    for index, post in enumerate(ranked, start=1):
+    for index, post in enumerate(_rank_homepage_posts(posts)[:10], start=1):
         metrics = _home_feed_score(post)
-        writer.writerow([
+        yield [
             index,
             post.id,
             post.title,
@@ -984,9 +1052,18 @@ def analytics_export_trending_snapshot(request):
             metrics['freshness'],
             post.source_article.source.name if post.source_article_id and post.source_article and post.source_article.source else '',
             post.publish.date().isoformat(),
-        ])
+        ]
 
-    return response
+
+@staff_member_required
+@require_GET
+def analytics_export_trending_snapshot(request):
+    return streaming_export(
+        'trending-snapshot',
+        TRENDING_SNAPSHOT_HEADER,
+        _trending_snapshot_rows(),
+        request.GET.get('output'),
+    )
 
 
 @staff_member_required
@@ -1006,7 +1083,7 @@ def analytics_reset_all(request):
     return JsonResponse(
         {
             'reset': True,
-            'message': 'All analytics cache entries were cleared.',
+            'message': 'All click analytics, daily rollups and click scores were cleared.',
         }
     )
 
@@ -270,6 +270,7 @@ CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://127.0.0.1:6379/
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=CELERY_BROKER_URL)
 CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
 CELERY_TASK_TIME_LIMIT = config('CELERY_TASK_TIME_LIMIT', default=120, cast=int)
+CELERY_FANOUT_ENABLED = config('CELERY_FANOUT_ENABLED', default=True, cast=bool)
 
 MIN_ARTICLE_WORDS = config('MIN_ARTICLE_WORDS', default=120, cast=int)
 EXTERNAL_NEWS_MIN_ARTICLE_WORDS = config('EXTERNAL_NEWS_MIN_ARTICLE_WORDS', default=20, cast=int)
@@ -286,19 +287,29 @@ DISALLOWED_CONTENT_TERMS = [
 
 AI_SUMMARY_PROVIDER = config('AI_SUMMARY_PROVIDER', default='gemini')
 SUMMARIZER_PROMPT_MODE = config('SUMMARIZER_PROMPT_MODE', default='brief')
+LOCAL_SUMMARY_MAX_SENTENCES = config('LOCAL_SUMMARY_MAX_SENTENCES', default=3, cast=int)
+LOCAL_SUMMARY_MAX_WORDS = config('LOCAL_SUMMARY_MAX_WORDS', default=80, cast=int)
+LOCAL_SUMMARY_MAX_TRUST_SCORE = config('LOCAL_SUMMARY_MAX_TRUST_SCORE', default=0, cast=int)
 
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 GEMINI_API_KEYS = config('GEMINI_API_KEYS', default='')
 GEMINI_MODEL = config('GEMINI_MODEL', default='gemini-2.0-flash')
+GEMINI_API_BASE_URL = config('GEMINI_API_BASE_URL', default='https://generativelanguage.googleapis.com')
 
 GROQ_API_KEY = config('GROQ_API_KEY', default='')
 GROQ_MODEL = config('GROQ_MODEL', default='llama-3.3-70b-versatile')
+GROQ_API_BASE_URL = config('GROQ_API_BASE_URL', default='https://api.groq.com')
 
 GEMINI_INPUT_COST_PER_1K = config('GEMINI_INPUT_COST_PER_1K', default='0.0001')
 GEMINI_OUTPUT_COST_PER_1K = config('GEMINI_OUTPUT_COST_PER_1K', default='0.0004')
 GROQ_INPUT_COST_PER_1K = config('GROQ_INPUT_COST_PER_1K', default='0.0006')
 GROQ_OUTPUT_COST_PER_1K = config('GROQ_OUTPUT_COST_PER_1K', default='0.0008')
 
+LLM_DAILY_BUDGET_USD = config('LLM_DAILY_BUDGET_USD', default='0')
+LLM_DAILY_TOKEN_BUDGET = config('LLM_DAILY_TOKEN_BUDGET', default=0, cast=int)
+LLM_BUDGET_RESERVE_RATIO = config('LLM_BUDGET_RESERVE_RATIO', default=0.2, cast=float)
+LLM_BUDGET_RESERVE_MIN_PRIORITY = config('LLM_BUDGET_RESERVE_MIN_PRIORITY', default=150, cast=int)
+
 AUTO_PUBLISH_MIN_TRUST_SCORE = config('AUTO_PUBLISH_MIN_TRUST_SCORE', default=70, cast=int)
 AUTO_PUBLISH_REQUIRE_AD_SAFE = config('AUTO_PUBLISH_REQUIRE_AD_SAFE', default=True, cast=bool)
 AUTO_PUBLISH_MIN_ORIGINALITY = config('AUTO_PUBLISH_MIN_ORIGINALITY', default=40, cast=int)
@@ -314,12 +325,56 @@ ADSENSE_SLOT_BELOW_CONTENT = config('ADSENSE_SLOT_BELOW_CONTENT', default='')
 ADSENSE_SLOT_STICKY_MOBILE = config('ADSENSE_SLOT_STICKY_MOBILE', default='')
 
 ANALYTICS_RETENTION_DAYS = config('ANALYTICS_RETENTION_DAYS', default=30, cast=int)
+ANALYTICS_TOPK_CAPACITY = config('ANALYTICS_TOPK_CAPACITY', default=200, cast=int)
+TRENDING_DECAY_DAYS = config('TRENDING_DECAY_DAYS', default=14, cast=float)
+ANALYTICS_VERSION_LOCAL_SECONDS = config('ANALYTICS_VERSION_LOCAL_SECONDS', default=5, cast=float)
+CLICK_PLACEMENTS = _csv_list(
+    config(
+        'CLICK_PLACEMENTS',
+        default=(
+            'card-image,card-title,trending-card-image,trending-card-title,fresh-card-image,fresh-card-title,'
+            'editor-card-image,editor-card-title,feed,hero,unknown'
+        ),
+    )
+)
+ANALYTICS_EXPORT_CHUNK_SIZE = config('ANALYTICS_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+ANALYTICS_UNIQUE_READER_DAYS = config('ANALYTICS_UNIQUE_READER_DAYS', default=7, cast=int)
+CLICK_POST_MAP_TTL_SECONDS = config('CLICK_POST_MAP_TTL_SECONDS', default=300, cast=int)
+CLICK_POST_MAP_LOCAL_SECONDS = config('CLICK_POST_MAP_LOCAL_SECONDS', default=30, cast=int)
+CLICK_POST_MAP_MIN_REFRESH_SECONDS = config('CLICK_POST_MAP_MIN_REFRESH_SECONDS', default=10, cast=int)
+CLICK_BUFFER_ENABLED = config('CLICK_BUFFER_ENABLED', default=False, cast=bool)
+CLICK_BUFFER_FLUSH_SECONDS = config('CLICK_BUFFER_FLUSH_SECONDS', default=2, cast=float)
+CLICK_BUFFER_MAX_EVENTS = config('CLICK_BUFFER_MAX_EVENTS', default=500, cast=int)
+CLICK_BATCH_MAX_EVENTS = config('CLICK_BATCH_MAX_EVENTS', default=50, cast=int)
+CLICK_BATCH_MAX_BYTES = config('CLICK_BATCH_MAX_BYTES', default=65536, cast=int)
+CLICK_BATCH_MAX_AGE_SECONDS = config('CLICK_BATCH_MAX_AGE_SECONDS', default=86400, cast=int)
+HOMEPAGE_SECTIONS_REFRESH_MODE = config('HOMEPAGE_SECTIONS_REFRESH_MODE', default='celery')
+HOMEPAGE_SECTIONS_TTL_SECONDS = config('HOMEPAGE_SECTIONS_TTL_SECONDS', default=900, cast=int)
+HOMEPAGE_SECTIONS_DEBOUNCE_SECONDS = config('HOMEPAGE_SECTIONS_DEBOUNCE_SECONDS', default=5, cast=int)
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=not IS_TEST_RUN, cast=bool)
+PAGE_CACHE_SECONDS = config('PAGE_CACHE_SECONDS', default=30, cast=int)
+PAGE_CACHE_STALE_SECONDS = config('PAGE_CACHE_STALE_SECONDS', default=120, cast=int)
 MONITORING_RETENTION_DAYS = config('MONITORING_RETENTION_DAYS', default=30, cast=int)
+MONITORING_RUN_HISTORY_SIZE = config('MONITORING_RUN_HISTORY_SIZE', default=20, cast=int)
 
 TASK_RETRY_MAX_ATTEMPTS = config('TASK_RETRY_MAX_ATTEMPTS', default=3, cast=int)
 TASK_RETRY_BACKOFF_BASE_SECONDS = config('TASK_RETRY_BACKOFF_BASE_SECONDS', default=2, cast=int)
 TASK_RETRY_BACKOFF_MAX_SECONDS = config('TASK_RETRY_BACKOFF_MAX_SECONDS', default=30, cast=int)
-TASK_RETRY_APPLY_SLEEP = config('TASK_RETRY_APPLY_SLEEP', default=False, cast=bool)
+WORK_LEASE_SECONDS = config('WORK_LEASE_SECONDS', default=300, cast=int)
+EVENT_PIPELINE_MODE = config('EVENT_PIPELINE_MODE', default='off')
+PIPELINE_JOB_MODE = config('PIPELINE_JOB_MODE', default='celery')
+PIPELINE_JOB_TTL_SECONDS = config('PIPELINE_JOB_TTL_SECONDS', default=86400, cast=int)
+PIPELINE_JOB_TIME_LIMIT = config('PIPELINE_JOB_TIME_LIMIT', default=1800, cast=int)
+TASK_LOCKS_ENABLED = config('TASK_LOCKS_ENABLED', default=True, cast=bool)
+TASK_LOCK_TTL_SECONDS = config('TASK_LOCK_TTL_SECONDS', default=300, cast=int)
+TASK_LOCK_WAIT_SECONDS = config('TASK_LOCK_WAIT_SECONDS', default=30, cast=int)
+# skip | wait | coalesce; per-task overrides as "task_name=policy,..."
+TASK_LOCK_CONTENTION = config('TASK_LOCK_CONTENTION', default='skip')
+TASK_LOCK_CONTENTION_OVERRIDES = dict(
+    item.split('=', 1)
+    for item in _csv_list(config('TASK_LOCK_CONTENTION_OVERRIDES', default=''))
+    if '=' in item
+)
 
 FEATURE_FLAG_INGESTION_ENABLED = config('FEATURE_FLAG_INGESTION_ENABLED', default=True, cast=bool)
 FEATURE_FLAG_SUMMARIZATION_ENABLED = config('FEATURE_FLAG_SUMMARIZATION_ENABLED', default=True, cast=bool)